@@ -5,10 +5,25 @@ __version__ = "0.1.0"
 __author__ = "rainoftime"
 __email__ = "rainoftime@gmail.com"
 
-# Import main components for easy access
-from .application.program import Program
-from .application.pipeline import Pipeline
-from .application.context import Context
+import importlib
+
+# Main components are resolved on first access so that importing a light
+# subpackage (e.g. the CLI or the security checker) does not pull in the whole
+# analysis pipeline.
+_LAZY_ATTRIBUTES = {
+    "Program": ".application.program",
+    "Pipeline": ".application.pipeline",
+    "Context": ".application.context",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 __all__ = [
     "Program",
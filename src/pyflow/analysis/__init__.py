@@ -5,8 +5,14 @@ code, including control flow analysis, data flow analysis, inter-procedural
 analysis, constraint-based analysis, and shape analysis.
 """
 
-# Import main analysis modules
-from . import shape
-from . import ipa
-from . import cpa
-from . import fsdf
+import importlib
+
+# The main analysis modules are imported on first attribute access, so that
+# importing a single lightweight analysis (e.g. callgraph) stays cheap.
+_LAZY_SUBMODULES = ("shape", "ipa", "cpa", "fsdf")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
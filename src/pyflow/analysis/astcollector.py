@@ -5,17 +5,46 @@ from Python AST nodes for analysis purposes.
 """
 
 from pyflow.util.typedispatch import *
+from pyflow.language.asttools.walker import StackWalker
 from pyflow.language.python import ast
 
 
-class GetOps(TypeDispatcher):
+opTypes = (
+    ast.Load,
+    ast.Store,
+    ast.Check,
+    ast.Allocate,
+    ast.BinaryOp,
+    ast.Is,
+    ast.UnaryPrefixOp,
+    ast.GetGlobal,
+    ast.SetGlobal,
+    ast.GetSubscript,
+    ast.SetSubscript,
+    ast.Call,
+    ast.DirectCall,
+    ast.MethodCall,
+    ast.UnpackSequence,
+    ast.GetAttr,
+    ast.SetAttr,
+    ast.ConvertToBool,
+    ast.Not,
+    ast.BuildTuple,
+    ast.BuildList,
+    ast.BuildMap,
+    ast.GetIter,
+)
+
+
+class GetOps(StackWalker):
     """Collects operations and local variables from AST nodes.
     
     This class traverses AST nodes to extract operations, local variables,
-    and copy operations for analysis.
+    and copy operations for analysis.  The traversal uses an explicit
+    stack, so arbitrarily deep expressions can be collected.
     
     Attributes:
-        ops: List of collected operations.
+        ops: List of collected operations, in postorder.
         locals: Set of collected local variables.
         copies: List of copy operations found.
     """
@@ -47,6 +76,7 @@ class GetOps(TypeDispatcher):
         ast.FunctionDef,
         ast.ClassDef,
         ast.Raise,
+        ast.Assert,
     )
     def visitOK(self, node):
         """Visit nodes that contain child nodes.
@@ -54,7 +84,7 @@ class GetOps(TypeDispatcher):
         Args:
             node: AST node to visit.
         """
-        node.visitChildren(self)
+        return node.children()
 
     @dispatch(ast.Assign)
     def visitAssign(self, node):
@@ -66,17 +96,7 @@ class GetOps(TypeDispatcher):
         if isinstance(node.expr, ast.Local):
             self.copies.append(node)
 
-        node.visitChildren(self)
-
-    @dispatch(ast.Assert)
-    def visitAssert(self, node):
-        """Visit assert statement nodes.
-
-        Args:
-            node: Assert AST node.
-        """
-        # Handle assert statements by visiting children (test and message)
-        node.visitChildren(self)
+        return node.children()
 
     @dispatch(ast.InputBlock)
     def visitInputBlock(self, node):
@@ -85,8 +105,7 @@ class GetOps(TypeDispatcher):
         Args:
             node: Input block AST node.
         """
-        for input in node.inputs:
-            self(input.lcl)
+        return [input.lcl for input in node.inputs]
 
     @dispatch(ast.OutputBlock)
     def visitOutputBlock(self, node):
@@ -95,8 +114,7 @@ class GetOps(TypeDispatcher):
         Args:
             node: Output block AST node.
         """
-        for output in node.outputs:
-            self(output.expr)
+        return [output.expr for output in node.outputs]
 
     @dispatch(ast.Local, ast.Existing)
     def visitLocal(self, node):
@@ -107,56 +125,111 @@ class GetOps(TypeDispatcher):
         """
         self.locals.add(node)
 
-    @dispatch(
-        ast.Load,
-        ast.Store,
-        ast.Check,
-        ast.Allocate,
-        ast.BinaryOp,
-        ast.Is,
-        ast.UnaryPrefixOp,
-        ast.GetGlobal,
-        ast.SetGlobal,
-        ast.GetSubscript,
-        ast.SetSubscript,
-        ast.Call,
-        ast.DirectCall,
-        ast.MethodCall,
-        ast.UnpackSequence,
-        ast.GetAttr,
-        ast.SetAttr,
-        ast.ConvertToBool,
-        ast.Not,
-        ast.BuildTuple,
-        ast.BuildList,
-        ast.BuildMap,
-        ast.GetIter,
-    )
+    @dispatch(opTypes)
     def visitOp(self, node):
-        node.visitChildren(self)
-        self.ops.append(node)
+        return node.children()
 
-    @dispatch(list)
+    @dispatch(list, tuple)
     def visitList(self, node):
-        # Handle raw Python lists that might appear in the AST
-        for item in node:
-            if hasattr(item, 'visitChildren'):
-                self(item)
-            # For non-AST items, just skip them
+        # Raw Python lists may appear in the AST; skip non-AST items.
+        return [item for item in node if hasattr(item, "visitChildren")]
+
+    def leave(self, node):
+        # Ops are recorded after their arguments.
+        if isinstance(node, opTypes):
+            self.ops.append(node)
 
     def process(self, node):
         # This is a shared node, so force traversal
-        node.visitChildrenForced(self)
+        self.walkChildren(node)
         return self.ops, self.locals
 
 
+class OpIndex(object):
+    """The ops, locals and copies of one generation of a Code body.
+
+    The collections are immutable, as the same index is handed to every
+    caller until the code is mutated.
+    """
+
+    __slots__ = "generation", "body", "params", "ops", "locals", "copies"
+
+    def __init__(self, code):
+        go = GetOps()
+        go.process(code)
+
+        self.generation = code.generation
+        self.body = code.ast
+        self.params = code.codeparameters
+        self.ops = tuple(go.ops)
+        self.locals = frozenset(go.locals)
+        self.copies = tuple(go.copies)
+
+    def valid(self, code):
+        # Direct assignment to a field does not bump the generation.
+        return (
+            self.generation == code.generation
+            and self.body is code.ast
+            and self.params is code.codeparameters
+        )
+
+
+class IndexStats(object):
+    __slots__ = "hits", "misses", "invalidations"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+
+stats = IndexStats()
+
+
+def getIndex(code):
+    """Return the cached OpIndex for code, rebuilding it if stale."""
+    index = code.opIndex
+    if index is not None and index.valid(code):
+        stats.hits += 1
+        return index
+
+    if index is None:
+        stats.misses += 1
+    else:
+        stats.invalidations += 1
+
+    index = OpIndex(code)
+    code.opIndex = index
+    return index
+
+
 def getOps(func):
+    if isinstance(func, ast.Code):
+        index = getIndex(func)
+        return index.ops, index.locals
+
     go = GetOps()
     go.process(func)
     return go.ops, go.locals
 
 
 def getAll(func):
+    if isinstance(func, ast.Code):
+        index = getIndex(func)
+        return index.ops, index.locals, index.copies
+
     go = GetOps()
     go.process(func)
     return go.ops, go.locals, go.copies
+
+
+def outputStats(console):
+    lookups = stats.hits + stats.misses + stats.invalidations
+    console.output("op index hits          %d" % stats.hits)
+    console.output("op index misses        %d" % stats.misses)
+    console.output("op index invalidations %d" % stats.invalidations)
+    if lookups:
+        console.output("op index hit rate      %.1f%%" % (100.0 * stats.hits / lookups))
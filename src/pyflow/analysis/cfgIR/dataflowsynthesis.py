@@ -1,3 +1,5 @@
+import heapq
+
 from pyflow.util.typedispatch import *
 from pyflow.util.monkeypatch import xcollections
 
@@ -11,11 +13,88 @@ def shouldSchedule(node):
     return isinstance(node, (graph.OpNode))
 
 
+# The ops that are ready to be scheduled, ordered by priority.
+# Ops that share a predicate, branch-ness and predicate-ness always share a
+# priority, so they are kept in a FIFO group and only the head of each group
+# sits in the heap.  When the priority of a predicate changes, its groups are
+# pushed again and the outdated heap entries are skipped as they surface.
+class Wavefront(object):
+    def __init__(self, priority):
+        self.priority = priority
+        self.heap = []
+        self.groups = {}
+        self.groupPriority = {}
+        self.predicateGroups = xcollections.defaultdict(set)
+        self.members = set()
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, op):
+        return op in self.members
+
+    def groupKey(self, op):
+        return (op.canonicalpredicate, op.isBranch(), op.isPredicateOp())
+
+    def pushGroup(self, key):
+        group = self.groups[key]
+        priority = self.priority(group[0][1])
+        self.groupPriority[key] = priority
+        heapq.heappush(self.heap, (priority, group[0][0], key))
+
+    def add(self, op):
+        if op in self.members:
+            return
+        self.members.add(op)
+
+        key = self.groupKey(op)
+        group = self.groups.get(key)
+        if group is None:
+            group = xcollections.deque()
+            self.groups[key] = group
+            self.predicateGroups[key[0]].add(key)
+
+        group.append((self.sequence, op))
+        self.sequence += 1
+
+        if len(group) == 1:
+            self.pushGroup(key)
+
+    def update(self, ops):
+        for op in ops:
+            self.add(op)
+
+    def pop(self):
+        while True:
+            priority, sequence, key = heapq.heappop(self.heap)
+            group = self.groups[key]
+            if (
+                group
+                and group[0][0] == sequence
+                and self.groupPriority[key] == priority
+            ):
+                break
+
+        sequence, op = group.popleft()
+        self.members.remove(op)
+
+        if group:
+            self.pushGroup(key)
+        return op
+
+    # The priority of the ops with this predicate may have changed.
+    def reprioritize(self, predicate):
+        for key in self.predicateGroups.get(predicate, ()):
+            if self.groups[key]:
+                self.pushGroup(key)
+
+
 class CFGResynthesis(object):
     def __init__(self):
         self.predicateCount = xcollections.defaultdict(lambda: 0)
         self.depends = {}
-        self.wavefront = set()
+        self.wavefront = Wavefront(self.priority)
 
         self.blocks = []
 
@@ -24,7 +103,6 @@ class CFGResynthesis(object):
         self.hyperblock = hyperblock
         self.entryPredicate = entryPredicate
 
-        self.wavefront.update(nodes)
         self.scheduled = set()
 
         self.processed = set()
@@ -53,11 +131,12 @@ class CFGResynthesis(object):
                     if next.hyperblock is hyperblock:
                         self.pending.add(next)
 
-        return self.schedule()
+        return self.schedule(nodes)
 
     # Split the CFG blocks that branch at these predicates.
     def split(self, source):
         newblocks = []
+        changed = set()
 
         for block in self.blocks:
             if (
@@ -67,11 +146,16 @@ class CFGResynthesis(object):
                 branch = cfg.CFGBranch(source)
                 block.addNext(branch)
 
+                for predicate in block.predicates:
+                    self.blockCount[predicate] += len(source.predicates) - 1
+                changed.update(block.predicates)
+
                 for sibling in source.predicates:
                     newkey = block.predicates.union((sibling.canonical(),))
                     newblock = cfg.CFGBlock(self.hyperblock, newkey)
                     newblocks.append(newblock)
                     branch.addNext(newblock)
+                    self.blockCount[sibling.canonical()] += 1
             else:
                 # The split will not occur in this branch.
                 newblocks.append(block)
@@ -79,6 +163,10 @@ class CFGResynthesis(object):
         self.blocks = newblocks
         self.activePredicates.update(source.predicates)
 
+        changed.update(sibling.canonical() for sibling in source.predicates)
+        for predicate in changed:
+            self.wavefront.reprioritize(predicate)
+
     # Clone the op into every block that has a matching predicate
     def putOpInBlocks(self, op):
         # Computations on predicates should not be present in the CFG
@@ -106,10 +194,7 @@ class CFGResynthesis(object):
         if op.isPredicateOp():
             return 0
 
-        count = 0
-        for block in self.blocks:
-            if op.canonicalpredicate in block.predicates:
-                count += 1
+        return self.blockCount.get(op.canonicalpredicate, 0)
 
     # Mark all the ops that become available after this op is executed.
     def scheduleOp(self, op):
@@ -128,41 +213,39 @@ class CFGResynthesis(object):
                 if self.scheduled.issuperset(self.depends[use]):
                     self.wavefront.add(use)
 
+    # Heuristic order of the wavefront, smallest first.
+    # Unpredicated ops go first, then ops whose predicate is active, which
+    # can be placed without splitting.  Non-branches are preferred over
+    # branches, then ops that will be duplicated into fewer blocks.  Ties go
+    # to the op that entered the wavefront first.
+    def priority(self, op):
+        cp = op.canonicalpredicate
+        if cp is None:
+            rank = 0
+        elif cp in self.activePredicates:
+            rank = 1
+        else:
+            rank = 2
+        return (rank, op.isBranch(), self.countDuplication(op))
+
     # Heuristically choose the next op to schedule.
     def chooseBest(self):
-        best = None
-        bestcount = 0
-        for op in self.wavefront:
-            opcount = self.countDuplication(op)
-
-            if best is None or op.canonicalpredicate is None:
-                best = op
-                bestcount = opcount
-            else:
-                if op.canonicalpredicate in self.activePredicates:
-                    if (
-                        best.canonicalpredicate is not None
-                        and best.canonicalpredicate not in self.activePredicates
-                    ):
-                        best = op
-                        bestcount = opcount
-                    elif best.isBranch() and not op.isBranch():
-                        best = op
-                        bestcount = opcount
-                    elif opcount < bestcount:
-                        best = op
-                        bestcount = opcount
-
-        self.wavefront.remove(best)
-        return best
+        return self.wavefront.pop()
 
     # Place all ops into CFG blocks
-    def schedule(self):
+    def schedule(self, nodes):
         key = frozenset((self.entryPredicate.canonical(),))
         self.entryBlock = cfg.CFGBlock(self.hyperblock, key)
         self.blocks.append(self.entryBlock)
         self.activePredicates = set((self.entryPredicate,))
 
+        # The number of blocks each predicate is found in.
+        self.blockCount = xcollections.defaultdict(lambda: 0)
+        for predicate in key:
+            self.blockCount[predicate] += 1
+
+        self.wavefront.update(nodes)
+
         while self.wavefront:
             current = self.chooseBest()
 
@@ -18,6 +18,7 @@ from .constraintextractor import ExtractDataflow
 from .constraints import AssignmentConstraint, DirectCallConstraint
 
 from . import codecloner
+from . import worklist
 
 # Only used for creating return variables
 from pyflow.language.python import ast
@@ -30,6 +31,7 @@ from pyflow.util.python.apply import applyFunction
 
 from pyflow.analysis.astcollector import getOps
 from pyflow import analysis  # for references like analysis.cpasignature
+from pyflow import config
 
 # For keeping track of how much time we spend decompiling.
 import time
@@ -86,7 +88,8 @@ class InterproceduralDataflow(object):
         self.constraints = []
 
         # The worklist
-        self.dirty = collections.deque()
+        assert config.cpaWorklist in worklist.worklists, config.cpaWorklist
+        self.dirty = worklist.worklists[config.cpaWorklist](self)
 
         self.canonical = graph.canonical
         self._canonicalContext = canonical.CanonicalCache(base.AnalysisContext)
@@ -96,6 +99,12 @@ class InterproceduralDataflow(object):
         self.opPathLength = opPathLength
         self.cache = {}
 
+        # Once a code has this many contexts, new signatures are widened.
+        self.contextBudget = config.cpaContextBudget
+        self.contextWidening = config.cpaContextWidening
+        assert self.contextWidening in ("params", "path"), self.contextWidening
+        self.mergedContexts = collections.defaultdict(set)
+
         # Information for contextual operations.
         self.opAllocates = collections.defaultdict(set)
         self.opReads = collections.defaultdict(set)
@@ -210,11 +219,32 @@ class InterproceduralDataflow(object):
 
         context = self._canonicalContext(sig, opPath, self.storeGraph)
 
+        contexts = self.codeContexts[code]
+        if context not in contexts and self.overContextBudget(contexts):
+            self.mergedContexts[code].add(context)
+            context = self.widenedContext(code, selfparam, params, opPath)
+
         # Mark that we created the context.
-        self.codeContexts[code].add(context)
+        contexts.add(context)
 
         return context
 
+    def overContextBudget(self, contexts):
+        return self.contextBudget is not None and len(contexts) >= self.contextBudget
+
+    def widenedContext(self, code, selfparam, params, opPath):
+        # A summary of every further signature of the code.  The argument
+        # types flow in through assignments, as for megamorphic arguments.
+        params = tuple(
+            [None if param is None else cpasignature.Any for param in params]
+        )
+
+        if self.contextWidening == "path" and opPath is not None:
+            opPath = self.initialOpPath()
+
+        sig = self._signature(code, selfparam, params)
+        return self._canonicalContext(sig, opPath, self.storeGraph)
+
     # This is the policy that determines what names a given allocation gets.
     def extendedInstanceType(self, context, xtype, op):
         if xtype.obj is None:
@@ -244,9 +274,7 @@ class InterproceduralDataflow(object):
         return self.canonical.pathType(context.opPath, instObj, op)
 
     def process(self):
-        while self.dirty:
-            current = self.dirty.popleft()
-            current.process()
+        self.dirty.process()
 
     def createAssign(self, source, dest):
         AssignmentConstraint(self, source, dest)
@@ -599,7 +627,7 @@ class InterproceduralDataflow(object):
             )
 
     def slotMemory(self):
-        return self.storeGraph.setManager.memory()
+        return self.storeGraph.memory()
 
     def dumpSolveInfo(self):
         console = self.console
@@ -612,11 +640,49 @@ class InterproceduralDataflow(object):
         )
         console.output("Slot Memory:   %s" % formatting.memorySize(self.slotMemory()))
         console.output("")
+        self.dumpContextInfo()
+        self.dirty.output(console)
         console.output("Decompile:     %s" % formatting.elapsedTime(self.decompileTime))
         console.output("Solve:         %s" % formatting.elapsedTime(self.solveTime))
         console.output("")
 
 
+    def dumpContextInfo(self, limit=10):
+        console = self.console
+
+        merged = sum([len(contexts) for contexts in self.mergedContexts.values()])
+        if self.contextBudget is None:
+            console.output("Context budget: unbounded")
+        else:
+            console.output(
+                "Context budget: %d per code, widening %s"
+                % (self.contextBudget, self.contextWidening)
+            )
+        console.output(
+            "Widened:       %d code, %d signatures merged"
+            % (len(self.mergedContexts), merged)
+        )
+
+        codes = [code for code in self.codeContexts if code is not self.externalFunction]
+        codes.sort(
+            key=lambda code: (
+                -len(self.codeContexts[code]),
+                -len(self.mergedContexts.get(code, ())),
+                code.codeName(),
+            )
+        )
+        for code in codes[:limit]:
+            console.output(
+                "    %-30s %5d created %5d merged"
+                % (
+                    code.codeName(),
+                    len(self.codeContexts[code]),
+                    len(self.mergedContexts.get(code, ())),
+                )
+            )
+        console.output("")
+
+
 def evaluateWithImage(compiler, prgm, opPathLength=0, firstPass=True, clone=False):
     with compiler.console.scope("cpa analysis"):
         dataflow = InterproceduralDataflow(
@@ -636,7 +702,15 @@ def evaluateWithImage(compiler, prgm, opPathLength=0, firstPass=True, clone=Fals
             # Helps free up memory.
             with compiler.console.scope("cleanup"):
                 del dataflow.constraints
-                dataflow.storeGraph.removeObservers()
+                frozen = dataflow.storeGraph.freeze()
+                compiler.console.output(
+                    "Frozen:        %d slots, %d objects"
+                    % (len(frozen.slots), len(frozen.objects))
+                )
+                compiler.console.output(
+                    "Retained:      %s"
+                    % formatting.memorySize(dataflow.slotMemory())
+                )
 
             with compiler.console.scope("annotate"):
                 dataflow.annotate()
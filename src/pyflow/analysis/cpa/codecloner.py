@@ -157,6 +157,7 @@ class FunctionCloner(TypeDispatcher):
 
         newcode = self.codeMap[code]
         newcode.replaceChildren(self)
+        newcode.mutated()
 
     def op(self, op):
         """Get cloned operation node.
@@ -655,7 +655,7 @@ class SimpleCheckConstraint(Constraint):
         # Reads no locals.
         return ()
 
-    def write(self):
+    def writes(self):
         return (self.target,)
 
 
@@ -0,0 +1,177 @@
+"""Worklists for the CPA constraint solver.
+
+A constraint is scheduled by Constraint.mark, which appends it to the
+worklist of the system, and the solver fires scheduled constraints until
+none remain.  The order constraints are fired in does not change the
+solution, but it does change how many firings it takes to reach it.
+
+FIFOWorklist fires constraints in the order they were scheduled.  Types
+propagating along a long chain of assignments may then visit each link many
+times, as every partial update of the head schedules the whole chain again.
+
+SCCWorklist ranks constraints topologically by their slot dependencies.  A
+constraint depends on another if it observes a slot the other writes.
+Strongly connected components share a rank, so a cycle is drained to a
+local fixpoint before anything downstream of it is fired.  New constraints
+are attached throughout the solve, so the ranking is recomputed lazily,
+whenever the number of constraints has grown by rankGrowth.  Until then a
+new constraint inherits the rank of the constraint that was being fired.
+"""
+
+import collections
+import heapq
+
+from pyflow.analysis.storegraph import storegraph
+from pyflow.util.PADS.StrongConnectivity import StronglyConnectedComponents
+
+
+class Worklist(object):
+    def __init__(self, sys):
+        self.sys = sys
+
+        self.firings = 0
+        self.useful = 0
+        self.scheduled = 0
+        self.maxQueue = 0
+
+    def append(self, constraint):
+        self.push(constraint)
+        self.scheduled += 1
+        self.maxQueue = max(self.maxQueue, len(self))
+
+    def process(self):
+        constraints = self.sys.constraints
+
+        while self:
+            current = self.pop()
+
+            scheduled = self.scheduled
+            created = len(constraints)
+
+            current.process()
+
+            # A firing is useful if it scheduled or created more work.
+            self.firings += 1
+            if self.scheduled != scheduled or len(constraints) != created:
+                self.useful += 1
+
+    def output(self, console):
+        console.output("Worklist:      %s" % self.name)
+        console.output("Firings:       %d" % self.firings)
+        if self.firings:
+            console.output(
+                "Useful:        %d (%.1f%%)"
+                % (self.useful, 100.0 * self.useful / self.firings)
+            )
+        console.output("Max queue:     %d" % self.maxQueue)
+
+
+class FIFOWorklist(Worklist):
+    name = "fifo"
+
+    def __init__(self, sys):
+        Worklist.__init__(self, sys)
+        self.queue = collections.deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, constraint):
+        self.queue.append(constraint)
+
+    def pop(self):
+        return self.queue.popleft()
+
+
+class SCCWorklist(Worklist):
+    name = "scc"
+
+    # Rank again once the constraints have grown by this factor.
+    rankGrowth = 2.0
+    # Do not bother ranking fewer constraints than this.
+    rankMinimum = 32
+
+    def __init__(self, sys):
+        Worklist.__init__(self, sys)
+        self.heap = []
+        self.sequence = 0
+
+        self.rank = {}
+        self.current = 0
+        self.ranked = 0
+        self.rankings = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, constraint):
+        rank = self.rank.get(constraint)
+        if rank is None:
+            rank = self.current
+            self.rank[constraint] = rank
+
+        heapq.heappush(self.heap, (rank, self.sequence, constraint))
+        self.sequence += 1
+
+    def pop(self):
+        count = len(self.sys.constraints)
+        if count >= self.rankMinimum and count >= self.ranked * self.rankGrowth:
+            self.rerank()
+
+        rank, sequence, constraint = heapq.heappop(self.heap)
+        self.current = rank
+        return constraint
+
+    def dependencies(self, constraints):
+        writers = collections.defaultdict(set)
+        for constraint in constraints:
+            for slot in constraint.writes():
+                if isinstance(slot, storegraph.SlotNode):
+                    writers[slot.getForward()].add(constraint)
+
+        # Writers observe their targets as well, but they do not depend on
+        # each other.
+        G = {}
+        for constraint in constraints:
+            G[constraint] = []
+
+        for slot, slotWriters in writers.items():
+            readers = [
+                observer
+                for observer in slot.observers
+                if observer not in slotWriters
+            ]
+            if readers:
+                for writer in slotWriters:
+                    G[writer].extend(readers)
+
+        return G
+
+    def rerank(self):
+        constraints = self.sys.constraints
+        G = self.dependencies(constraints)
+
+        # Components are listed after every component they reach.
+        components = list(StronglyConnectedComponents(G))
+        last = len(components) - 1
+        rank = {}
+        for i, component in enumerate(components):
+            for constraint in component:
+                rank[constraint] = last - i
+        self.rank = rank
+
+        self.heap = [
+            (rank[constraint], sequence, constraint)
+            for oldRank, sequence, constraint in self.heap
+        ]
+        heapq.heapify(self.heap)
+
+        self.ranked = len(constraints)
+        self.rankings += 1
+
+    def output(self, console):
+        Worklist.output(self, console)
+        console.output("Rankings:      %d" % self.rankings)
+
+
+worklists = {"fifo": FIFOWorklist, "scc": SCCWorklist}
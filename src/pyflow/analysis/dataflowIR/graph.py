@@ -23,6 +23,57 @@ read/modify sets, value propagation, and control flow dependencies.
 from pyflow.language.python import ast
 
 
+# Edit tracking.  While an EditTracker is active, the edit operations of the
+# nodes record the nodes whose edges they change, so a transform driver can
+# revisit only those.
+_tracker = None
+
+
+def touch(*nodes):
+    """Record nodes whose edges changed, if an EditTracker is active.
+
+    Args:
+        *nodes: Dataflow nodes, None is ignored
+    """
+    if _tracker is not None:
+        for node in nodes:
+            if node is not None:
+                _tracker.add(node)
+
+
+class EditTracker(object):
+    """Collects the nodes touched by graph edits while it is active.
+
+    Used as a context manager, the dirty nodes are the value of the with
+    statement.  Trackers nest, an inner tracker also reports to the outer
+    one.
+
+    Attributes:
+        dirty: Touched nodes, a dict used as an ordered set
+        outer: Tracker that was active when this one was entered
+    """
+    def __init__(self):
+        self.dirty = {}
+        self.outer = None
+
+    def add(self, node):
+        self.dirty[node] = None
+        if self.outer is not None:
+            self.outer.add(node)
+
+    def __enter__(self):
+        global _tracker
+        self.outer = _tracker
+        _tracker = self
+        return self.dirty
+
+    def __exit__(self, type, value, tb):
+        global _tracker
+        _tracker = self.outer
+        self.outer = None
+        return False
+
+
 class Hyperblock(object):
     """Represents a hyperblock (region) in the dataflow graph.
     
@@ -62,8 +113,10 @@ class DataflowNode(object):
     Attributes:
         hyperblock: Hyperblock this node belongs to (None for global nodes)
         _annotation: Analysis annotation attached to this node
+        uid: Dense id, the position of the node in the last ordering of
+             its graph (-1 until the node has been ordered)
     """
-    __slots__ = "hyperblock", "_annotation"
+    __slots__ = "hyperblock", "_annotation", "uid"
 
     def __init__(self, hyperblock):
         """Initialize a dataflow node.
@@ -76,6 +129,7 @@ class DataflowNode(object):
         )
         self.hyperblock = hyperblock
         self._annotation = None
+        self.uid = -1
 
     @property
     def canonicalpredicate(self):
@@ -285,14 +339,17 @@ class FlowSensitiveSlotNode(SlotNode):
     def addDefn(self, op):
         # HACK should we allow redundant setting, or force a merge?
         assert self.defn is None or self.defn is op, (self, op)
+        touch(self, op)
         self.defn = op
         return self
 
     def removeDefn(self, op):
         assert self.defn is op
+        touch(self, op)
         self.defn = None
 
     def addUse(self, op):
+        touch(self, op)
         if self.use is None:
             self.use = op
             return self
@@ -325,10 +382,12 @@ class FlowSensitiveSlotNode(SlotNode):
 
     def removeUse(self, op):
         assert self.use is op
+        touch(self, op)
         self.use = None
 
     def redirect(self, other):
         other = other.canonical()
+        touch(self, other)
 
         if self.use is not None and self.use.isSplit():
             # Reach past the split
@@ -340,6 +399,7 @@ class FlowSensitiveSlotNode(SlotNode):
         for node in nodes:
             if node.use:
                 node.use.replaceUse(node, other.addUse(node.use))
+                touch(node)
                 node.use = None
 
     def forward(self):
@@ -565,6 +625,7 @@ class ExistingNode(SlotNode):
         Returns:
             ExistingNode: Self (existing nodes are canonicalized)
         """
+        touch(self, op)
         self.uses.append(op)
         return self
 
@@ -574,6 +635,7 @@ class ExistingNode(SlotNode):
         Args:
             op: Operation no longer using this object
         """
+        touch(self, op)
         self.uses.remove(op)
 
     def duplicate(self):
@@ -650,14 +712,17 @@ class NullNode(SlotNode):
     def addDefn(self, op):
         assert op.isEntry(), op
         assert self.defn is None
+        touch(self, op)
         self.defn = op
         return self
 
     def addUse(self, op):
+        touch(self, op)
         self.uses.append(op)
         return self
 
     def removeUse(self, op):
+        touch(self, op)
         self.uses.remove(op)
 
     def duplicate(self):
@@ -970,7 +1035,7 @@ class Exit(PredicatedOpNode):
         return ()
 
     def reverse(self):
-        return [self.predicate] + self.reads.values()
+        return [self.predicate] + list(self.reads.values())
 
     def sanityCheck(self):
         for slot in self.reads.values():
@@ -982,6 +1047,7 @@ class Exit(PredicatedOpNode):
     def replaceUse(self, original, replacement):
         assert original is not None
         assert replacement is not None
+        touch(self, original, replacement)
 
         if self.predicate is original:
             self.predicate = replacement
@@ -1072,6 +1138,7 @@ class Gate(PredicatedOpNode):
             original: Original slot node
             replacement: Replacement slot node
         """
+        touch(self, original, replacement)
         if self.predicate is original:
             self.predicate = replacement
         else:
@@ -1086,6 +1153,7 @@ class Gate(PredicatedOpNode):
             replacement: Replacement modify slot
         """
         assert self.modify is original
+        touch(self, original, replacement)
         self.modify = replacement
 
     def __repr__(self):
@@ -1187,12 +1255,14 @@ class Merge(OpNode):
         # self.sanityCheck()
 
     def replaceUse(self, original, replacement):
+        touch(self, original, replacement)
         hit = replaceList(self.reads, original, replacement)
         assert hit, original
         # self.sanityCheck()
 
     def replaceDefn(self, original, replacement):
         assert self.modify is original
+        touch(self, original, replacement)
         self.modify = replacement
         # self.sanityCheck()
 
@@ -1289,6 +1359,7 @@ class Split(OpNode):
             replacement: Replacement read slot
         """
         assert self.read is original
+        touch(self, original, replacement)
         self.read = replacement
         # self.sanityCheck()
 
@@ -1299,6 +1370,7 @@ class Split(OpNode):
             original: Original modify slot
             replacement: Replacement modify slot
         """
+        touch(self, original, replacement)
         hit = replaceList(self.modifies, original, replacement)
         assert hit, original
         # self.sanityCheck()
@@ -1340,6 +1412,7 @@ class Split(OpNode):
         if len(self.modifies) == 1:
             new = self.read
             old = self.modifies[0]
+            touch(self, old)
             old.use.replaceUse(old, new)
             new.use = old.use
 
@@ -1431,6 +1504,7 @@ class GenericOp(PredicatedOpNode):
         return isinstance(self.op, ast.Store)
 
     def replaceUse(self, original, replacement):
+        touch(self, original, replacement)
         if isinstance(original, PredicateNode):
             assert original is self.predicate
             self.predicate = replacement
@@ -1457,6 +1531,7 @@ class GenericOp(PredicatedOpNode):
         # self.sanityCheck()
 
     def replaceDef(self, original, replacement):
+        touch(self, original, replacement)
         if isinstance(original, (LocalNode, ExistingNode)):
             assert isinstance(replacement, (LocalNode, ExistingNode)), replacement
             hit = replaceList(self.localModifies, original, replacement)
@@ -1509,14 +1584,14 @@ class GenericOp(PredicatedOpNode):
             return "op(%r)" % self.op
 
     def forward(self):
-        return self.localModifies + self.heapModifies.values() + self.predicates
+        return self.localModifies + list(self.heapModifies.values()) + self.predicates
 
     def reverse(self):
         return (
             [self.predicate]
-            + self.localReads.values()
-            + self.heapReads.values()
-            + self.heapPsedoReads.values()
+            + list(self.localReads.values())
+            + list(self.heapReads.values())
+            + list(self.heapPsedoReads.values())
         )
 
     def sanityCheck(self):
@@ -1557,8 +1632,9 @@ class DataflowGraph(object):
         existing: Dictionary mapping objects to ExistingNode instances
         null: NullNode for null values
         entryPredicate: PredicateNode for entry control flow
+        order: Cached Ordering of the graph, or None if it must be recomputed
     """
-    __slots__ = "entry", "exit", "existing", "null", "entryPredicate"
+    __slots__ = "entry", "exit", "existing", "null", "entryPredicate", "order"
 
     def __init__(self, hyperblock):
         """Initialize a dataflow graph.
@@ -1573,6 +1649,16 @@ class DataflowGraph(object):
 
         self.entryPredicate = None
 
+        self.order = None
+
+    def invalidateOrder(self):
+        """Discard the cached ordering.
+
+        The nodes do not know their graph, so a pass that changes the edges
+        of the graph must call this before the graph is ordered again.
+        """
+        self.order = None
+
     # Separated from __init__ method, as transformation passes may want to do this manually.
     def initPredicate(self):
         """Initialize the entry predicate.
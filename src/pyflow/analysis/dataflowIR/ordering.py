@@ -1,128 +1,156 @@
 """Topological ordering for dataflow graphs.
 
 This module provides functionality to compute a topological ordering
-of operations in a dataflow graph. The ordering respects data dependencies,
-ensuring that operations are ordered before their uses.
-
-The algorithm uses a combination of pre-order and post-order numbering
-to compute a reverse post-order traversal, which provides a valid
-topological order for dataflow analysis.
+of the nodes in a dataflow graph. The ordering respects data dependencies,
+ensuring that definitions are ordered before their uses.
+
+The search is an iterative depth-first search, so deep graphs do not
+exhaust the Python stack, and the reverse post-order of the nodes it
+reaches is a valid topological order.  Every ordered node is given a dense
+id, its position in the order, so passes can keep per-node data in lists
+indexed by node.uid instead of dictionaries.
+
+The ordering is cached on the graph.  Passes that change the edges of the
+graph call DataflowGraph.invalidateOrder, and the next pass to ask for the
+ordering recomputes it.
 """
 
-from . import graph
+
+class Ordering(object):
+    """Topological ordering of a dataflow graph.
+
+    Attributes:
+        nodes: Every node reachable from the entry points, in topological
+               order; nodes[node.uid] is node
+        ops: The operation nodes, in topological order
+    """
+    __slots__ = "nodes", "ops"
+
+    def __init__(self, nodes):
+        """Initialize an ordering and number its nodes.
+
+        Args:
+            nodes: Nodes in topological order
+        """
+        self.nodes = nodes
+        for uid, node in enumerate(nodes):
+            node.uid = uid
+
+        self.ops = [node for node in nodes if node.isOp()]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def contains(self, node):
+        """Check if a node was ordered, ids left over from an older
+        ordering are not trusted.
+
+        Args:
+            node: Dataflow node
+
+        Returns:
+            bool: True if node is part of this ordering
+        """
+        uid = node.uid
+        return 0 <= uid < len(self.nodes) and self.nodes[uid] is node
 
 
 class OrderSearcher(object):
-    """Computes topological ordering of dataflow graph operations.
-    
-    This class performs a depth-first search of the dataflow graph,
-    assigning pre-order and post-order numbers to nodes, and collecting
-    operation nodes in reverse post-order (which is a valid topological order).
-    
+    """Computes topological ordering of dataflow graph nodes.
+
+    This class performs an iterative depth-first search of the dataflow
+    graph.  Discovered nodes are numbered in discovery order, and the
+    number indexes the list of discovered nodes, so checking whether a node
+    has been seen needs neither a set nor a dictionary.
+
     The algorithm:
     1. Start from entry and existing nodes
-    2. Perform DFS, assigning pre-order numbers
-    3. When revisiting nodes, assign post-order numbers
-    4. Collect operation nodes in reverse post-order
-    
+    2. Walk forward edges with an explicit stack of successor iterators
+    3. Emit a node once all of its successors have been emitted
+    4. Reverse the emitted nodes to get the topological order
+
     Attributes:
-        queue: Queue of nodes to process
-        enqueued: Set of nodes already enqueued
-        preorder: Dictionary mapping nodes to pre-order numbers
-        uid: Unique identifier counter
-        order: List of operations in topological order
+        discovered: Discovered nodes, indexed by their discovery number
+        postorder: Nodes whose successors have all been emitted
     """
     def __init__(self):
         """Initialize the order searcher."""
-        self.queue = []
-        self.enqueued = set()
-        self.preorder = {}
-        self.uid = 0
-
-        self.order = []
-
-    def mark(self, node):
-        """Mark a node for processing.
-        
-        Adds a node to the queue if it hasn't been enqueued yet.
-        
-        Args:
-            node: Dataflow node to mark
-        """
-        if node not in self.enqueued:
-            self.enqueued.add(node)
-            self.queue.append(node)
-
-    def handleNode(self, node):
-        """Handle a node during DFS traversal.
-        
-        If node hasn't been visited (no pre-order number), assign one
-        and enqueue its successors. If already visited, assign post-order
-        number and add to order list if it's an operation.
-        
-        Args:
-            node: Dataflow node to handle
-        """
-        if node not in self.preorder:
-            # First visit: assign pre-order number
-            self.preorder[node] = self.uid
-            self.uid += 1
+        self.discovered = []
+        self.postorder = []
 
-            self.queue.append(node)
+    def seen(self, node):
+        uid = node.uid
+        return 0 <= uid < len(self.discovered) and self.discovered[uid] is node
 
-            # Enqueue successors
-            for child in node.forward():
-                self.mark(child)
-        else:
-            # Revisit: assign post-order number
-            postorder = self.uid
-            self.uid += 1
+    def discover(self, node):
+        node.uid = len(self.discovered)
+        self.discovered.append(node)
 
-            forward = (self.preorder[node], postorder)
+    def search(self, root):
+        """Emit the nodes reachable from root in post-order.
 
-            # Add operations to order list
-            if isinstance(node, graph.OpNode):
-                self.order.append(node)
+        Args:
+            root: Dataflow node to start from
+        """
+        if root is None or self.seen(root):
+            return
+
+        discovered = self.discovered
+        postorder = self.postorder
+
+        self.discover(root)
+        stack = [(root, iter(root.forward()))]
+
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                # Inlined self.seen, this is the inner loop.
+                uid = child.uid
+                if not (0 <= uid < len(discovered) and discovered[uid] is child):
+                    child.uid = len(discovered)
+                    discovered.append(child)
+                    stack.append((child, iter(child.forward())))
+                    break
+            else:
+                stack.pop()
+                postorder.append(node)
 
     def process(self, dataflow):
         """Process a dataflow graph to compute topological order.
-        
+
         Starts from entry points (entry, existing nodes, null, entryPredicate)
         and performs DFS to compute ordering.
-        
+
         Args:
             dataflow: DataflowGraph to process
-            
+
         Returns:
-            list: List of OpNode objects in topological order (reverse post-order)
+            Ordering: The nodes in topological order (reverse post-order)
         """
-        # Start from entry points
-        self.mark(dataflow.entry)
+        self.search(dataflow.entry)
         for node in dataflow.existing.values():
-            self.mark(node)
-        self.mark(dataflow.null)
-        self.mark(dataflow.entryPredicate)
-
-        # Process queue
-        while self.queue:
-            self.handleNode(self.queue.pop())
+            self.search(node)
+        self.search(dataflow.null)
+        self.search(dataflow.entryPredicate)
 
         # Reverse to get reverse post-order (topological order)
-        self.order.reverse()
-        return self.order
+        self.postorder.reverse()
+        return Ordering(self.postorder)
 
 
 def evaluateDataflow(dataflow):
-    """Compute topological ordering of operations in a dataflow graph.
-    
-    Main entry point for computing operation ordering. Returns operations
-    in an order that respects data dependencies (definitions before uses).
-    
+    """Get the topological ordering of a dataflow graph.
+
+    Main entry point for computing node ordering. The ordering is cached on
+    the graph, so passes that run one after another share it until one of
+    them invalidates it.
+
     Args:
         dataflow: DataflowGraph to order
-        
+
     Returns:
-        list: List of OpNode objects in topological order
+        Ordering: The nodes and operations in topological order
     """
-    searcher = OrderSearcher()
-    return searcher.process(dataflow)
+    if dataflow.order is None:
+        dataflow.order = OrderSearcher().process(dataflow)
+    return dataflow.order
@@ -12,14 +12,162 @@ Key concepts:
 
 The predicate graph enables analysis of control flow structure and can be used
 for optimizations like predicate-aware dead code elimination.
+
+Each predicate is also given a symbolic term, a boolean tree over the cases
+of the type switches that define it.  Terms are hash-consed by the tree
+manager of a PredicateAlgebra, so equivalent predicates have identical
+terms, and the conjunctions, disjunctions and implications computed with
+them are memoized for the life of the algebra.
 """
 
 from pyflow.util.typedispatch import *
 from pyflow.util.graphalgorithim.dominator import dominatorTree
 
 from pyflow.analysis.dataflowIR import graph
+from pyflow.analysis.fsdf import canonicaltree
+
+from . import ordering
+
+
+class PredicateTable(object):
+    """A memo table of the predicate algebra.
+
+    Attributes:
+        name: Name used when reporting
+        table: Computed results
+        hits: Lookups answered by the table
+        misses: Lookups that had to be computed
+    """
+    __slots__ = "name", "table", "hits", "misses"
+
+    def __init__(self, name):
+        self.name = name
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def get(self, key):
+        result = self.table.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, key, result):
+        self.table[key] = result
+        return result
+
+    def rate(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+
+class PredicateAlgebra(object):
+    """Hash-consed boolean terms for dataflow predicates.
+
+    The terms are canonical boolean trees from fsdf.canonicaltree.  Every
+    type switch is a condition with one value per case, and the terms of
+    equivalent predicates are the same object, so comparing them is an
+    identity check.  The manager interns the trees in a weak cache, but the
+    caches of its tree functions are cleared after every call.  The results
+    of the operations here are kept, so asking the same question twice is a
+    lookup.
+
+    Attributes:
+        conditions: ConditionManager holding a condition for each switch
+        manager: Boolean CanonicalTreeManager
+        true: The term of a predicate that always holds
+        false: The term of a predicate that never holds
+        cases: Terms for the cases of a switch
+        conjunctions: Memoized and_
+        disjunctions: Memoized or_
+        implications: Memoized implies
+    """
+    def __init__(self):
+        self.conditions = canonicaltree.ConditionManager()
+        self.manager = canonicaltree.BoolManager(self.conditions)
+        self.true = self.manager.true
+        self.false = self.manager.false
+
+        self.cases = PredicateTable("case")
+        self.conjunctions = PredicateTable("and")
+        self.disjunctions = PredicateTable("or")
+        self.implications = PredicateTable("implies")
+
+    def case(self, switch, index, count):
+        """Get the term for a case of a switch being taken.
+
+        Args:
+            switch: The op switching, it names the condition
+            index: Case taken
+            count: Number of cases of the switch
+
+        Returns:
+            Boolean tree
+        """
+        key = (switch, index)
+        result = self.cases.get(key)
+        if result is None:
+            cond = self.conditions.condition(switch, range(count))
+            result = self.cases.set(key, cond.mask[index])
+        return result
+
+    def and_(self, a, b):
+        if a is b:
+            return a
+        key = (a, b) if id(a) < id(b) else (b, a)
+        result = self.conjunctions.get(key)
+        if result is None:
+            result = self.conjunctions.set(key, self.manager.and_(a, b))
+        return result
+
+    def or_(self, a, b):
+        if a is b:
+            return a
+        key = (a, b) if id(a) < id(b) else (b, a)
+        result = self.disjunctions.get(key)
+        if result is None:
+            result = self.disjunctions.set(key, self.manager.or_(a, b))
+        return result
+
+    def implies(self, a, b):
+        """Check if b holds whenever a holds.
+
+        Args:
+            a: Boolean tree
+            b: Boolean tree
+
+        Returns:
+            bool: True if a implies b
+        """
+        if a is b:
+            return True
+        key = (a, b)
+        result = self.implications.get(key)
+        if result is None:
+            result = self.implications.set(key, self.and_(a, b) is a)
+        return result
 
-from .traverse import dfs
+    def tables(self):
+        return (
+            self.cases,
+            self.conjunctions,
+            self.disjunctions,
+            self.implications,
+        )
+
+    def output(self, console):
+        console.output("Table          Hits     Misses    Entries   Rate")
+        for table in self.tables():
+            console.output(
+                "%-8s %10d %10d %10d %5.1f%%"
+                % (table.name, table.hits, table.misses, len(table), table.rate() * 100.0)
+            )
+        console.output("Terms interned by the manager: %d" % len(self.manager.trees))
 
 
 class PredicateGraph(object):
@@ -37,15 +185,23 @@ class PredicateGraph(object):
         reverse: Reverse edges (predicate -> predecessors)
         tree: Dominator tree structure
         idom: Immediate dominator mapping
+        algebra: PredicateAlgebra the terms belong to
+        terms: Symbolic term of each canonical predicate
     """
-    def __init__(self):
-        """Initialize an empty predicate graph."""
+    def __init__(self, algebra=None):
+        """Initialize an empty predicate graph.
+
+        Args:
+            algebra: PredicateAlgebra to share, None creates one
+        """
         self.entry = None
         self.exit = None
         self.forward = {}
         self.reverse = {}
         self.tree = None
         self.idom = None
+        self.algebra = algebra if algebra is not None else PredicateAlgebra()
+        self.terms = {}
 
     def _declare(self, pred):
         """Declare a predicate in the graph.
@@ -81,6 +237,26 @@ class PredicateGraph(object):
         self.forward[src].append(dst)
         self.reverse[dst].append(src)
 
+    def define(self, pred, term):
+        """Give a predicate its symbolic term.
+
+        Args:
+            pred: PredicateNode
+            term: Boolean tree from the algebra
+        """
+        self.terms[pred.canonical()] = term
+
+    def term(self, pred):
+        """Get the symbolic term of a predicate.
+
+        Args:
+            pred: PredicateNode
+
+        Returns:
+            Boolean tree, or None if the predicate was not defined
+        """
+        return self.terms.get(pred.canonical())
+
     def finalize(self):
         """Finalize the predicate graph and compute dominance.
         
@@ -118,6 +294,45 @@ class PredicateGraph(object):
 
         return False
 
+    def implies(self, src, dst):
+        """Check if dst holds whenever src holds.
+
+        Dominance is a structural approximation of this: a predicate is
+        the conjunction of the predicates dominating it with the cases
+        taken since, so dst dominating src implies it.  Implication also
+        holds where the paths rejoin without dominating, such as after a
+        merge of every case of a switch.
+
+        Args:
+            src: Predicate that holds
+            dst: Predicate to check
+
+        Returns:
+            bool: True if src implies dst
+        """
+        a = self.term(src)
+        b = self.term(dst)
+        if a is None or b is None:
+            return self.dominates(dst, src)
+        return self.algebra.implies(a, b)
+
+    def equivalent(self, a, b):
+        """Check if two predicates hold on the same paths.
+
+        Args:
+            a: PredicateNode
+            b: PredicateNode
+
+        Returns:
+            bool: True if the predicates are equivalent
+        """
+        a = a.canonical()
+        b = b.canonical()
+        if a is b:
+            return True
+        term = self.term(a)
+        return term is not None and term is self.term(b)
+
 
 class PredicateGraphBuilder(TypeDispatcher):
     """Builds predicate graph from dataflow graph.
@@ -129,10 +344,14 @@ class PredicateGraphBuilder(TypeDispatcher):
     Attributes:
         pg: PredicateGraph being built
     """
-    def __init__(self):
-        """Initialize the predicate graph builder."""
+    def __init__(self, algebra=None):
+        """Initialize the predicate graph builder.
+
+        Args:
+            algebra: PredicateAlgebra to build the terms with, None creates one
+        """
         TypeDispatcher.__init__(self)
-        self.pg = PredicateGraph()
+        self.pg = PredicateGraph(algebra)
 
     @dispatch(
         graph.Entry,
@@ -177,8 +396,14 @@ class PredicateGraphBuilder(TypeDispatcher):
             node: GenericOp node
         """
         # Generic ops may generate new predicates
-        for child in node.predicates:
-            self.pg.depends(node.predicate, child)
+        if node.predicates:
+            algebra = self.pg.algebra
+            parent = self.pg.term(node.predicate)
+            count = len(node.predicates)
+            for i, child in enumerate(node.predicates):
+                self.pg.depends(node.predicate, child)
+                if parent is not None:
+                    self.pg.define(child, algebra.and_(parent, algebra.case(node, i, count)))
 
     @dispatch(graph.Merge)
     def visitMerge(self, node):
@@ -192,17 +417,31 @@ class PredicateGraphBuilder(TypeDispatcher):
         """
         if node.isPredicateOp():
             # Merges may generate new predicates
+            algebra = self.pg.algebra
             dst = node.modify
+            term = algebra.false
             for prev in node.reads:
                 assert isinstance(prev.defn, graph.Gate), prev.defn
                 src = prev.defn.read
                 self.pg.depends(src, dst)
 
+                # Without terms for its inputs, the merge is left to dominance.
+                gate = self.pg.term(prev.defn.predicate)
+                value = self.pg.term(src)
+                if term is None or gate is None or value is None:
+                    term = None
+                else:
+                    term = algebra.or_(term, algebra.and_(gate, value))
+
+            if term is not None:
+                self.pg.define(dst, term)
+
     def process(self, dataflow):
         """Process a dataflow graph to build predicate graph.
         
-        Traverses the dataflow graph and extracts predicate dependencies,
-        then finalizes the predicate graph with dominance information.
+        Visits the nodes of the cached ordering and extracts predicate
+        dependencies, then finalizes the predicate graph with dominance
+        information.
         
         Args:
             dataflow: DataflowGraph to process
@@ -211,21 +450,24 @@ class PredicateGraphBuilder(TypeDispatcher):
             PredicateGraph: Complete predicate graph with dominance info
         """
         self.pg.entry = dataflow.entryPredicate.canonical()
-        dfs(dataflow, self)
+        self.pg.define(self.pg.entry, self.pg.algebra.true)
+        for node in ordering.evaluateDataflow(dataflow).nodes:
+            self(node)
         self.pg.finalize()
         return self.pg
 
 
-def buildPredicateGraph(dataflow):
+def buildPredicateGraph(dataflow, algebra=None):
     """Build predicate graph from a dataflow graph.
     
     Main entry point for predicate graph construction.
     
     Args:
         dataflow: DataflowGraph to build predicate graph from
+        algebra: PredicateAlgebra to share between graphs, None creates one
         
     Returns:
         PredicateGraph: Complete predicate graph
     """
-    pgb = PredicateGraphBuilder()
+    pgb = PredicateGraphBuilder(algebra)
     return pgb.process(dataflow)
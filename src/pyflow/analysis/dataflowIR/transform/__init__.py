@@ -6,10 +6,11 @@ intermediate representation to optimize programs.
 Key components:
 - DCE (Dead Code Elimination): Removes unreachable or unused code
 - LoadElimination: Eliminates redundant memory loads
+- Driver: Runs both to a fixpoint, revisiting only what changed
 - Transform utilities: Common transformation infrastructure
 
 These transformations improve program performance by removing unnecessary
 operations and optimizing data flow patterns.
 """
 
-from . import dce, loadelimination
+from . import dce, loadelimination, driver
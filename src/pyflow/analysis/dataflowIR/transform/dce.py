@@ -5,10 +5,13 @@ liveness analysis to identify nodes that are not used and removes them
 from the graph.
 
 The algorithm:
-1. Perform backward liveness analysis from exit node
+1. Sweep the cached topological ordering backwards from the exit node
 2. Mark all live nodes (nodes that contribute to exit)
 3. Remove dead nodes and clean up edges
 
+Liveness is kept in a bytearray indexed by the dense node ids of the
+ordering.  The ordering is only invalidated if something was removed.
+
 Dead code elimination is important for:
 - Reducing graph size
 - Enabling further optimizations
@@ -17,6 +20,7 @@ Dead code elimination is important for:
 
 from pyflow.util.typedispatch import *
 import pyflow.analysis.dataflowIR.graph as graph
+from pyflow.analysis.dataflowIR import ordering
 
 
 class LivenessKiller(TypeDispatcher):
@@ -27,37 +31,45 @@ class LivenessKiller(TypeDispatcher):
     uses/definitions for dead nodes.
     
     Attributes:
-        live: Set of live nodes (from liveness analysis)
+        order: Ordering the liveness flags were computed for
+        live: Liveness flags indexed by node uid (from liveness analysis)
         queue: Queue of nodes to process
-        processed: Set of processed nodes
+        processed: Processed flags indexed by node uid
+        changed: Whether any edge was removed
     """
-    def __init__(self, live):
+    def __init__(self, order, live):
         """Initialize liveness killer.
         
         Args:
-            live: Set of live nodes to keep
+            order: Ordering of the graph
+            live: Liveness flags of the nodes to keep, indexed by node uid
         """
+        assert len(live) == len(order), (len(live), len(order))
+        self.order = order
         self.live = live
         self.queue = []
-        self.processed = set()
+        self.processed = bytearray(len(order))
+        self.changed = False
 
     @dispatch(graph.LocalNode, graph.FieldNode, graph.PredicateNode)
     def handleSlot(self, node):
-        if self.dead(node.use):
+        if node.use is not None and self.dead(node.use):
             node.use = None
+            self.changed = True
 
     @dispatch(graph.ExistingNode)
     def handleExistingNode(self, node):
-        node.uses = [use for use in node.uses if not self.dead(use)]
+        node.uses = self.filterLive(node.uses)
 
     @dispatch(graph.NullNode)
     def handleNullNode(self, node):
-        node.uses = [use for use in node.uses if not self.dead(use)]
+        node.uses = self.filterLive(node.uses)
 
     @dispatch(graph.GenericOp)
     def handleGenericOp(self, node):
-        if all(self.dead(lcl) for lcl in node.localModifies):
+        if node.localModifies and all(self.dead(lcl) for lcl in node.localModifies):
             node.localModifies = []
+            self.changed = True
 
         # TODO turn dead modifies (heap and locals) into don't cares?
 
@@ -67,6 +79,8 @@ class LivenessKiller(TypeDispatcher):
         for name, next in node.modifies.items():
             if not self.dead(next):
                 modifies[name] = next
+        if len(modifies) != len(node.modifies):
+            self.changed = True
         node.modifies = modifies
 
     @dispatch(graph.Exit)
@@ -77,12 +91,15 @@ class LivenessKiller(TypeDispatcher):
         for name, prev in node.reads.items():
             if not self.dead(prev):
                 reads[name] = prev
+        if len(reads) != len(node.reads):
+            self.changed = True
         node.reads = reads
 
     @dispatch(graph.Split)
     def handleSplit(self, node):
-        node.modifies = [m for m in node.modifies if not self.dead(m)]
-        node.optimize()
+        node.modifies = self.filterLive(node.modifies)
+        if node.optimize() is not node:
+            self.changed = True
 
     @dispatch(graph.Gate)
     def handleGate(self, node):
@@ -91,6 +108,9 @@ class LivenessKiller(TypeDispatcher):
     @dispatch(graph.Merge)
     def handleMerge(self, node):
         if self.dead(node.modify):
+            if node.reads or node.modify is not None:
+                self.changed = True
+
             for read in node.reads:
                 read.removeUse(node)
 
@@ -101,12 +121,21 @@ class LivenessKiller(TypeDispatcher):
             node.modify = None
 
     def dead(self, node):
-        return node is None or node not in self.live
+        # Nodes outside the ordering were not reached, so they are not live.
+        # Their uid is -1 or stale and would index another node's flag.
+        return node is None or not (self.order.contains(node) and self.live[node.uid])
+
+    def filterLive(self, nodes):
+        live = [node for node in nodes if not self.dead(node)]
+        if len(live) != len(nodes):
+            self.changed = True
+        return live
 
     def mark(self, node):
         assert isinstance(node, graph.DataflowNode), node
-        if node not in self.processed:
-            self.processed.add(node)
+        assert self.order.contains(node), node
+        if not self.processed[node.uid]:
+            self.processed[node.uid] = 1
             self.queue.append(node)
 
     def process(self, dataflow):
@@ -115,9 +144,11 @@ class LivenessKiller(TypeDispatcher):
         # Filter existing
         existing = {}
         for name, node in dataflow.existing.items():
-            if node in self.live:
+            if not self.dead(node):
                 existing[name] = node
                 self.mark(node)
+        if len(existing) != len(dataflow.existing):
+            self.changed = True
         dataflow.existing = existing
 
         self.mark(dataflow.null)
@@ -134,76 +165,232 @@ class LivenessKiller(TypeDispatcher):
                     self.mark(next)
 
 
-class LivenessSearcher(TypeDispatcher):
+class LivenessSearcher(object):
     """Performs backward liveness analysis.
     
-    This class performs backward liveness analysis starting from the exit
-    node. It marks all nodes that contribute to the exit (are live) by
-    traversing backward through def-use chains.
+    This class sweeps the nodes of the graph in reverse topological order,
+    so every use of a node is decided before the node itself.  A node is
+    live if it is the exit node or one of its uses is live.
     
     The algorithm:
-    1. Start from exit node (always live)
-    2. For each live node, mark all predecessors (definitions/reads)
-    3. Continue until fixed point
+    1. The exit node is always live
+    2. Walk the ordering backwards, marking nodes with a live use
+    3. A field that the entry passes straight to the exit is not live
     
     Attributes:
-        queue: Queue of nodes to process
-        live: Set of live nodes
+        order: Ordering of the graph
+        live: Liveness flags indexed by node uid
     """
-    def __init__(self):
-        """Initialize liveness searcher."""
-        self.queue = []
-        self.live = set()
+    def __init__(self, order):
+        """Initialize liveness searcher.
+        
+        Args:
+            order: Ordering of the graph to analyze
+        """
+        self.order = order
+        self.live = bytearray(len(order))
 
-    def mark(self, node):
-        """Mark a node as live.
+    def isLiveUse(self, node, use):
+        """Check if a use keeps a node live.
         
         Args:
-            node: DataflowNode to mark as live
+            node: Node being decided
+            use: Node in node.forward()
+            
+        Returns:
+            bool: True if the use is live and not a pass through
         """
-        assert isinstance(node, graph.DataflowNode), node
-        if node not in self.live:
-            self.live.add(node)
-            self.queue.append(node)
+        if not self.live[use.uid]:
+            return False
+        elif use.isOp() and use.isExit():
+            # Skip entry fields that are simply passed through.
+            return not (node.isField() and node.defn.isEntry())
+        return True
 
     def process(self, dataflow):
         """Perform liveness analysis on a dataflow graph.
         
-        Starts from exit and marks all live nodes by traversing backward.
-        
         Args:
             dataflow: DataflowGraph to analyze
             
         Returns:
-            set: Set of live nodes
+            bytearray: Liveness flags indexed by node uid
         """
-        self.mark(dataflow.exit)
+        live = self.live
+        exit = dataflow.exit
 
-        while self.queue:
-            current = self.queue.pop()
-            if current.isOp() and current.isExit():
-                # Exit node: mark all reads, but skip entry fields that are just passed through
-                for prev in current.reverse():
-                    if prev.isField() and prev.defn.isEntry():
-                        pass  # The field is simply passed through.
-                    else:
-                        self.mark(prev)
+        for node in reversed(self.order.nodes):
+            if node is exit:
+                live[node.uid] = 1
             else:
-                # Normal node: mark all predecessors
-                for prev in current.reverse():
-                    self.mark(prev)
+                for use in node.forward():
+                    if self.isLiveUse(node, use):
+                        live[node.uid] = 1
+                        break
 
-        return self.live
+        return live
+
+
+class DirtyLivenessSearcher(object):
+    """Finds the nodes that edits left dead.
+    
+    If the graph was free of dead code before the edits, only the nodes
+    the edits touched can have lost their last live use.  Deadness is
+    propagated from them to their inputs, the rest of the graph is not
+    examined.
+    
+    Attributes:
+        exit: Exit node of the graph, always live
+        dead: Dead nodes found, a dict used as an ordered set
+        queue: Queue of nodes to check
+    """
+    def __init__(self, dataflow):
+        """Initialize dirty liveness searcher.
+        
+        Args:
+            dataflow: DataflowGraph being edited
+        """
+        self.exit = dataflow.exit
+        self.dead = {}
+        self.queue = []
+
+    def isLiveUse(self, node, use):
+        if use in self.dead:
+            return False
+        elif use.isOp() and use.isExit():
+            # Skip entry fields that are simply passed through.
+            return not (node.isField() and node.defn.isEntry())
+        return True
+
+    def check(self, node):
+        """Mark node dead if none of its uses are live.
+        
+        Args:
+            node: Dataflow node that may have lost a use
+        """
+        if node is None or node in self.dead or node is self.exit:
+            return
+
+        # The entry is a root, the killer filters its modifies instead.
+        if node.isOp() and node.isEntry():
+            return
+
+        for use in node.forward():
+            if self.isLiveUse(node, use):
+                return
+
+        self.dead[node] = None
+        self.queue.extend(node.reverse())
+
+    def process(self, dirty):
+        """Find the nodes left dead by edits.
+        
+        Args:
+            dirty: Nodes touched by the edits
+            
+        Returns:
+            dict: Dead nodes, in the order they were found
+        """
+        self.queue.extend(dirty)
+        while self.queue:
+            self.check(self.queue.pop())
+        return self.dead
+
+
+class DirtyKiller(LivenessKiller):
+    """Removes the dead nodes found by DirtyLivenessSearcher.
+    
+    Only the inputs of the dead nodes hold edges to them, so only those
+    are visited.
+    
+    Attributes:
+        deadNodes: Dead nodes, iterated in order
+        changed: Whether any edge was removed
+    """
+    def __init__(self, dead):
+        """Initialize dirty killer.
+        
+        Args:
+            dead: Dead nodes, iterated in order
+        """
+        self.deadNodes = dead
+        self.changed = False
+
+    def dead(self, node):
+        return node is None or node in self.deadNodes
+
+    def process(self, dataflow):
+        frontier = []
+        visited = set()
+
+        def visit(node):
+            if node is not None and node not in visited:
+                visited.add(node)
+                frontier.append(node)
+
+        for node in self.deadNodes:
+            # Dead slots are processed so their use is killed, like in
+            # LivenessKiller.
+            if node.isSlot():
+                visit(node)
+            for prev in node.reverse():
+                if prev is not None and (prev.isSlot() or not self.dead(prev)):
+                    visit(prev)
+
+        existing = {}
+        for name, node in dataflow.existing.items():
+            if not self.dead(node):
+                existing[name] = node
+        if len(existing) != len(dataflow.existing):
+            self.changed = True
+        dataflow.existing = existing
+
+        for node in frontier:
+            self(node)
+
+
+def evaluateDirty(dataflow, dirty):
+    """Remove the code that edits left dead.
+    
+    The graph must have been free of dead code before the edits that
+    touched the dirty nodes.
+    
+    Args:
+        dataflow: DataflowGraph to optimize
+        dirty: Nodes touched by the edits
+        
+    Returns:
+        dict: The dead nodes that were removed, in the order they were found
+    """
+    dead = DirtyLivenessSearcher(dataflow).process(dirty)
+
+    killer = DirtyKiller(dead)
+    killer.process(dataflow)
+
+    if killer.changed:
+        dataflow.invalidateOrder()
+    return dead
 
 
 def evaluateDataflow(dataflow):
     """Perform dead code elimination on a dataflow graph.
     
     Main entry point for DCE. Performs liveness analysis and removes
-    dead nodes.
+    dead nodes.  The cached ordering is reused, and invalidated only if
+    the graph changed.
     
     Args:
         dataflow: DataflowGraph to optimize
+        
+    Returns:
+        bool: True if the graph changed
     """
-    live = LivenessSearcher().process(dataflow)
-    LivenessKiller(live).process(dataflow)
+    order = ordering.evaluateDataflow(dataflow)
+    live = LivenessSearcher(order).process(dataflow)
+
+    killer = LivenessKiller(order, live)
+    killer.process(dataflow)
+
+    if killer.changed:
+        dataflow.invalidateOrder()
+    return killer.changed
@@ -0,0 +1,187 @@
+"""Fixpoint driver for the dataflow transforms.
+
+Runs dead code elimination and load elimination until neither changes the
+graph.  The first round examines the whole graph.  Later rounds revisit
+only what the edits of the previous round touched: the graph edit
+operations record the nodes they change in an EditTracker, dead code is
+searched for from those nodes, and only the loads next to them are
+attempted again.
+
+The work and time of every round is recorded, so the cost of a large
+graph can be read off the statistics.
+"""
+
+import time
+
+from pyflow.analysis.dataflowIR import graph, ordering, predicate
+from . import dce, loadelimination
+
+
+class RoundStatistics(object):
+    """Work done by one round of the driver.
+
+    Attributes:
+        number: Round number, starting at 1
+        dead: Nodes removed by dead code elimination
+        examined: Loads attempted
+        eliminated: Loads eliminated
+        dirty: Nodes touched by the eliminations
+        elapsed: Seconds spent in the round
+    """
+    def __init__(self, number):
+        self.number = number
+        self.dead = 0
+        self.examined = 0
+        self.eliminated = 0
+        self.dirty = 0
+        self.elapsed = 0.0
+
+
+class DriverStatistics(object):
+    """Per-round statistics of a driver run.
+
+    Attributes:
+        rounds: RoundStatistics, in order
+    """
+    def __init__(self):
+        self.rounds = []
+
+    def total(self, name):
+        return sum([getattr(info, name) for info in self.rounds])
+
+    def output(self, console):
+        console.output("Round       Dead   Examined Eliminated      Dirty       Time")
+        for info in self.rounds:
+            console.output(
+                "%5d %10d %10d %10d %10d %7.2f ms"
+                % (
+                    info.number,
+                    info.dead,
+                    info.examined,
+                    info.eliminated,
+                    info.dirty,
+                    info.elapsed * 1e3,
+                )
+            )
+        console.output(
+            "Total %10d %10d %10d %10d %7.2f ms"
+            % (
+                self.total("dead"),
+                self.total("examined"),
+                self.total("eliminated"),
+                self.total("dirty"),
+                self.total("elapsed") * 1e3,
+            )
+        )
+
+
+def usesOf(slot):
+    """Get the ops using a slot, looking past splits.
+
+    Args:
+        slot: Slot node
+
+    Returns:
+        list: Operation nodes using the slot
+    """
+    uses = []
+    for use in slot.forward():
+        if use.isSplit():
+            for split in use.modifies:
+                uses.extend(split.forward())
+        else:
+            uses.append(use)
+    return uses
+
+
+def loadsNear(dirty, dead):
+    """Find the loads an edit may have made eliminable.
+
+    A load may be eliminated once its inputs change, or once the store or
+    type switch defining one of its inputs does.  So the dirty loads and
+    the loads using an output of a dirty op are revisited.
+
+    Args:
+        dirty: Nodes touched by the edits, in order
+        dead: Nodes removed since the edits
+
+    Returns:
+        list: Live loads to attempt again
+    """
+    loads = {}
+
+    def consider(node):
+        if (
+            isinstance(node, graph.GenericOp)
+            and node.isLoad()
+            and len(node.localModifies) == 1
+            and node not in dead
+        ):
+            loads[node] = None
+
+    for node in dirty:
+        if node in dead:
+            continue
+        elif node.isOp():
+            consider(node)
+            for slot in node.forward():
+                for use in usesOf(slot):
+                    consider(use)
+        else:
+            for use in usesOf(node):
+                consider(use)
+
+    return list(loads)
+
+
+def evaluateDataflow(dataflow, maxRounds=None):
+    """Run dead code and load elimination to a fixpoint.
+
+    Args:
+        dataflow: DataflowGraph to optimize
+        maxRounds: Stop after this many rounds, None runs to the fixpoint
+
+    Returns:
+        DriverStatistics: The work done by each round
+    """
+    stats = DriverStatistics()
+    pg = None
+    dirty = None
+
+    while maxRounds is None or len(stats.rounds) < maxRounds:
+        info = RoundStatistics(len(stats.rounds) + 1)
+        start = time.perf_counter()
+
+        if dirty is None:
+            # Nothing is known about the graph, examine all of it.
+            before = len(ordering.evaluateDataflow(dataflow))
+            dce.evaluateDataflow(dataflow)
+            info.dead = before - len(ordering.evaluateDataflow(dataflow))
+
+            # Eliminating loads and dead code does not change the
+            # terms or dominance of the predicates that remain.
+            pg = predicate.buildPredicateGraph(dataflow)
+            loads = loadelimination.collectLoads(dataflow)
+        else:
+            dead = dce.evaluateDirty(dataflow, dirty)
+            info.dead = len(dead)
+            loads = loadsNear(dirty, dead)
+
+        with graph.EditTracker() as dirty:
+            eliminated = loadelimination.eliminateLoads(loads, pg)
+
+        if eliminated:
+            dataflow.invalidateOrder()
+
+        info.examined = len(loads)
+        info.eliminated = len(eliminated)
+        info.dirty = len(dirty)
+        info.elapsed = time.perf_counter() - start
+        stats.rounds.append(info)
+
+        # Without edits, the dead code elimination of this round was the
+        # last one needed.
+        if not eliminated:
+            break
+
+    return stats
@@ -6,16 +6,16 @@ load operations when the loaded value is available from a dominating store.
 The optimization:
 1. Identifies load operations
 2. Finds the dominating store that writes the same field
-3. Verifies the store dominates the load (predicate dominance)
+3. Verifies the store is done whenever the load is (predicate implication)
 4. Replaces load with direct use of store's value
 
-This optimization requires predicate dominance analysis to ensure soundness:
+This optimization requires predicate analysis to ensure soundness:
 the store must execute before the load on all paths where the load executes.
 """
 
 from pyflow.analysis.dataflowIR import graph
 from pyflow.analysis.dataflowIR import predicate
-from pyflow.analysis.dataflowIR.traverse import dfs
+from pyflow.analysis.dataflowIR import ordering
 
 
 def findLoadSrc(g):
@@ -54,7 +54,7 @@ def isLocalSubset(defn, use):
 
     if defn is use:
         return True
-    elif use.defn.isOp() and use.defn.isTypeSwitch():
+    elif isinstance(use.defn, graph.GenericOp) and use.defn.isTypeSwitch():
         # Type switch may filter but preserve value
         conditional = use.defn.op.conditional
         cNode = use.defn.localReads[conditional]
@@ -71,7 +71,7 @@ def attemptTransform(g, pg):
     1. Load has single modification target
     2. Source is a store operation
     3. Load/store parameters match (object, field type, field name)
-    4. Store predicate dominates load predicate
+    4. Load predicate implies store predicate
     5. Heap read/modify sets match
     
     Args:
@@ -107,8 +107,8 @@ def attemptTransform(g, pg):
         ):
             return False
 
-        # Make sure the store predicate dominates the load predicate
-        if not pg.dominates(defn.canonicalpredicate, g.canonicalpredicate):
+        # Make sure the store was done whenever the load is
+        if not pg.implies(g.canonicalpredicate, defn.canonicalpredicate):
             return False
 
         # Make sure the heap read / modify is identical
@@ -124,6 +124,7 @@ def attemptTransform(g, pg):
 
         dst.canonical().redirect(src)
         g.localModifies = []
+        graph.touch(g)
 
         return True
 
@@ -137,28 +138,41 @@ def collectLoads(dataflow):
         dataflow: DataflowGraph to search
         
     Returns:
-        set: Set of GenericOp nodes representing loads
+        list: GenericOp nodes representing loads, in topological order
     """
-    loads = set()
+    return [
+        op
+        for op in ordering.evaluateDataflow(dataflow).ops
+        if isinstance(op, graph.GenericOp) and op.isLoad()
+    ]
 
-    def collect(node):
-        if isinstance(node, graph.GenericOp) and node.isLoad():
-            loads.add(node)
 
-    dfs(dataflow, collect)
-
-    return loads
+def eliminateLoads(loads, pg):
+    """Attempt to eliminate each load once, in order.
+    
+    Args:
+        loads: GenericOp nodes representing loads
+        pg: PredicateGraph for dominance checking
+        
+    Returns:
+        list: The loads that were eliminated
+    """
+    return [load for load in loads if attemptTransform(load, pg)]
 
 
 def evaluateDataflow(dataflow):
     """Perform load elimination on a dataflow graph.
     
     Main entry point for load elimination. Builds predicate graph,
-    collects loads, and attempts to eliminate each one.
+    collects loads, and attempts to eliminate each one.  Both share the
+    cached ordering, which is invalidated if a load was bypassed.
     
     Args:
         dataflow: DataflowGraph to optimize
         
+    Returns:
+        int: Number of loads eliminated
+        
     Note:
         HACK: Iterates until fixed point (no more eliminations possible).
         This is needed because eliminating one load may enable eliminating another.
@@ -174,10 +188,12 @@ def evaluateDataflow(dataflow):
     # HACK keep evaluating each load until no further transforms are possible.
     changed = True
     while changed:
-        changed = False
-        for load in loads:
-            if attemptTransform(load, pg):
-                eliminated += 1
-                changed = True
+        count = len(eliminateLoads(loads, pg))
+        eliminated += count
+        changed = count > 0
 
     print("ELIMINATED", eliminated)
+
+    if eliminated:
+        dataflow.invalidateOrder()
+    return eliminated
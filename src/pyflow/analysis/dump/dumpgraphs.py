@@ -1,18 +1,17 @@
 import os.path
 import pyflow.util as util
-import pyflow.util.pydot as pydot
 from pyflow.util.graphalgorithim import dominator
 from pyflow.util.application.async_utils import *
-from pyflow.util.io import filesystem
+from pyflow.util.io import dot
 from pyflow.analysis.dump import dumputil
 
 
-def dumpGraph(directory, name, format, g, prog="dot"):
-    s = g.create(prog=prog, format=format)
-    filesystem.writeBinaryData(directory, name, format, s)
+@async_func
+def compileGraph(directory, name, format):
+    # Graphviz runs in a separate process, so this overlaps with page rendering.
+    dot.compileDotFile(os.path.join(directory, name), format)
 
 
-@async_limited
 def dump(compiler, liveInvoke, links, reportDir):
     # Filter out primitive nodes
     def keepCode(code):
@@ -28,12 +27,7 @@ def dump(compiler, liveInvoke, links, reportDir):
     tree, idoms = util.graphalgorithim.dominator.dominatorTree(invokeLUT, head)
 
     # Start graph creation
-    g = pydot.Dot(
-        graph_type="digraph",
-        # overlap='scale',
-        rankdir="LR",
-        # concentrate=True,
-    )
+    g = dot.Digraph(rankdir="LR")
 
     # Create nodes
     def makeNode(tree, sg, node):
@@ -48,32 +42,27 @@ def dump(compiler, liveInvoke, links, reportDir):
                 nodecolor = "#BBBBBB"
             else:
                 nodecolor = "#33FF33"
-            sg.add_node(
-                pydot.Node(
-                    str(id(node)),
-                    label=dumputil.codeShortName(code),
-                    shape="box",
-                    style="filled",
-                    fontsize=8,
-                    fillcolor=nodecolor,
-                    URL=links.codeRef(node, None),
-                )
+
+            attr = {}
+            link = links.codeRef(node, None)
+            if link:
+                attr["URL"] = link
+
+            sg.node(
+                id(node),
+                label=dumputil.codeShortName(code),
+                shape="box",
+                style="filled",
+                fontsize=8,
+                fillcolor=nodecolor,
+                **attr
             )
         else:
-            sg.add_node(
-                pydot.Node(
-                    str(id(node)),
-                    label="entry",
-                    shape="point",
-                    style="filled",
-                    fontsize=8,
-                )
-            )
+            sg.node(id(node), label="entry", shape="point", style="filled", fontsize=8)
 
         children = tree.get(node)
         if children:
-            csg = pydot.Cluster(str(id(node)))
-            sg.add_subgraph(csg)
+            csg = sg.cluster(id(node))
             for child in children:
                 makeNode(tree, csg, child)
 
@@ -87,7 +76,8 @@ def dump(compiler, liveInvoke, links, reportDir):
                 weight = 10
             else:
                 weight = 1
-            g.add_edge(pydot.Edge(str(id(src)), str(id(dst)), weight=weight))
+            g.edge(id(src), id(dst), weight=weight)
 
     # Output
-    dumpGraph(reportDir, "invocations", "svg", g)
+    g.createDotFile(os.path.join(reportDir, "invocations.dot"))
+    return compileGraph(reportDir, "invocations", "svg")
@@ -1,6 +1,7 @@
 
 import os.path
 import collections
+import multiprocessing as mp
 from urllib.parse import quote
 
 from pyflow.language.python import simplecodegen
@@ -16,11 +17,15 @@ from ... import config
 from .. import programculler
 from pyflow.frontend.programextractor import Extractor
 
-from pyflow.analysis.dump import dumputil
+from pyflow.analysis.dump import dumpgraphs, dumputil
 from pyflow.analysis import tools
+from pyflow.analysis import query
 
 from pyflow.language.python import ast
 
+# Pages are built from many tiny writes, buffer them generously.
+BUFFER_SIZE = 1 << 16
+
 
 # Filter an iterable into keys and values, and collect
 # values with the same key into groups.
@@ -101,7 +106,7 @@ def makeReportDirectory(moduleName):
 
 def makeOutput(reportDir, filename):
     fullpath = os.path.join(reportDir, filename)
-    fout = open(fullpath, "w")
+    fout = open(fullpath, "w", buffering=BUFFER_SIZE)
     out = XMLOutput(fout)
     scg = simplecodegen.SimpleCodeGen(out)  # HACK?
     return out, scg
@@ -630,38 +635,107 @@ def makeHeapTree(liveHeap, heapContexts):
     return tree, head
 
 
-def dumpReport(name, compiler, prgm, derived, liveInvocations, liveHeap, heapContexts):
+def nameContexts(links, funcs, heaps, heapContexts):
+    # Pages only read the link tables once every context is named, so they
+    # can be rendered in any order or in forked workers and still agree on
+    # the anchors.
+    for func in funcs:
+        if func.annotation.contexts is not None:
+            for context in func.annotation.contexts:
+                links.contextRef(context)
+
+    for heap in heaps:
+        for context in heapContexts[heap]:
+            links.contextRef(context)
+
+
+def dumpPages(compiler, derived, links, reportDir, funcs, heaps, heapContexts):
+    failed = 0
+
+    for func in funcs:
+        try:
+            dumpFunctionInfo(func, compiler, derived, links, reportDir)
+        except Exception as e:
+            print(f"Warning: Could not dump function {func.codeName()}: {e}")
+            failed += 1
+
+    for heap in heaps:
+        try:
+            dumpHeapInfo(heap, compiler, heapContexts, links, reportDir)
+        except Exception as e:
+            print(f"Warning: Could not dump heap {heap}: {e}")
+            failed += 1
+
+    return failed
+
+
+def pageWorker(index, failures, *args):
+    failures[index] = dumpPages(*args)
+
+
+def startPageWorkers(workers, failures, compiler, derived, links, reportDir, funcs, heaps, heapContexts):
+    # Workers are forked so they share the analyzed program with the parent
+    # instead of pickling it, and each writes an interleaved slice of pages.
+    ctx = mp.get_context("fork")
+    jobs = []
+    for i in range(workers):
+        args = (
+            i,
+            failures,
+            compiler,
+            derived,
+            links,
+            reportDir,
+            funcs[i::workers],
+            heaps[i::workers],
+            heapContexts,
+        )
+        job = ctx.Process(target=pageWorker, args=args)
+        job.start()
+        jobs.append(job)
+    return jobs
+
+
+def joinPageWorkers(jobs, failures):
+    for i, job in enumerate(jobs):
+        job.join()
+        if job.exitcode:
+            print(f"Warning: Report worker {i} exited with code {job.exitcode}")
+    return sum(failures)
+
+
+def dumpReport(
+    name,
+    compiler,
+    prgm,
+    derived,
+    liveInvocations,
+    liveHeap,
+    heapContexts,
+    workers=1,
+    graphs=False,
+):
     reportDir = makeReportDirectory(name)
 
     links = dumputil.LinkManager()
 
-    # HACK for closure
-    uid = [0, 0]
+    funcs = sorted(prgm.liveCode, key=lambda f: f.codeName())
+    heaps = sorted(heapContexts.keys(), key=lambda o: repr(o))
 
-    def makeHeapFile(heap):
-        fn = "h%07d.html" % uid[0]
-        links.objectFile[heap] = fn
-        uid[0] += 1
-        return fn
+    for uid, func in enumerate(funcs):
+        links.functionFile[func] = "f%07d.html" % uid
 
-    def makeFunctionFile(func):
-        fn = "f%07d.html" % uid[1]
-        links.functionFile[func] = fn
-        uid[1] += 1
-        return fn
+    for uid, heap in enumerate(heaps):
+        links.objectFile[heap] = "h%07d.html" % uid
 
-    liveHeap = set(heapContexts.keys())  # TODO elo,omate?
-
-    # Create basic index files without complex tree traversal
     out, scg = makeOutput(reportDir, "function_index.html")
     dumpHeader(out)
     out.begin("h2")
     out << "Function Index"
     out.end("h2")
     out.begin("ul")
-    for func in sorted(prgm.liveCode, key=lambda f: f.codeName()):
+    for func in funcs:
         out.begin("li")
-        makeFunctionFile(func)
         outputCodeShortName(out, func, links)
         out.end("li")
     out.end("ul")
@@ -673,9 +747,8 @@ def dumpReport(name, compiler, prgm, derived, liveInvocations, liveHeap, heapCon
     out << "Object Index"
     out.end("h2")
     out.begin("ul")
-    for heap in sorted(liveHeap, key=lambda o: repr(o)):
+    for heap in heaps:
         out.begin("li")
-        makeHeapFile(heap)
         link = links.objectRef(heap)
         if link:
             out.begin("a", href=link)
@@ -686,34 +759,54 @@ def dumpReport(name, compiler, prgm, derived, liveInvocations, liveHeap, heapCon
     out.end("ul")
     out.close()
 
-    # Generate basic function and heap reports without complex analysis
-    try:
-        with compiler.console.scope("function reports"):
-            for func in prgm.liveCode[:1]:  # Limit to first function to avoid timeout
-                try:
-                    dumpFunctionInfo(func, compiler, derived, links, reportDir)
-                except Exception as e:
-                    print(f"Warning: Could not dump function {func.codeName()}: {e}")
-
-        with compiler.console.scope("heap reports"):
-            heap_list = list(liveHeap)[:1]  # Limit to first heap to avoid timeout
-            for heap in heap_list:
-                try:
-                    dumpHeapInfo(heap, compiler, heapContexts, links, reportDir)
-                except Exception as e:
-                    print(f"Warning: Could not dump heap {heap}: {e}")
-    except Exception as e:
-        print(f"Warning: Could not complete dump reports: {e}")
-
-    # Skip graphs for now to avoid timeout
-    # with compiler.console.scope("graphs"):
-    #     dumpgraphs.dump(compiler, liveInvocations, links, reportDir)
+    nameContexts(links, funcs, heaps, heapContexts)
+
+    # Heap pages need the extractor, create it before any workers fork.
+    if getattr(compiler, "extractor", None) is None:
+        compiler.extractor = Extractor(compiler)
+
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(funcs) + len(heaps), 1))
+    if "fork" not in mp.get_all_start_methods():
+        workers = 1
+
+    with compiler.console.scope("pages"):
+        args = (compiler, derived, links, reportDir, funcs, heaps, heapContexts)
+
+        if workers > 1:
+            failures = mp.RawArray("q", workers)
+            jobs = startPageWorkers(workers, failures, *args)
+        else:
+            jobs = None
+
+        # The call graph is laid out by Graphviz in the background while the
+        # pages are rendered.
+        graphJob = None
+        if graphs:
+            with compiler.console.scope("graphs"):
+                graphJob = dumpgraphs.dump(compiler, liveInvocations, links, reportDir)
+
+        if jobs is not None:
+            failed = joinPageWorkers(jobs, failures)
+        else:
+            failed = dumpPages(*args)
+
+        if graphJob is not None:
+            graphJob.join()
+
+        compiler.console.output(
+            "%d function pages, %d heap pages, %d failed, %d workers"
+            % (len(funcs), len(heaps), failed, workers)
+        )
 
 
 class DerivedData(object):
-    def __init__(self, liveCode):
-        self.invokeDestination = collections.defaultdict(set)
-        self.invokeSource = collections.defaultdict(set)
+    def __init__(self, liveCode, programQuery=None):
+        if programQuery is None:
+            programQuery = query.ProgramQuery(liveCode)
+        self.query = programQuery
+
         self.funcReads = collections.defaultdict(lambda: collections.defaultdict(set))
         self.funcModifies = collections.defaultdict(
             lambda: collections.defaultdict(set)
@@ -725,28 +818,9 @@ class DerivedData(object):
 
             ops = tools.codeOps(code)
             for op in ops:
-                self.handleOpInvokes(code, op)
                 self.handleOpReads(code, op)
                 self.handleOpModifies(code, op)
 
-    def handleOpInvokes(self, code, op):
-        invokes = op.annotation.invokes
-        if invokes is not None:
-            for cindex, context in enumerate(code.annotation.contexts):
-                src = (code, context)
-
-                if len(invokes) > 1:
-                    context_invokes = invokes[1]
-                    if isinstance(context_invokes, (list, tuple)) and cindex < len(context_invokes):
-                        dsts = context_invokes[cindex]
-                    else:
-                        dsts = []
-                else:
-                    dsts = []
-                for dst in dsts:
-                    self.invokeDestination[src].add(dst)
-                    self.invokeSource[dst].add(src)
-
     def handleOpReads(self, code, op):
         reads = op.annotation.reads
         self.handleReads(code, reads)
@@ -783,19 +857,32 @@ class DerivedData(object):
                 self.funcModifies[code][context].update(cmods)
 
     def callers(self, function, context):
-        return self.invokeSource[(function, context)]
+        return self.query.invokedBy(function, context)
 
     def callees(self, function, context):
-        return self.invokeDestination[(function, context)]
+        return self.query.invokes(function, context)
+
 
+def evaluate(compiler, prgm, name, workers=None, graphs=None):
+    if workers is None:
+        workers = config.dumpWorkers
+    if graphs is None:
+        graphs = config.dumpGraphs
 
-def evaluate(compiler, prgm, name):
     with compiler.console.scope("dump"):
         liveCode, liveInvocations = programculler.findLiveCode(prgm)
         liveHeap, heapContexts = programculler.findLiveHeap(prgm)
 
-        derived = DerivedData(prgm.liveCode)
+        derived = DerivedData(prgm.liveCode, query.evaluate(compiler, prgm))
 
         dumpReport(
-            name, compiler, prgm, derived, liveInvocations, liveHeap, heapContexts
+            name,
+            compiler,
+            prgm,
+            derived,
+            liveInvocations,
+            liveHeap,
+            heapContexts,
+            workers,
+            graphs,
         )
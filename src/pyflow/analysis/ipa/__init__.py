@@ -57,6 +57,29 @@ def evaluateWithImage(compiler, prgm):
 
         print("%5d code" % len(analysis.liveCode))
         print("%5d contexts" % len(analysis.contexts))
+
+        stats = analysis.splitStats
+        kinds = stats.contextsByKind(analysis.contexts.values())
+        print(
+            "%5d type splits, %d megamorphic, %d grouped (%s policy, limit %s)"
+            % (
+                stats.splitters,
+                stats.megamorphic,
+                stats.grouped,
+                analysis.splitPolicy,
+                analysis.splitLimit,
+            )
+        )
+        print(
+            "%5d exact, %d grouped, %d megamorphic contexts"
+            % (kinds["exact"], kinds["grouped"], kinds["megamorphic"])
+        )
+
+        escape = analysis.escapeStats
+        print(
+            "%5d escape runs, %d objects visited, %d values marked, %d fields skipped"
+            % (escape.runs, escape.visited, escape.marked, escape.skipped)
+        )
         print("%.2f ms decompile" % (analysis.decompileTime * 1000.0))
 
     return analysis
@@ -13,7 +13,7 @@ from pyflow.analysis.storegraph import extendedtypes
 def cpaArgOK(arg):
     """Check if an argument type is valid for CPA.
     
-    Valid types are None, anyType, or ExtendedType.
+    Valid types are None, anyType, TypeGroup, or ExtendedType.
     
     Args:
         arg: Argument type to check
@@ -21,7 +21,11 @@ def cpaArgOK(arg):
     Returns:
         bool: True if valid CPA argument type
     """
-    return arg is None or arg is anyType or isinstance(arg, extendedtypes.ExtendedType)
+    return (
+        arg is None
+        or arg is anyType
+        or isinstance(arg, (extendedtypes.ExtendedType, TypeGroup))
+    )
 
 
 class CPAContextSignature(canonical.CanonicalObject):
@@ -75,6 +79,33 @@ class CPAContextSignature(canonical.CanonicalObject):
         )
 
 
+class TypeGroup(canonical.CanonicalObject):
+    """Stands in for every CPA type sharing a base class.
+
+    Type splits key their targets by group once they have seen more types
+    than the analysis allows, so a group never names a single object.
+
+    Attributes:
+        base: The topmost Python base class below object
+    """
+    def __init__(self, base):
+        self.base = base
+        self.setCanonical(base)
+
+    def isExisting(self):
+        return False
+
+    def __repr__(self):
+        return "group(%s)" % self.base.__name__
+
+
+def typeGroup(cpaType):
+    """The TypeGroup of a CPA type, by its topmost base class below object."""
+    mro = cpaType.obj.pythonType().__mro__
+    base = mro[-2] if len(mro) > 1 else mro[0]
+    return TypeGroup(base)
+
+
 anyType = object()
 nullIter = (None,)
 
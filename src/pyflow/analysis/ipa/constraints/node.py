@@ -122,6 +122,7 @@ class ConstraintNode(object):
         flags: Escape flags and metadata
         flagsdiff: Pending flag changes
         critical: Critical value tracker
+        owner: Object this node is a field of, or None
     """
     __slots__ = (
         "context",
@@ -138,6 +139,7 @@ class ConstraintNode(object):
         "flags",
         "flagsdiff",
         "critical",
+        "owner",
     )
 
     def __init__(self, context, name, ci=False):
@@ -174,6 +176,8 @@ class ConstraintNode(object):
 
         self.critical = Critical(context, self)
 
+        self.owner = None
+
     def clearFlags(self):
         self.flags = 0
         self.flagsdiff = 0
@@ -231,6 +235,8 @@ class ConstraintNode(object):
             else:
                 assert not self.valuediff
                 self.values = vm.inplaceUnion(self.values, diff)
+                if self.owner is not None:
+                    self.owner.fieldChanged()
             return True
         else:
             return False
@@ -247,6 +253,8 @@ class ConstraintNode(object):
             else:
                 assert not self.valuediff
                 self.values = vm.inplaceUnion(self.values, diff)
+                if self.owner is not None:
+                    self.owner.fieldChanged()
             return True
         else:
             return False
@@ -275,6 +283,8 @@ class ConstraintNode(object):
         diff = self.valuediff
         self.values = vm.inplaceUnion(self.values, diff)
         self.valuediff = vm.empty()
+        if self.owner is not None:
+            self.owner.fieldChanged()
 
         for constraint in self.next:
             constraint.changed(self.context, self, diff)
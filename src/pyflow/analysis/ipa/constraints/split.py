@@ -11,6 +11,39 @@ from .base import Constraint
 from ..calling import cpa
 
 
+class SplitStatistics(object):
+    """Counts what the type splits of an analysis did.
+
+    Attributes:
+        splitters: Type splits created
+        targets: Per-type targets created
+        grouped: Splits regrouped by base class
+        megamorphic: Splits collapsed to anyType
+    """
+    def __init__(self):
+        self.splitters = 0
+        self.targets = 0
+        self.grouped = 0
+        self.megamorphic = 0
+
+    def contextsByKind(self, contexts):
+        """Count contexts by the most general parameter in their signature."""
+        counts = {"exact": 0, "grouped": 0, "megamorphic": 0}
+        for context in contexts:
+            signature = context.signature
+            params = [signature.selfparam]
+            params.extend(signature.params)
+            params.extend(signature.vparams)
+
+            if any(param is cpa.anyType for param in params):
+                counts["megamorphic"] += 1
+            elif any(isinstance(param, cpa.TypeGroup) for param in params):
+                counts["grouped"] += 1
+            else:
+                counts["exact"] += 1
+        return counts
+
+
 class Splitter(Constraint):
     """Base class for split constraints.
     
@@ -78,11 +111,14 @@ class TypeSplitConstraint(Splitter):
     CPA type that flows to the source. This enables type-based context
     sensitivity: different types get different analysis contexts.
     
-    If too many types appear (>= 4), becomes megamorphic and collapses
-    to a single node with anyType.
+    The analysis decides how many splits are too many.  Past its split
+    limit, the "type" policy collapses to a single node with anyType.  The
+    "base" policy first regroups the types by their topmost base class
+    below object, and only collapses if the groups are still too many.
     
     Attributes:
-        objects: Dictionary mapping CPA type to destination node
+        objects: Dictionary mapping CPA type (or TypeGroup) to destination node
+        grouped: Whether the split is keyed by TypeGroup
         megamorphic: Whether this split is megamorphic (too many types)
     """
     def __init__(self, src):
@@ -93,8 +129,12 @@ class TypeSplitConstraint(Splitter):
         """
         Splitter.__init__(self, src)
         self.objects = {}
+        self.grouped = False
         self.megamorphic = False
 
+        self.analysis = src.context.analysis
+        self.analysis.splitStats.splitters += 1
+
     def localName(self):
         return "type_split_temp"
 
@@ -106,8 +146,46 @@ class TypeSplitConstraint(Splitter):
         self.megamorphic = True
         self.objects.clear()
         self.objects[cpa.anyType] = self.src
+        self.analysis.splitStats.megamorphic += 1
         self.doNotify()
 
+    def key(self, cpaType):
+        if self.grouped:
+            return cpa.typeGroup(cpaType)
+        else:
+            return cpaType
+
+    def overLimit(self, count):
+        limit = self.analysis.splitLimit
+        return limit is not None and count > limit
+
+    def regroup(self, context, cpaType):
+        """Key the split by base class, if that keeps it within the limit."""
+        if self.analysis.splitPolicy != "base":
+            return False
+
+        groups = set([cpa.typeGroup(t) for t in self.objects])
+        groups.add(cpa.typeGroup(cpaType))
+        if self.overLimit(len(groups)):
+            return False
+
+        old = self.objects
+        self.grouped = True
+        self.objects = {}
+        for group in groups:
+            self.objects[group] = self.makeTarget(context)
+
+        # The per-type nodes stay attached, but no new signature uses them.
+        for t, temp in old.items():
+            target = self.objects[cpa.typeGroup(t)]
+            for obj in temp.values:
+                target.updateSingleValue(obj)
+            for obj in temp.valuediff:
+                target.updateSingleValue(obj)
+
+        self.analysis.splitStats.grouped += 1
+        return True
+
     def changed(self, context, node, diff):
         if self.megamorphic:
             return
@@ -115,17 +193,22 @@ class TypeSplitConstraint(Splitter):
         changed = False
         for obj in diff:
             cpaType = obj.cpaType()
+            key = self.key(cpaType)
 
-            if cpaType not in self.objects:
-                if len(self.objects) >= 4:
-                    self.makeMegamorphic()
-                    break
-                else:
+            if key not in self.objects:
+                if not self.overLimit(len(self.objects) + 1):
                     temp = self.makeTarget(context)
-                    self.objects[cpaType] = temp
+                    self.objects[key] = temp
+                    self.analysis.splitStats.targets += 1
+                    changed = True
+                elif not self.grouped and self.regroup(context, cpaType):
+                    temp = self.objects[self.key(cpaType)]
                     changed = True
+                else:
+                    self.makeMegamorphic()
+                    break
             else:
-                temp = self.objects[cpaType]
+                temp = self.objects[key]
 
             temp.updateSingleValue(obj)
         else:
@@ -37,37 +37,81 @@ def repr(flags):
 ### Analysis ###
 
 
-def markSlot(context, slot, flags):
+class EscapeStatistics(object):
+    """Counts the work done by escape propagation.
+
+    Attributes:
+        runs: Calls to process
+        visited: Objects whose fields were examined
+        skipped: Fields whose values were already marked
+        marked: Values marked
+    """
+    def __init__(self):
+        self.runs = 0
+        self.visited = 0
+        self.skipped = 0
+        self.marked = 0
+
+
+def markValues(context, values, flags):
+    context.analysis.escapeStats.marked += len(values)
     region = context.region
-    for name in slot.values:
+    for name in values:
         region.object(name).updateFlags(context, flags)
 
 
+def markSlot(context, slot, flags):
+    markValues(context, slot.values, flags)
+
+
 def propagateObjectFlags(context, obj):
+    stats = context.analysis.escapeStats
+    stats.visited += 1
+
     flags = obj.flags & escapes
-    for slot in obj.fields.values():
-        markSlot(context, slot, flags)
+
+    if obj.marked is None or flags != obj.markedFlags:
+        # New flags must reach everything the fields hold.
+        obj.markedFlags = flags
+        obj.marked = {}
+        for slot in obj.fields.values():
+            obj.marked[slot] = slot.values
+            markValues(context, slot.values, flags)
+    else:
+        # Value sets are canonical, so an unchanged field is the same set.
+        marked = obj.marked
+        for slot in obj.fields.values():
+            values = slot.values
+            old = marked.get(slot)
+            if values is old:
+                stats.skipped += 1
+                continue
+            marked[slot] = values
+            markValues(context, values - old if old else values, flags)
 
 
 # Mark all objects reachable from upward contexts
 def process(context):
-    # Escape flags may persist between iterations
-    # Make these marked objects consistent
-
-    # The objects dictionary may change during processing, so create a filtered copy
-    roots = []
-    region = context.region
-    for obj in region.objects.values():
-        if obj.flags & escapes:
-            roots.append(obj)
-
-    for obj in roots:
+    context.analysis.escapeStats.runs += 1
+
+    # Escape flags persist between iterations, so only the fields that grew
+    # since the last run need marking.  Objects with new flags are dirty, and
+    # are left to processObjects.
+    changed = context.changedobjects
+    while changed:
+        obj = changed.pop()
+        obj.changed = False
         if not obj.dirty:
             propagateObjectFlags(context, obj)
 
     # Mark returned objects
+    marked = context.returnsMarked
     for param in context.returns:
-        markSlot(context, param, escapeReturn)
+        values = param.values
+        old = marked.get(param)
+        if values is not old:
+            marked[param] = values
+            markValues(context, values - old if old else values, escapeReturn)
 
     # Process the data flow
     context.processObjects(propagateObjectFlags)
@@ -6,6 +6,7 @@ analysis across function boundaries with context-sensitive precision.
 
 import time
 
+from pyflow import config
 from pyflow.optimization.callconverter import callConverter
 from pyflow.analysis.storegraph import setmanager
 from pyflow.util.monkeypatch import xtypes
@@ -13,7 +14,7 @@ from pyflow.util.monkeypatch import xtypes
 from . import constraintextractor
 from .model import objectname
 from .model.context import Context
-from .constraints import qualifiers
+from .constraints import qualifiers, split
 from .calling import cpa
 from .escape import objectescape
 from . import summary
@@ -36,6 +37,10 @@ class IPAnalysis(object):
         contexts: Dictionary of analysis contexts.
         root: Root context for external analysis.
         liveCode: Set of live code elements.
+        splitLimit: Types a type split may see before it becomes megamorphic.
+        splitPolicy: "type" or "base", how a type split handles the limit.
+        splitStats: Counters for the type splits.
+        escapeStats: Counters for escape propagation.
         valuemanager: Manager for value sets.
         criticalmanager: Manager for critical sets.
         dirtySlots: List of slots that need reprocessing.
@@ -63,6 +68,12 @@ class IPAnalysis(object):
         self.objs = {}
         self.contexts = {}
 
+        self.splitLimit = config.ipaSplitLimit
+        self.splitPolicy = config.ipaSplitPolicy
+        assert self.splitPolicy in ("type", "base"), self.splitPolicy
+        self.splitStats = split.SplitStatistics()
+        self.escapeStats = objectescape.EscapeStatistics()
+
         self.root = self.getContext(cpa.externalContext)
         self.root.external = True
 
@@ -257,7 +268,8 @@ class IPAnalysis(object):
         
         Bottom-up analysis processes callees before callers, allowing
         summaries to be computed and propagated upward. Uses DFS to
-        process contexts in reverse topological order.
+        process contexts in reverse topological order. The DFS keeps an
+        explicit stack, so deep call chains do not recurse.
         
         Args:
             context: Context to process
@@ -265,29 +277,49 @@ class IPAnalysis(object):
         Raises:
             AssertionError: If recursive cycle detected
         """
-        if context not in self.processed:
-            self.processed.add(context)
-            self.path.append(context)
+        if context in self.processed:
+            assert context not in self.path, "Recursive cycle detected in call graph"
+            return
 
-            # Process children first
-            for invoke in context.invokeOut.values():
+        # Each frame is [context, remaining invokes, invoke awaiting its callee]
+        stack = [self.enterContext(context)]
+        while stack:
+            frame = stack[-1]
+            for invoke in frame[1]:
                 dst = invoke.dst
-                self.contextBottomUp(dst)
+                if dst not in self.processed:
+                    frame[2] = invoke
+                    stack.append(self.enterContext(dst))
+                    break
+                assert dst not in self.path, "Recursive cycle detected in call graph"
                 invoke.apply()
+            else:
+                stack.pop()
+                self.exitContext(frame[0])
+                if stack:
+                    parent = stack[-1]
+                    parent[2].apply()
+                    parent[2] = None
 
-            self.updateConstraints()
+    def enterContext(self, context):
+        """Mark a context as visited and create its bottom-up stack frame."""
+        self.processed.add(context)
+        self.path.add(context)
+        return [context, iter(context.invokeOut.values()), None]
 
-            if context.summary.dirty:
-                self.propagateCriticals(context)
-                objectescape.process(context)
+    def exitContext(self, context):
+        """Summarize a context once all of its callees are processed."""
+        self.updateConstraints()
 
-                summary.update(context)
+        if context.summary.dirty:
+            self.propagateCriticals(context)
+            objectescape.process(context)
 
-                self.updateConstraints()  # TODO only once?
+            summary.update(context)
 
-            self.path.pop()
-        else:
-            assert context not in self.path, "Recursive cycle detected in call graph"
+            self.updateConstraints()  # TODO only once?
+
+        self.path.remove(context)
 
     def bottomUp(self):
         """Perform bottom-up analysis pass.
@@ -298,7 +330,7 @@ class IPAnalysis(object):
         """
         print("bottom up")
         self.processed = set()
-        self.path = []
+        self.path = set()
 
         for context in self.contexts.values():
             context.summary.fresh = False
@@ -50,6 +50,8 @@ class Context(object):
         external: Whether this is an external context
         dirtyflags: Queue of nodes with dirty flags
         dirtyobjects: Queue of objects with dirty flags
+        changedobjects: Queue of escaping objects with grown fields
+        returnsMarked: Dictionary mapping return node to the values last marked
         dirtycriticals: Queue of nodes with dirty critical values
         criticalStores: List of critical store constraints
     """
@@ -93,6 +95,9 @@ class Context(object):
         self.dirtyflags = []
         self.dirtyobjects = []
 
+        self.changedobjects = []
+        self.returnsMarked = {}
+
         self.dirtycriticals = []
         self.criticalStores = []
 
@@ -108,6 +113,9 @@ class Context(object):
     def dirtyObject(self, node):
         self.dirtyobjects.append(node)
 
+    def changedObject(self, node):
+        self.changedobjects.append(node)
+
     def processObjects(self, callback):
         while self.dirtyobjects:
             node = self.dirtyobjects.pop()
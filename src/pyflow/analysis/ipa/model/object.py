@@ -23,8 +23,20 @@ class Object(object):
         fields: Dictionary mapping (fieldType, name) to ConstraintNode
         flags: Escape flags (escapeParam, escapeGlobal, etc.)
         dirty: Whether flags have changed (needs reprocessing)
+        changed: Whether fields have grown since escape propagation
+        markedFlags: Escape flags last propagated to the fields
+        marked: Dictionary mapping field to the values last marked
     """
-    __slots__ = "context", "name", "fields", "flags", "dirty"
+    __slots__ = (
+        "context",
+        "name",
+        "fields",
+        "flags",
+        "dirty",
+        "changed",
+        "markedFlags",
+        "marked",
+    )
 
     def __init__(self, context, name):
         """Initialize an object.
@@ -39,12 +51,19 @@ class Object(object):
         self.flags = 0
         self.dirty = False
 
+        self.changed = False
+        self.markedFlags = 0
+        self.marked = None
+
         # Initialize escape flags based on qualifier
         if name.qualifier is qualifiers.DN:
             self.flags |= objectescape.escapeParam
         elif name.qualifier is qualifiers.GLBL:
             self.flags |= objectescape.escapeGlobal
 
+        if self.flags:
+            self.fieldChanged()
+
     def updateFlags(self, context, flags):
         diff = ~self.flags & flags
         if diff:
@@ -53,6 +72,12 @@ class Object(object):
                 self.dirty = True
                 context.dirtyObject(self)
 
+    def fieldChanged(self):
+        # Only escaping objects pass their flags on to their fields.
+        if self.flags and not self.changed:
+            self.changed = True
+            self.context.changedObject(self)
+
     def initDownwardField(self, slot, fieldtype, name):
         for invoke in self.context.invokeIn.values():
             invoke.copyFieldFromSources(slot, self.name, fieldtype, name)
@@ -85,6 +110,7 @@ class Object(object):
 
         if key not in self.fields:
             result = node.ConstraintNode(self.context, (self.name, fieldType, name))
+            result.owner = self
             self.fields[key] = result
 
             if self.context.external:
@@ -17,6 +17,7 @@ and querying of lifetime information. It performs:
 """
 
 import collections
+import itertools
 import time
 
 from pyflow.analysis.cpa import base
@@ -26,6 +27,7 @@ from pyflow.language.python import annotations
 
 from pyflow.util.PADS.StrongConnectivity import StronglyConnectedComponents
 
+from . import database
 from .database import structure
 from .database import tupleset
 from .database import mapping
@@ -33,6 +35,9 @@ from .database import lattice
 
 from pyflow.analysis.astcollector import getOps
 
+# Translates the digits of bin(mask) into itertools.compress selectors
+_BITS_TO_SELECTORS = bytes.maketrans(b"01", b"\x00\x01")
+
 contextSchema = structure.WildcardSchema()
 operationSchema = structure.TypeSchema((ast.Expression, ast.Statement))
 codeSchema = structure.CallbackSchema(lambda code: code.isCode())
@@ -129,6 +134,22 @@ def filteredSCC(G):
     return o
 
 
+def condensedSCC(G):
+    """Condense a graph into its strongly connected components.
+
+    Unlike filteredSCC, trivial components are kept, so every node of the
+    graph appears in exactly one component.
+
+    Args:
+        G: Graph to analyze, every node must be a key
+
+    Returns:
+        list: Induced subgraphs of the components in reverse topological
+        order, a component is listed after every component it reaches
+    """
+    return list(StronglyConnectedComponents(G))
+
+
 class ObjectInfo(object):
     """Information about an object's lifetime and references.
     
@@ -208,10 +229,15 @@ class ReadModifyAnalysis(object):
     
     ReadModifyAnalysis tracks which objects are read and modified at each
     program point. It propagates read/modify information through the call
-    graph, filtering out objects that are killed (no longer live).
+    graph, filtering out objects that are killed (no longer live). During
+    propagation the sets are dense bitsets over the slots in slotBit.
     
     Attributes:
         invokeSources: Dictionary mapping (code, context) to invocation sources
+        invokeGraph: Dictionary mapping (code, context) to invoked (code, context)
+        callees: Dictionary mapping (code, context) to (op, (dstCode, dstContext), killed)
+        slots: List of slots, indexed by bit number
+        slotBit: Dictionary mapping slot to its bit
         contextReads: Dictionary mapping (code, context) to set of read objects
         contextModifies: Dictionary mapping (code, context) to set of modified objects
         opReadDB: Database mapping (code, op, context) to read sets
@@ -299,108 +325,169 @@ class ReadModifyAnalysis(object):
 
     def process(self, killed):
         self.killed = killed
-        self.processReads()
-        self.processModifies()
+        self.indexSlots()
+        if not self.slots:
+            return
+        self.buildGraph()
 
-    def processReads(self):
-        """Process read sets, propagating backward through call graph.
-        
-        Propagates read information backward from callees to callers,
-        filtering out objects that are killed (no longer live).
-        """
-        self.dirty = set()
+        self.propagate(self.contextReads, self.opReadDB)
+        self.propagate(self.contextModifies, self.opModifyDB)
 
-        for (code, context), values in self.contextReads.items():
-            if values:
-                self.dirty.add((code, context))
+    def buildGraph(self):
+        """Build the context-level invocation graph.
 
-        while self.dirty:
-            current = self.dirty.pop()
-            self.processContextReads(current)
-
-    def processContextReads(self, current):
-        """Process reads for a specific context.
-        
-        Propagates reads from current context to its invocation sources,
-        filtering out killed objects.
-        
-        Args:
-            current: (code, context) tuple to process
+        Each edge caller -> callee is labelled with the invoking operation
+        and the objects killed along the edge.
         """
-        currentF, currentC = current
+        self.callees = collections.defaultdict(list)
+        self.invokeGraph = collections.defaultdict(set)
 
-        for prev in self.invokeSources[currentF][currentC]:
-            prevF, prevO, prevC = prev
+        for (code, context) in self.contextReads:
+            self.invokeGraph[(code, context)]
+        for (code, context) in self.contextModifies:
+            self.invokeGraph[(code, context)]
 
-            prevRead = self.opReadDB[prevF][prevO]
-
-            killed = self.killed[(prevF, prevO, prevC)][(currentF, currentC)]
+        for dstF, contexts in self.invokeSources:
+            for dstC, srcs in contexts:
+                dst = (dstF, dstC)
+                self.invokeGraph[dst]
+                for srcF, srcO, srcC in srcs:
+                    src = (srcF, srcC)
+                    killed = self.killed[(srcF, srcO, srcC)][dst]
+                    self.callees[src].append((srcO, dst, killed))
+                    self.invokeGraph[src].add(dst)
 
-            # Propigate reads
-            filtered = set(
-                [
-                    value
-                    for value in self.contextReads[(currentF, currentC)]
-                    if value.object not in killed
-                ]
-            )
-            current = prevRead[prevC]
-            diff = filtered - current if current else filtered
+        self.invokeGraph = dict(self.invokeGraph)
 
-            if diff:
-                self.contextReads[(prevF, prevC)].update(diff)
-                prevRead.merge(prevC, diff)
-                self.dirty.add((prevF, prevC))
+    def indexSlots(self):
+        """Give every read or modified slot a dense bit index.
 
-    def processModifies(self):
-        """Process modify sets, propagating backward through call graph.
-        
-        Propagates modify information backward from callees to callers,
-        filtering out objects that are killed (no longer live).
+        Context read/modify sets are propagated as integer bitsets. Kills are
+        per object, so each object maps to the mask of all its slots.
         """
-        self.dirty = set()
-
-        for (code, context), values in self.contextModifies.items():
-            if values:
-                self.dirty.add((code, context))
-
-        while self.dirty:
-            current = self.dirty.pop()
-            self.processContextModifies(current)
+        self.slots = []
+        self.slotBit = {}
+        self.objectMask = collections.defaultdict(int)
+
+        for sets in (self.contextReads, self.contextModifies):
+            for values in sets.values():
+                for slot in values:
+                    if slot not in self.slotBit:
+                        bit = 1 << len(self.slots)
+                        self.slotBit[slot] = bit
+                        self.slots.append(slot)
+                        self.objectMask[slot.object] |= bit
+
+        self.killMasks = {}
+
+    def toMask(self, values):
+        slotBit = self.slotBit
+        mask = 0
+        for slot in values:
+            mask |= slotBit[slot]
+        return mask
+
+    def toSet(self, mask):
+        # bin() lists the bits most significant first, reverse it into one
+        # selector byte per slot.
+        selectors = bin(mask)[:1:-1].encode().translate(_BITS_TO_SELECTORS)
+        return set(itertools.compress(self.slots, selectors))
+
+    def killMask(self, killed):
+        # Kill sets are shared between edges, cache their masks by identity.
+        key = id(killed)
+        mask = self.killMasks.get(key)
+        if mask is None:
+            mask = 0
+            objectMask = self.objectMask
+            for obj in killed:
+                mask |= objectMask.get(obj, 0)
+            mask = ~mask
+            self.killMasks[key] = mask
+        return mask
+
+    def propagate(self, contextSets, opDB):
+        """Propagate read or modify sets backward through the call graph.
+
+        The invocation graph is condensed into strongly connected components,
+        which are solved callees first. A component without recursion is
+        solved in a single pass over its callees. Inside a recursive component
+        only the newly added slots are pushed to the callers until nothing
+        changes. Objects killed along an invocation never reach the caller.
 
-    def processContextModifies(self, current):
-        """Process modifies for a specific context.
-        
-        Propagates modifies from current context to its invocation sources,
-        filtering out killed objects.
-        
         Args:
-            current: (code, context) tuple to process
+            contextSets: Mapping (code, context) -> set of local slots,
+                updated in place with the propagated slots
+            opDB: Operation dataflow database the invocation results are
+                merged into
         """
-        currentF, currentC = current
-
-        for prev in self.invokeSources[currentF][currentC]:
-            prevF, prevO, prevC = prev
-
-            prevMod = self.opModifyDB[prevF][prevO]
+        callees = self.callees
+
+        masks = {}
+        for node in self.invokeGraph:
+            values = contextSets.get(node)
+            masks[node] = self.toMask(values) if values else 0
+
+        for component in condensedSCC(self.invokeGraph):
+            if len(component) == 1:
+                node, = component
+                if node not in component[node]:
+                    mask = masks[node]
+                    for op, dst, killed in callees.get(node, ()):
+                        mask |= masks[dst] & self.killMask(killed)
+                    masks[node] = mask
+                    continue
 
-            killed = self.killed[(prevF, prevO, prevC)][(currentF, currentC)]
+            # Callers of each node, within the component
+            callers = collections.defaultdict(list)
 
-            # Propigate modifies
-            filtered = set(
-                [
-                    value
-                    for value in self.contextModifies[(currentF, currentC)]
-                    if value.object not in killed
-                ]
-            )
-            # diff = filtered-self.opModifies[prev]
-            current = prevMod[prevC]
-            diff = filtered - current if current else filtered
-            if diff:
-                self.contextModifies[(prevF, prevC)].update(diff)
-                prevMod.merge(prevC, diff)
-                self.dirty.add((prevF, prevC))
+            # Everything from outside the component is final.
+            for node in component:
+                mask = masks[node]
+                for op, dst, killed in callees.get(node, ()):
+                    if dst in component:
+                        callers[dst].append((node, self.killMask(killed)))
+                    else:
+                        mask |= masks[dst] & self.killMask(killed)
+                masks[node] = mask
+
+            # First in, first out: a node collects the deltas of all its
+            # callees before it is visited again.  A node is queued only
+            # while it has no pending delta.
+            queue = collections.deque(component)
+            pending = dict([(node, masks[node]) for node in component])
+            while queue:
+                node = queue.popleft()
+                new = pending.pop(node)
+                for caller, keep in callers[node]:
+                    diff = new & keep & ~masks[caller]
+                    if diff:
+                        masks[caller] |= diff
+                        if caller in pending:
+                            pending[caller] |= diff
+                        else:
+                            pending[caller] = diff
+                            queue.append(caller)
+
+        # Annotate the invoking operations
+        opMasks = collections.defaultdict(int)
+        for node, edges in callees.items():
+            code, context = node
+            for op, dst, killed in edges:
+                opMasks[(code, op, context)] |= masks[dst] & self.killMask(killed)
+
+        decoded = {}
+        for (code, op, context), mask in opMasks.items():
+            if mask:
+                if mask not in decoded:
+                    decoded[mask] = self.toSet(mask)
+                opDB[code][op].merge(context, decoded[mask])
+
+        for node, mask in masks.items():
+            if mask:
+                if mask not in decoded:
+                    decoded[mask] = self.toSet(mask)
+                contextSets[node] = set(decoded[mask])
 
 
 class DFSSearcher(object):
@@ -691,7 +778,8 @@ class LifetimeAnalysis(object):
         currentF, currentO, currentC = current
         assert currentF.isCode(), type(currentF)
 
-        operationSchema.validate(currentO)
+        if database.base.debug:
+            operationSchema.validate(currentO)
 
         newLive = set()
 
@@ -3,8 +3,17 @@
 This module provides the base Schema class and exceptions for the database
 system used by lifetime analysis. Schemas define the structure and validation
 rules for database entries.
+
+Containers come in two flavors. With debug set, every key and value handed to
+a container is validated against its schema. Otherwise schemas compile
+specialized container classes that skip validation, which is what the
+analyses use in their inner loops.
 """
 
+# Validate every container access against the schema (slow).
+debug = False
+
+
 class SchemaError(Exception):
     """Exception raised for schema validation errors."""
     pass
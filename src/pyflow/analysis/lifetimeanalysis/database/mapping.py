@@ -6,6 +6,7 @@ and merging of analysis information.
 """
 
 from . import base
+from . import lattice
 
 
 class MappingSchema(base.Schema):
@@ -19,7 +20,7 @@ class MappingSchema(base.Schema):
         keyschema: Schema for keys
         valueschema: Schema for values
     """
-    __slots__ = "keyschema", "valueschema"
+    __slots__ = "keyschema", "valueschema", "compiled"
 
     def __init__(self, keyschema, valueschema):
         """Initialize mapping schema.
@@ -30,14 +31,49 @@ class MappingSchema(base.Schema):
         """
         self.keyschema = keyschema
         self.valueschema = valueschema
+        self.compiled = None
 
     def instance(self):
         """Create a mapping instance.
         
+        In debug mode the instance validates every key and value, otherwise
+        it is an instance of the class compiled for this schema.
+        
         Returns:
             Mapping: New mapping instance
         """
-        return Mapping(self)
+        if base.debug:
+            return Mapping(self)
+
+        if self.compiled is None:
+            self.compiled = self.compile()
+        return self.compiled(self)
+
+    def compile(self):
+        """Create a mapping class specialized for this schema.
+        
+        The class does not validate keys or values. Missing values are
+        created by the value schema directly, and merging into a set union
+        value is a plain set update.
+        
+        Returns:
+            type: CompiledMapping subclass
+        """
+        if isinstance(self.valueschema, lattice.SetUnionSchema):
+            merge = CompiledMapping.unionMerge
+        else:
+            merge = CompiledMapping.schemaMerge
+
+        return type(
+            "CompiledMapping",
+            (CompiledMapping,),
+            {
+                "__slots__": (),
+                "missing": staticmethod(self.valueschema.missing),
+                "inplaceMerge": staticmethod(self.valueschema.inplaceMerge),
+                "merge": merge,
+            },
+        )
 
     def missing(self):
         """Get missing (empty) value.
@@ -170,3 +206,48 @@ class Mapping(object):
         if changed:
             self.data[key] = result
         return changed
+
+
+class CompiledMapping(Mapping):
+    """Mapping without validation, specialized for a schema.
+    
+    Subclasses are created by MappingSchema.compile, which binds the value
+    schema's missing and inplaceMerge methods and picks a merge strategy.
+    """
+    __slots__ = ()
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.data = {}
+
+    def __getitem__(self, key):
+        data = self.data
+        result = data.get(key, data)
+        if result is data:
+            result = self.missing()
+            data[key] = result
+        return result
+
+    def schemaMerge(self, key, value):
+        result, changed = self.inplaceMerge(self[key], value)
+        if changed:
+            self.data[key] = result
+        return changed
+
+    def unionMerge(self, key, value):
+        data = self.data
+        current = data.get(key)
+        if current is None:
+            if value:
+                data[key] = set(value)
+                return True
+            elif key not in data:
+                data[key] = None
+            return False
+        elif not value:
+            # Like the set schema, merging nothing is not a change.
+            return False
+
+        oldLen = len(current)
+        current.update(value)
+        return len(current) != oldLen
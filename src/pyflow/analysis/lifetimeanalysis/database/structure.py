@@ -189,9 +189,10 @@ class StructureSchema(base.Schema):
             field.validate(arg)
 
     def inplaceMerge(self, target, *args):
-        self.validate(target)
-        for arg in args:
-            self.validate(arg)
+        if base.debug:
+            self.validate(target)
+            for arg in args:
+                self.validate(arg)
 
         accum = []
 
@@ -207,8 +208,9 @@ class StructureSchema(base.Schema):
         return output, changed
 
     def merge(self, *args):
-        for arg in args:
-            self.validate(arg)
+        if base.debug:
+            for arg in args:
+                self.validate(arg)
 
         accum = []
 
@@ -29,10 +29,15 @@ class TupleSetSchema(base.Schema):
     def instance(self):
         """Create a tuple set instance.
         
+        In debug mode the instance validates every tuple, otherwise tuples
+        go straight into the underlying set.
+        
         Returns:
             TupleSet: New tuple set instance
         """
-        return TupleSet(self)
+        if base.debug:
+            return TupleSet(self)
+        return CompiledTupleSet(self)
 
     def missing(self):
         """Get missing (empty) value.
@@ -137,3 +142,14 @@ class TupleSet(object):
                 % (args,)
             )
         self.data.remove(args)
+
+
+class CompiledTupleSet(TupleSet):
+    """Tuple set without validation."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.data = set()
+
+    def add(self, *args):
+        self.data.add(args)
@@ -5,6 +5,7 @@ programs by analyzing call graphs and function usage patterns.
 """
 
 from pyflow.util.typedispatch import *
+from pyflow.language.asttools.walker import StackWalker
 from pyflow.language.python import ast
 from pyflow.analysis.astcollector import getOps
 
@@ -26,13 +27,26 @@ class Finder(object):
     def process(self, node):
         """Process a node and its children.
         
+        Nodes are visited in depth-first preorder, using an explicit stack
+        so arbitrarily deep call chains do not exhaust the Python stack.
+        
         Args:
             node: Node to process.
         """
-        if node not in self.processed:
-            self.processed.add(node)
-            for child in self.children(node):
-                self.process(child)
+        processed = self.processed
+        if node in processed:
+            return
+
+        processed.add(node)
+        stack = [iter(self.children(node))]
+        while stack:
+            for child in stack[-1]:
+                if child not in processed:
+                    processed.add(child)
+                    stack.append(iter(self.children(child)))
+                    break
+            else:
+                stack.pop()
 
     def children(self, node):
         """Get children of a node.
@@ -149,9 +163,9 @@ def findLiveContexts(prgm):
     return cgf.liveFuncContext
 
 
-class LiveHeapFinder(TypeDispatcher):
+class LiveHeapFinder(StackWalker):
     def __init__(self):
-        TypeDispatcher.__init__(self)
+        StackWalker.__init__(self)
         self.live = set()
 
     def addReferences(self, refs):
@@ -171,10 +185,11 @@ class LiveHeapFinder(TypeDispatcher):
 
     @defaultdispatch
     def visitDefault(self, node):
-        node.visitChildren(self)
+        if not node.__shared__:
+            return node.children()
 
     def process(self, code):
-        code.visitChildrenForced(self)
+        self.walkChildren(code)
 
 
 # HACK this may not be 100% sound, as it only considers references
@@ -0,0 +1,195 @@
+"""Indexed queries over solved analysis results.
+
+The annotations CPA leaves on the AST answer "what can this local point to"
+and "which codes can this op invoke" from the point of view of a single node.
+The inverse questions, which ops invoke a code and which locals may hold a
+type, need a scan of every live op.  ProgramQuery performs that scan once and
+keeps forward and reverse indexes, so each query is a dictionary lookup.
+
+The index describes the annotations as they were when it was built.  stale()
+reports whether a live code has been mutated since.  Heap slot queries are
+answered by the store graph's current frozen index instead, so they follow
+the graph when it is frozen again.
+"""
+
+import collections
+import sys
+import time
+
+from pyflow.analysis.astcollector import getOps
+from pyflow.util.io import formatting
+
+emptySet = frozenset()
+
+
+class ProgramQuery(object):
+    def __init__(self, liveCode, storeGraph=None):
+        start = time.perf_counter()
+
+        self.generation = {}
+        self.opCode = {}
+
+        self.opCallees = {}
+        self.codeCallSites = collections.defaultdict(set)
+        self.invokeDestination = collections.defaultdict(set)
+        self.invokeSource = collections.defaultdict(set)
+
+        self.localTypes = {}
+        self.typeLocals = collections.defaultdict(set)
+
+        # Points-to queries on heap slots are answered by the frozen graph.
+        self.storeGraph = storeGraph
+        self.typeSlots = None
+        self.typeSlotsFrozen = None
+
+        for code in liveCode:
+            self.indexCode(code)
+
+        self.codeCallSites = self.freezeIndex(self.codeCallSites)
+        self.invokeDestination = self.freezeIndex(self.invokeDestination)
+        self.invokeSource = self.freezeIndex(self.invokeSource)
+        self.typeLocals = self.freezeIndex(self.typeLocals)
+
+        self.buildTime = time.perf_counter() - start
+
+    def freezeIndex(self, index):
+        return dict([(key, frozenset(values)) for key, values in index.items()])
+
+    def indexCode(self, code):
+        self.generation[code] = getattr(code, "generation", None)
+
+        ops, lcls = getOps(code)
+        contexts = code.annotation.contexts
+
+        for op in ops:
+            self.opCode[op] = code
+
+            invokes = op.annotation.invokes
+            if invokes is None:
+                continue
+
+            callees = frozenset([dst for dst, dstContext in invokes[0]])
+            self.opCallees[op] = callees
+            for dst in callees:
+                self.codeCallSites[dst].add((code, op))
+
+            if contexts:
+                for context, cinvokes in zip(contexts, invokes[1]):
+                    src = (code, context)
+                    for dst in cinvokes:
+                        self.invokeDestination[src].add(dst)
+                        self.invokeSource[dst].add(src)
+
+        for lcl in lcls:
+            references = lcl.annotation.references
+            if references is None:
+                continue
+
+            xtypes = frozenset([ref.xtype for ref in references[0]])
+            self.localTypes[lcl] = xtypes
+            for xtype in xtypes:
+                self.typeLocals[xtype].add((code, lcl))
+
+    def stale(self):
+        for code, generation in self.generation.items():
+            if getattr(code, "generation", None) != generation:
+                return True
+        return False
+
+    ### Call graph ###
+
+    def codeOf(self, op):
+        return self.opCode.get(op)
+
+    def callees(self, op):
+        """The codes op may invoke, in any context."""
+        return self.opCallees.get(op, emptySet)
+
+    def callSites(self, code):
+        """The (code, op) pairs that may invoke code."""
+        return self.codeCallSites.get(code, emptySet)
+
+    def callers(self, code):
+        """The codes that may invoke code."""
+        return frozenset([caller for caller, op in self.callSites(code)])
+
+    def invokes(self, code, context):
+        """The (code, context) pairs invoked from a context of code."""
+        return self.invokeDestination.get((code, context), emptySet)
+
+    def invokedBy(self, code, context):
+        """The (code, context) pairs that invoke a context of code."""
+        return self.invokeSource.get((code, context), emptySet)
+
+    ### Points-to ###
+
+    def pointsTo(self, lcl):
+        """The extended types lcl may refer to, in any context."""
+        return self.localTypes.get(lcl, emptySet)
+
+    def localsPointingTo(self, xtype):
+        """The (code, local) pairs that may refer to xtype."""
+        return self.typeLocals.get(xtype, emptySet)
+
+    def frozenGraph(self):
+        frozen = None if self.storeGraph is None else self.storeGraph.frozen
+        assert frozen is not None, "the store graph has not been frozen"
+        return frozen
+
+    def slotPointsTo(self, slot):
+        return self.frozenGraph().pointsTo(slot)
+
+    def slotsPointingTo(self, xtype):
+        """The heap slots that may refer to xtype."""
+        frozen = self.frozenGraph()
+
+        # Few passes ask, so the reverse index is built on demand, and again
+        # if the store graph has been frozen anew.
+        if self.typeSlotsFrozen is not frozen:
+            typeSlots = collections.defaultdict(set)
+            for sid, slot in enumerate(frozen.slots):
+                for tid in frozen.refTypes[frozen.refStart[sid] : frozen.refStart[sid + 1]]:
+                    typeSlots[frozen.xtypes[tid]].add(slot)
+            self.typeSlots = self.freezeIndex(typeSlots)
+            self.typeSlotsFrozen = frozen
+
+        return self.typeSlots.get(xtype, emptySet)
+
+    ### Statistics ###
+
+    def memory(self):
+        """Estimated size of the indexes in bytes, excluding the keys."""
+        mem = 0
+        for index in (
+            self.generation,
+            self.opCode,
+            self.opCallees,
+            self.codeCallSites,
+            self.invokeDestination,
+            self.invokeSource,
+            self.localTypes,
+            self.typeLocals,
+            self.typeSlots,
+        ):
+            if index is None:
+                continue
+            mem += sys.getsizeof(index)
+            for values in index.values():
+                if isinstance(values, frozenset) and values:
+                    mem += sys.getsizeof(values)
+        return mem
+
+    def output(self, console):
+        console.output("Codes:         %d" % len(self.generation))
+        console.output("Ops:           %d" % len(self.opCode))
+        console.output("Call sites:    %d" % len(self.opCallees))
+        console.output("Locals:        %d" % len(self.localTypes))
+        console.output("Index Memory:  %s" % formatting.memorySize(self.memory()))
+        console.output("Build:         %s" % formatting.elapsedTime(self.buildTime))
+
+
+def evaluate(compiler, prgm):
+    with compiler.console.scope("query index"):
+        query = ProgramQuery(prgm.liveCode, prgm.storeGraph)
+        query.output(compiler.console)
+        return query
@@ -10,10 +10,11 @@ Key components:
 - CanonicalObjects: Canonical naming for objects and types
 - ExtendedTypes: Type system extensions for analysis
 - SetManager: Efficient set operations for analysis
+- FrozenStoreGraph: Read-only points-to index of a solved graph
 
 The store graph serves as the foundation for all PyFlow analyses, providing
 a unified representation of program state and enabling precise inter-procedural
 analysis across function boundaries.
 """
 
-from . import storegraph, canonicalobjects, extendedtypes, setmanager, annotations
+from . import storegraph, canonicalobjects, extendedtypes, setmanager, annotations, frozen
@@ -0,0 +1,226 @@
+"""Read-only index of a solved store graph.
+
+Once CPA has finished, the store graph no longer grows, but every node still
+carries what the solver needed: forwarding pointers left by merges, slot
+observers, and per-node dictionaries.  Freezing the graph collapses the
+forwards so the merged-away nodes can be collected, and packs the reachable
+graph into flat tables:
+
+    slot id   -> a range of (type id, object id) pairs it may point to
+    object id -> a range of slot ids for its fields
+
+Downstream passes still hold the live nodes, so the nodes themselves are not
+replaced.  Points-to queries on the index are a dictionary lookup and a slice.
+"""
+
+import sys
+from array import array
+
+
+def collapseForwards(storeGraph):
+    """Point every live node directly at its canonical neighbours."""
+    slots = storeGraph.slots
+    for slotName in slots:
+        slots[slotName] = slots[slotName].getForward()
+
+    processed = set()
+    stack = list(slots.values())
+
+    while stack:
+        slot = stack.pop()
+        if slot in processed:
+            continue
+        processed.add(slot)
+
+        slot.region = slot.region.getForward()
+        if slot.object is not None:
+            slot.object = slot.object.getForward()
+
+        region = slot.region
+        for xtype in slot.refs:
+            obj = region.object(xtype).getForward()
+            region.objects[xtype] = obj
+            obj.region = obj.region.getForward()
+
+            fields = obj.slots
+            for slotName in fields:
+                field = fields[slotName].getForward()
+                fields[slotName] = field
+                stack.append(field)
+
+    return processed
+
+
+class FrozenStoreGraph(object):
+    __slots__ = (
+        "xtypes",
+        "typeId",
+        "slots",
+        "slotId",
+        "objects",
+        "objectId",
+        "refStart",
+        "refTypes",
+        "refObjects",
+        "nullSlots",
+        "fieldStart",
+        "fieldSlots",
+    )
+
+    def __init__(self, storeGraph):
+        self.xtypes = []
+        self.typeId = {}
+        self.slots = []
+        self.slotId = {}
+        self.objects = []
+        self.objectId = {}
+
+        self.refStart = array("l", [0])
+        self.refTypes = array("l")
+        self.refObjects = array("l")
+        self.nullSlots = set()
+
+        self.fieldStart = array("l", [0])
+        self.fieldSlots = array("l")
+
+        self.build(storeGraph)
+
+    def internType(self, xtype):
+        tid = self.typeId.get(xtype)
+        if tid is None:
+            tid = len(self.xtypes)
+            self.typeId[xtype] = tid
+            self.xtypes.append(xtype)
+        return tid
+
+    def internSlot(self, slot):
+        sid = self.slotId.get(slot)
+        if sid is None:
+            sid = len(self.slots)
+            self.slotId[slot] = sid
+            self.slots.append(slot)
+        return sid
+
+    def internObject(self, obj):
+        oid = self.objectId.get(obj)
+        if oid is None:
+            oid = len(self.objects)
+            self.objectId[obj] = oid
+            self.objects.append(obj)
+        return oid
+
+    def build(self, storeGraph):
+        for slot in storeGraph.slots.values():
+            self.internSlot(slot)
+
+        # Slots and objects are numbered breadth first, so both tables can
+        # be filled in id order while the graph is being discovered.
+        nextObject = 0
+        sid = 0
+        while sid < len(self.slots) or nextObject < len(self.objects):
+            while sid < len(self.slots):
+                slot = self.slots[sid]
+                objects = slot.region.objects
+                for xtype in slot.refs:
+                    self.refTypes.append(self.internType(xtype))
+                    self.refObjects.append(self.internObject(objects[xtype]))
+                self.refStart.append(len(self.refTypes))
+
+                if slot.null:
+                    self.nullSlots.add(sid)
+                sid += 1
+
+            while nextObject < len(self.objects):
+                obj = self.objects[nextObject]
+                for field in obj.slots.values():
+                    self.fieldSlots.append(self.internSlot(field))
+                self.fieldStart.append(len(self.fieldSlots))
+                nextObject += 1
+
+    ### Queries ###
+
+    def refRange(self, slot):
+        sid = self.slotId[slot]
+        return self.refStart[sid], self.refStart[sid + 1]
+
+    def pointsTo(self, slot):
+        """The extended types slot may refer to."""
+        start, end = self.refRange(slot)
+        xtypes = self.xtypes
+        return tuple([xtypes[tid] for tid in self.refTypes[start:end]])
+
+    def pointsToObjects(self, slot):
+        """The object nodes slot may refer to."""
+        start, end = self.refRange(slot)
+        objects = self.objects
+        return tuple([objects[oid] for oid in self.refObjects[start:end]])
+
+    def mayBeNull(self, slot):
+        return self.slotId[slot] in self.nullSlots
+
+    def fields(self, obj):
+        oid = self.objectId[obj]
+        start, end = self.fieldStart[oid], self.fieldStart[oid + 1]
+        slots = self.slots
+        return tuple([slots[sid] for sid in self.fieldSlots[start:end]])
+
+    def __contains__(self, node):
+        return node in self.slotId or node in self.objectId
+
+    def memory(self):
+        """Estimated size of the index in bytes, excluding the nodes."""
+        mem = 0
+        for table in (
+            self.xtypes,
+            self.typeId,
+            self.slots,
+            self.slotId,
+            self.objects,
+            self.objectId,
+            self.refStart,
+            self.refTypes,
+            self.refObjects,
+            self.nullSlots,
+            self.fieldStart,
+            self.fieldSlots,
+        ):
+            mem += sys.getsizeof(table)
+        return mem
+
+
+def nodeMemory(storeGraph):
+    """Estimated size of the nodes reachable from the roots, in bytes.
+
+    Merged-away nodes are still counted while something refers to them.
+    """
+    mem = sys.getsizeof(storeGraph.slots)
+    processed = set()
+    stack = list(storeGraph.slots.values())
+
+    while stack:
+        node = stack.pop()
+        if node is None or node in processed:
+            continue
+        processed.add(node)
+        mem += sys.getsizeof(node)
+
+        if node.isSlot():
+            if node.observers:
+                mem += sys.getsizeof(node.observers)
+            stack.append(node.forward)
+            stack.append(node.region)
+            if node.refs:
+                region = node.region.getForward()
+                for xtype in node.refs:
+                    stack.append(region.objects.get(xtype))
+        elif node.isObject():
+            stack.append(node.forward)
+            if node.slots is not None:
+                mem += sys.getsizeof(node.slots)
+                stack.extend(node.slots.values())
+        else:
+            stack.append(node.forward)
+            if node.objects is not None:
+                mem += sys.getsizeof(node.objects)
+
+    return mem
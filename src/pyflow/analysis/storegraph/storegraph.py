@@ -22,6 +22,7 @@ Key concepts:
 from . import extendedtypes
 from . import setmanager
 from . import annotations
+from . import frozen
 
 # HACK for assertions
 from pyflow.language.python import program
@@ -120,6 +121,7 @@ class StoreGraph(MergableNode):
         canonical: CanonicalObjects for canonical naming
         typeSlotName: Canonical name for type pointer field
         lengthSlotName: Canonical name for length field
+        frozen: FrozenStoreGraph index, None if the graph has changed since
     """
     __slots__ = (
         "slots",
@@ -129,6 +131,7 @@ class StoreGraph(MergableNode):
         "canonical",
         "typeSlotName",
         "lengthSlotName",
+        "frozen",
     )
 
     def __init__(self, extractor, canonical):
@@ -146,6 +149,7 @@ class StoreGraph(MergableNode):
         self.setManager = setmanager.CachedSetManager()
         self.extractor = extractor
         self.canonical = canonical
+        self.frozen = None
 
         # HACK this should be centeralized?
         self.typeSlotName = self.canonical.fieldName(
@@ -211,6 +215,7 @@ class StoreGraph(MergableNode):
             region = self.regionHint if regionHint is None else regionHint
             root = SlotNode(None, slotName, region, self.setManager.empty())
             self.slots[slotName] = root
+            self.frozen = None
             return root
         else:
             # TODO merge region?
@@ -224,6 +229,26 @@ class StoreGraph(MergableNode):
         for slot in self:
             slot.removeObservers(processed)
 
+    def freeze(self):
+        """Index the solved graph for read-only queries.
+
+        Drops the observers, collapses forwarding pointers left by merges,
+        and packs the reachable graph into a FrozenStoreGraph.  The index is
+        discarded if a node is added, a slot gains a type, or nodes are
+        merged afterwards.
+        """
+        self.removeObservers()
+        frozen.collapseForwards(self)
+        self.frozen = frozen.FrozenStoreGraph(self)
+        return self.frozen
+
+    def memory(self):
+        """Estimate the memory held by the graph, in bytes."""
+        mem = self.setManager.memory() + frozen.nodeMemory(self)
+        if self.frozen is not None:
+            mem += self.frozen.memory()
+        return mem
+
 
 class RegionNode(MergableNode):
     """Represents a region grouping objects together.
@@ -259,6 +284,7 @@ class RegionNode(MergableNode):
 
         if self != other:
             other.setForward(self)
+            self.group.frozen = None
 
             objects = other.objects
             other.objects = None
@@ -279,6 +305,7 @@ class RegionNode(MergableNode):
         if xtype not in self.objects:
             obj = ObjectNode(self, xtype)
             self.objects[xtype] = obj
+            self.group.frozen = None
 
             # Note this is done after setting the dictionary,
             # as this call can recurse.
@@ -332,6 +359,7 @@ class ObjectNode(MergableNode):
 
         if self != other:
             other.setForward(self)
+            self.region.group.frozen = None
 
             slots = other.slots
             other.slots = None
@@ -360,6 +388,7 @@ class ObjectNode(MergableNode):
             group = region.group
             field = SlotNode(self, slotName, region, group.setManager.empty())
             self.slots[slotName] = field
+            group.frozen = None
 
             if self.xtype.isExisting():
                 ref = group.existingSlotRef(self.xtype, slotName)
@@ -455,6 +484,7 @@ class SlotNode(MergableNode):
 
         if self != other:
             other.setForward(self)
+            self.region.group.frozen = None
 
             refs = other.refs
             other.refs = None
@@ -527,6 +557,7 @@ class SlotNode(MergableNode):
 
     def _update(self, diff):
         group = self.region.group
+        group.frozen = None
         self.refs = group.setManager.inplaceUnion(self.refs, diff)
         for o in self.observers:
             o.mark()
@@ -18,6 +18,7 @@ a standardized interface for the pass manager.
 - Argument Normalization: Normalizes function arguments, eliminates *args, **kwargs
 - Program Culling: Removes dead functions and contexts
 - Store Elimination: Eliminates redundant store operations
+- Local Coalescing: Lets temporaries with disjoint live ranges share locals
 
 **Pass Dependencies:**
 The register_standard_passes() function sets up dependencies:
@@ -28,7 +29,7 @@ The register_standard_passes() function sets up dependencies:
 
 from .passmanager import AnalysisPass, OptimizationPass, PassResult
 from pyflow.analysis import ipa, cpa, lifetimeanalysis
-from pyflow.optimization import methodcall, simplify, clone, argumentnormalization, cullprogram, storeelimination
+from pyflow.optimization import methodcall, simplify, clone, argumentnormalization, cullprogram, storeelimination, coalesce
 
 
 class IPAAnalysisPass(AnalysisPass):
@@ -159,6 +160,20 @@ class StoreEliminationPass(OptimizationPass):
             return PassResult(success=False, error=str(e))
 
 
+class CoalesceLocalsPass(OptimizationPass):
+    """Local coalescing pass."""
+
+    def __init__(self):
+        super().__init__("coalesce_locals", "Lets temporaries with disjoint live ranges share locals")
+
+    def run(self, compiler, program) -> PassResult:
+        try:
+            stats = coalesce.evaluate(compiler, program)
+            return PassResult(success=True, changed=stats.after < stats.before, data=stats)
+        except Exception as e:
+            return PassResult(success=False, error=str(e))
+
+
 # Registry of standard passes
 STANDARD_PASSES = {
     "ipa": IPAAnalysisPass,
@@ -170,6 +185,7 @@ STANDARD_PASSES = {
     "argument_normalization": ArgumentNormalizationPass,
     "cull_program": ProgramCullingPass,
     "store_elimination": StoreEliminationPass,
+    "coalesce_locals": CoalesceLocalsPass,
 }
 
 
@@ -208,7 +224,7 @@ def register_standard_passes(pass_manager):
     cpa_pass.info.dependencies.add("ipa")
 
     # CPA should run before most optimizations (optimizations need type/flow info)
-    for opt_name in ["methodcall", "simplify", "clone", "argument_normalization", "cull_program"]:
+    for opt_name in ["methodcall", "simplify", "clone", "argument_normalization", "cull_program", "coalesce_locals"]:
         if opt_name in pass_manager.passes:
             opt_pass = pass_manager.passes[opt_name]
             opt_pass.info.dependencies.add("cpa")
@@ -17,6 +17,7 @@ from pyflow.analysis import cpa
 from pyflow.analysis import lifetimeanalysis
 from pyflow.analysis.dump import dumpreport
 from pyflow.analysis import programculler
+from pyflow.analysis import astcollector
 
 # Import optimization modules (for legacy compatibility)
 from pyflow.optimization import methodcall
@@ -26,6 +27,7 @@ from pyflow.optimization import clone
 from pyflow.optimization import argumentnormalization
 from pyflow.optimization import codeinlining
 from pyflow.optimization import loadelimination
+from pyflow.optimization import coalesce
 from pyflow.optimization import storeelimination
 from pyflow.optimization import dce
 
@@ -95,6 +97,7 @@ class Pipeline(object):
         7. Argument normalization - eliminates *args, **kwargs
         8. Program culling - removes dead functions/contexts
         9. Store elimination - removes redundant stores
+        10. Local coalescing - lets temporaries share locals
         
         Args:
             compiler: Compiler context
@@ -121,11 +124,15 @@ class Pipeline(object):
             "argument_normalization",  # Argument normalization
             "cull_program",  # Program culling
             "store_elimination",       # Store elimination
+            "coalesce_locals",         # Local coalescing
         ])
 
         # Run the pipeline
         results = self.pass_manager.run_pipeline(compiler, program, pipeline)
 
+        with compiler.console.scope("op index"):
+            astcollector.outputStats(compiler.console)
+
         # Log execution summary
         successful = sum(1 for r in results.values() if r.success)
         total_time = sum(r.time for r in results.values() if hasattr(r, 'time'))
@@ -205,12 +212,13 @@ def codeConditioning(compiler, prgm, firstPass, dumpStats=False):
     
     **Optimization Sequence:**
     1. Method call optimization (first pass only)
-    2. Lifetime analysis
-    3. Simplification (constant folding, DCE)
-    4. Code cloning (first pass only)
-    5. Argument normalization (first pass only)
-    6. Program culling (first pass only)
-    7. Store elimination
+    2. Local coalescing (last pass only, if config.coalesceLocals)
+    3. Lifetime analysis
+    4. Simplification (constant folding, DCE)
+    5. Code cloning (first pass only)
+    6. Argument normalization (first pass only)
+    7. Program culling (first pass only)
+    8. Store elimination
     
     **Note:** Some optimizations are conditionally enabled/disabled:
     - Load elimination: Currently disabled
@@ -228,6 +236,11 @@ def codeConditioning(compiler, prgm, firstPass, dumpStats=False):
             # Try to identify and optimize method calls
             methodcall.evaluate(compiler, prgm)
 
+        if not firstPass and config.coalesceLocals:
+            # CPA is not run again, so the unioned annotations of the
+            # coalesced locals stay sound.
+            coalesce.evaluate(compiler, prgm)
+
         lifetimeanalysis.evaluate(compiler, prgm)
 
         if True:
@@ -381,6 +394,9 @@ def evaluate(compiler, prgm, name):
 
                 stats.contextStats(compiler, prgm, "secondpass")
 
+                with compiler.console.scope("op index"):
+                    astcollector.outputStats(compiler.console)
+
                 # errors.abort('test')
 
                 # Translation phase removed - now a static analysis framework
@@ -109,6 +109,11 @@ def _has_validation(context):
     """Check for validation patterns in context"""
     if not hasattr(context, 'node') or not context.node:
         return False
+    # Several tests ask about the same node, so the answer is shared.
+    return context.derived("has_validation", _find_validation)
+
+
+def _find_validation(context):
     parent = getattr(context.node, '_bandit_parent', None)
     if isinstance(parent, ast.If):
         test = parent.test
@@ -16,10 +16,16 @@ methods, and modules that are known to have security implications.
 **Pattern Matching:**
 Blacklist items support both exact matches and wildcard patterns (using
 fnmatch), allowing flexible matching of function/module names.
+
+**Lookup:**
+Each blacklist is compiled once into a BlacklistTrie keyed by dotted name
+segments, so a lookup costs one step per segment of the qualified name
+rather than one pattern test per blacklist entry.
 """
 
 import fnmatch
 import logging
+import re
 from . import issue
 
 LOG = logging.getLogger(__name__)
@@ -94,7 +100,7 @@ class BlacklistItem:
         Returns:
             True if matches, False otherwise
         """
-        return fnmatch.fnmatch(qualname, pattern) if "*" in pattern else qualname == pattern
+        return fnmatch.fnmatch(qualname, pattern) if _is_wildcard(pattern) else qualname == pattern
 
     def create_issue(self, context, qualname):
         """
@@ -122,6 +128,125 @@ class BlacklistItem:
         )
 
 
+def _is_wildcard(pattern):
+    # Only "*" makes a pattern a wildcard, "?" and "[" alone are literal.
+    return "*" in pattern
+
+
+def _has_fnmatch_syntax(segment):
+    return "*" in segment or "?" in segment or "[" in segment
+
+
+class _TrieNode:
+    __slots__ = ("children", "items", "wildcards", "wildcard_re")
+
+    def __init__(self):
+        self.children = {}
+        self.items = []
+        # (regex, index, item) for patterns whose remaining segments contain
+        # a wildcard, and one regex matching any of them.
+        self.wildcards = []
+        self.wildcard_re = None
+
+
+class BlacklistTrie:
+    """
+    Dotted-name trie compiled from a list of blacklist items.
+    
+    Exact patterns are stored at the trie node for their last segment.  A
+    wildcard pattern is stored at the node for its literal leading segments,
+    with the rest of the pattern compiled to a regex.  Every node also keeps
+    one combined regex for its wildcard patterns, so a lookup only tries the
+    individual patterns when one of them can match.
+    
+    **Matching:**
+    Wildcards follow fnmatch semantics: "*" may also match dots, so
+    "pickle.*" matches "pickle.loads" and "pickle.x.loads".  As in
+    BlacklistItem.matches, only a pattern containing "*" is a wildcard.
+    
+    Attributes:
+        items: The blacklist items the trie was compiled from
+        size: Number of items when the trie was compiled
+        root: Root trie node
+    """
+
+    def __init__(self, items):
+        """
+        Compile a trie from blacklist items.
+        
+        Args:
+            items: List of BlacklistItem objects, in priority order
+        """
+        self.items = items
+        self.size = len(items)
+        self.root = _TrieNode()
+
+        for index, item in enumerate(items):
+            for pattern in item.qualnames:
+                self._insert(pattern, index, item)
+        self._compile(self.root)
+
+    def _insert(self, pattern, index, item):
+        node = self.root
+        segments = pattern.split(".")
+        wildcard = _is_wildcard(pattern)
+        for i, segment in enumerate(segments):
+            # In a wildcard pattern "?" and "[" are fnmatch syntax as well.
+            if wildcard and _has_fnmatch_syntax(segment):
+                rest = ".".join(segments[i:])
+                regex = re.compile(fnmatch.translate(rest))
+                node.wildcards.append((regex, index, item))
+                return
+            node = node.children.setdefault(segment, _TrieNode())
+        node.items.append((index, item))
+
+    def _compile(self, node):
+        if node.wildcards:
+            combined = "|".join("(?:%s)" % regex.pattern for regex, index, item in node.wildcards)
+            node.wildcard_re = re.compile(combined)
+        for child in node.children.values():
+            self._compile(child)
+
+    def _match_wildcards(self, node, rest):
+        if not node.wildcard_re.match(rest):
+            return []
+        return [(index, item) for regex, index, item in node.wildcards if regex.match(rest)]
+
+    def lookup(self, qualname):
+        """
+        Find every blacklist item matching a qualified name.
+        
+        Args:
+            qualname: Qualified name to check (e.g., "pickle.loads")
+            
+        Returns:
+            List of matching BlacklistItem objects, in blacklist order
+        """
+        segments = qualname.split(".")
+        found = []
+        node = self.root
+        for i, segment in enumerate(segments):
+            if node.wildcard_re is not None:
+                found.extend(self._match_wildcards(node, ".".join(segments[i:])))
+            node = node.children.get(segment)
+            if node is None:
+                break
+        else:
+            # A wildcard pattern needs a dot after its literal segments, so
+            # only exact patterns end at the last node.
+            found.extend(node.items)
+
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+
+        # An item with several matching patterns is reported once.
+        result = []
+        for index, item in found:
+            if not result or result[-1] is not item:
+                result.append(item)
+        return result
+
+
 class BlacklistManager:
     """
     Manages blacklist items for different node types.
@@ -141,11 +266,13 @@ class BlacklistManager:
     
     Attributes:
         blacklists: Dictionary mapping node types to lists of BlacklistItem
+        tries: Dictionary mapping node types to their compiled BlacklistTrie
     """
     
     def __init__(self):
         """Initialize the blacklist manager and load all blacklists."""
         self.blacklists = {"Call": [], "Import": [], "ImportFrom": []}
+        self.tries = {}
         self._load_blacklists()
 
     def _load_blacklists(self):
@@ -312,12 +439,45 @@ class BlacklistManager:
         """
         return self.blacklists.get(node_type, [])
 
+    def get_trie(self, node_type):
+        """
+        Get the compiled trie for a node type.
+        
+        The trie is compiled on first use, and again if the blacklist for the
+        node type has been replaced or grown since.
+        
+        Args:
+            node_type: Node type ("Call", "Import", or "ImportFrom")
+            
+        Returns:
+            BlacklistTrie for that node type
+        """
+        items = self.get_blacklist_items(node_type)
+        trie = self.tries.get(node_type)
+        if trie is None or trie.items is not items or trie.size != len(items):
+            trie = BlacklistTrie(items)
+            self.tries[node_type] = trie
+        return trie
+
+    def get_matching_items(self, node_type, qualname):
+        """
+        Get every blacklist item matching a qualified name.
+        
+        Args:
+            node_type: Node type ("Call", "Import", or "ImportFrom")
+            qualname: Qualified name to check
+            
+        Returns:
+            List of matching BlacklistItem objects, in blacklist order
+        """
+        return self.get_trie(node_type).lookup(qualname)
+
     def check_blacklist(self, node_type, qualname, context):
         """
         Check if a qualified name is blacklisted.
         
-        Tests the qualified name against all blacklist items for the
-        given node type. Returns the first matching issue found.
+        Looks the qualified name up in the compiled trie for the given
+        node type. Returns the issue for the first matching item.
         
         Args:
             node_type: Node type ("Call", "Import", or "ImportFrom")
@@ -327,11 +487,8 @@ class BlacklistManager:
         Returns:
             Issue object if blacklisted, None otherwise
         """
-        items = self.get_blacklist_items(node_type)
-        for item in items:
-            if item.matches(qualname):
-                return item.create_issue(context, qualname)
-        return None
+        items = self.get_matching_items(node_type, qualname)
+        return items[0].create_issue(context, qualname) if items else None
 
 
 # Global blacklist manager instance (singleton)
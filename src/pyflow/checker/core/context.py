@@ -17,6 +17,11 @@ call information, imports, file information, and more.
 Security tests receive a Context object that provides easy access to
 relevant information without needing to know the internal dictionary
 structure.
+
+**Derived Fields:**
+The tests for a node share one Context, so fields derived from the node
+(call arguments, keywords, or checker-specific facts via derived()) are
+computed on first use and reused by the remaining tests.
 """
 
 import ast
@@ -44,6 +49,7 @@ class Context:
     
     Attributes:
         _context: Internal context dictionary
+        _derived: Dictionary of derived fields computed so far
     """
     def __init__(self, context_object=None):
         """
@@ -54,6 +60,22 @@ class Context:
                           or None for empty context
         """
         self._context = context_object or {}
+        self._derived = {}
+
+    def derived(self, key, compute):
+        """
+        Get a field derived from the context, computing it on first use.
+        
+        Args:
+            key: Name of the derived field
+            compute: Function taking this Context and returning the value
+            
+        Returns:
+            The value of the derived field
+        """
+        if key not in self._derived:
+            self._derived[key] = compute(self)
+        return self._derived[key]
 
     def __repr__(self):
         return f"<Context {self._context}>"
@@ -69,6 +91,9 @@ class Context:
         Returns:
             List of argument values (or attribute names if not literal)
         """
+        return self.derived("call_args", Context._compute_call_args)
+
+    def _compute_call_args(self):
         if "call" not in self._context or not hasattr(self._context["call"], "args"):
             return []
         return [arg.attr if hasattr(arg, "attr") else self._get_literal_value(arg) 
@@ -114,6 +139,9 @@ class Context:
         Returns:
             Dictionary mapping argument names to values, or None if not a call
         """
+        return self.derived("call_keywords", Context._compute_call_keywords)
+
+    def _compute_call_keywords(self):
         if "call" not in self._context or not hasattr(self._context["call"], "keywords"):
             return None
         return {li.arg: (li.value.attr if hasattr(li.value, "attr") else self._get_literal_value(li.value))
@@ -13,6 +13,8 @@ class Metrics:
         self.issues = 0
         self.issues_by_severity = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
         self.issues_by_confidence = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
+        self.test_time = {}
+        self.test_runs = {}
 
     def begin(self, filename):
         """Begin processing a file"""
@@ -48,6 +50,16 @@ class Metrics:
         """Note a skipped test"""
         self.skipped += 1
 
+    def note_test_time(self, name, elapsed):
+        """Note the time one run of a test took"""
+        self.test_time[name] = self.test_time.get(name, 0.0) + elapsed
+        self.test_runs[name] = self.test_runs.get(name, 0) + 1
+
+    def slowest_tests(self, count=10):
+        """Get (name, seconds, runs) for the tests that took longest overall"""
+        names = sorted(self.test_time, key=self.test_time.get, reverse=True)[:count]
+        return [(name, self.test_time[name], self.test_runs[name]) for name in names]
+
     def aggregate(self):
         """Aggregate final metrics"""
         LOG.debug("Final metrics: %s", self.__dict__)
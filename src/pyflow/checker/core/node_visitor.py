@@ -23,6 +23,12 @@ node type. For each node, it:
 **Security Testing:**
 Tests are organized by node type and run through the SecurityTester,
 which executes registered security checks and collects issues.
+
+**Dispatch:**
+The visitor method and the applicable check types are looked up once per
+AST node class.  Nodes of a class with no tests and no bookkeeping are
+traversed without building a context, and context fields that are costly
+to derive (the line range) are only computed when a test asks for them.
 """
 
 import ast
@@ -35,6 +41,35 @@ from . import utils as b_utils
 
 LOG = logging.getLogger(__name__)
 
+# Visitors that track the namespace and imports, and must run even if no
+# test checks their node type.
+BOOKKEEPING_VISITORS = frozenset(["ClassDef", "FunctionDef", "Import", "ImportFrom"])
+
+# Context fields computed on first access.
+LAZY_FIELDS = {"linerange": lambda context: b_utils.linerange(context["node"])}
+
+
+class NodeContext(dict):
+    """
+    Raw context dictionary for a node, with lazily derived fields.
+    
+    Fields in LAZY_FIELDS are computed from the rest of the context the
+    first time they are read, then stored like any other field.
+    """
+
+    def __missing__(self, key):
+        compute = LAZY_FIELDS.get(key)
+        if compute is None:
+            raise KeyError(key)
+        value = self[key] = compute(self)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
 
 class SecurityNodeVisitor:
     """
@@ -75,6 +110,7 @@ class SecurityNodeVisitor:
         namespace: Current qualified namespace (module.class.function)
         metrics: Metrics collector for statistics
         context: Current context dictionary (updated per node)
+        dispatch: Dictionary mapping AST node classes to (visitor, active)
     """
     def __init__(self, fname, fdata, testset, debug, nosec_lines, metrics):
         """
@@ -98,6 +134,7 @@ class SecurityNodeVisitor:
         self.imports = set()
         self.import_aliases = {}
         self.tester = b_tester.SecurityTester(self.testset, self.debug, nosec_lines, metrics)
+        self.dispatch = {}
 
         # Try to determine module qualified name from file path
         try:
@@ -258,11 +295,10 @@ class SecurityNodeVisitor:
         Returns:
             True (always continues traversal)
         """
-        self.context = {
-            "imports": self.imports, "import_aliases": self.import_aliases,
-            "node": node, "linerange": b_utils.linerange(node),
-            "filename": self.fname, "file_data": self.fdata
-        }
+        self.context = NodeContext(
+            imports=self.imports, import_aliases=self.import_aliases,
+            node=node, filename=self.fname, file_data=self.fdata
+        )
         
         # Add location information if available
         if hasattr(node, "lineno"):
@@ -279,6 +315,27 @@ class SecurityNodeVisitor:
         LOG.debug(self.context)
         return True
 
+    def get_dispatch(self, node_class):
+        """
+        Get the visitor method for an AST node class, and whether it is active.
+        
+        A node class is active if tests check it or its visitor does
+        bookkeeping.  Inactive nodes are traversed without a context.
+        
+        Args:
+            node_class: AST node class
+            
+        Returns:
+            Tuple of (visitor method or None, active)
+        """
+        entry = self.dispatch.get(node_class)
+        if entry is None:
+            name = node_class.__name__
+            visitor = getattr(self, f"visit_{name}", None)
+            active = name in BOOKKEEPING_VISITORS or bool(self.testset.get_node_checktypes(node_class))
+            entry = self.dispatch[node_class] = (visitor, active)
+        return entry
+
     def visit(self, node):
         """
         Visit a node and run appropriate security tests.
@@ -289,11 +346,10 @@ class SecurityNodeVisitor:
         Args:
             node: AST node to visit
         """
-        method = f"visit_{node.__class__.__name__}"
-        visitor = getattr(self, method, None)
+        visitor, active = self.get_dispatch(node.__class__)
         if visitor:
             if self.debug:
-                LOG.debug("%s called (%s)", method, ast.dump(node))
+                LOG.debug("%s called (%s)", visitor.__name__, ast.dump(node))
             visitor(node)
         else:
             # No specific visitor, run generic tests for this node type
@@ -322,10 +378,8 @@ class SecurityNodeVisitor:
         This is the main traversal driver. It iterates over all fields of
         the node, and for each AST child node:
         1. Sets parent/sibling references (for context)
-        2. Calls pre_visit to set up context
-        3. Calls visit to run security tests
-        4. Recursively visits children
-        5. Calls post_visit to clean up
+        2. Calls visit_child, which (for active node classes) calls
+           pre_visit, visit, generic_visit and post_visit in turn
         
         The parent/sibling references are used by some security tests to
         understand the context in which a node appears.
@@ -341,18 +395,29 @@ class SecurityNodeVisitor:
                         # Set parent and sibling references for context
                         item._bandit_sibling = value[idx + 1] if idx < len(value) - 1 else None
                         item._bandit_parent = node
-                        if self.pre_visit(item):
-                            self.visit(item)
-                            self.generic_visit(item)
-                            self.post_visit(item)
+                        self.visit_child(item)
             elif isinstance(value, ast.AST):
                 # Handle single child node
                 value._bandit_sibling = None
                 value._bandit_parent = node
-                if self.pre_visit(value):
-                    self.visit(value)
-                    self.generic_visit(value)
-                    self.post_visit(value)
+                self.visit_child(value)
+
+    def visit_child(self, node):
+        """
+        Visit a child node and its subtree.
+        
+        Nodes of an inactive class (see get_dispatch) are only traversed.
+        
+        Args:
+            node: AST node to visit
+        """
+        visitor, active = self.get_dispatch(node.__class__)
+        if not active:
+            self.generic_visit(node)
+        elif self.pre_visit(node):
+            self.visit(node)
+            self.generic_visit(node)
+            self.post_visit(node)
 
     def update_scores(self, scores):
         """
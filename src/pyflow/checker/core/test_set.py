@@ -5,12 +5,16 @@ from . import test_loader
 
 LOG = logging.getLogger(__name__)
 
+# Check types that are run on a node class other than their own.
+NODE_CHECKTYPES = {"Constant": ("Str", "Bytes")}
+
 
 class SecurityTestSet:
     def __init__(self, config, profile):
         self.config = config
         self.profile = profile
         self.tests = {}
+        self._node_checktypes = {}
         self._load_tests()
 
     def _load_tests(self):
@@ -22,10 +26,21 @@ class SecurityTestSet:
         """Get tests for a specific check type"""
         return self.tests.get(checktype, [])
 
+    def get_node_checktypes(self, node_class):
+        """Get the check types with tests that apply to an AST node class"""
+        checktypes = self._node_checktypes.get(node_class)
+        if checktypes is None:
+            name = node_class.__name__
+            candidates = NODE_CHECKTYPES.get(name, (name,))
+            checktypes = tuple(checktype for checktype in candidates if self.tests.get(checktype))
+            self._node_checktypes[node_class] = checktypes
+        return checktypes
+
     def add_test(self, test_func):
         """Add a test function to the test set"""
         if not hasattr(test_func, "_checks"):
             return
+        self._node_checktypes.clear()
 
         for check_type in test_func._checks:
             if check_type not in self.tests:
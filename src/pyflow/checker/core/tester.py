@@ -7,14 +7,14 @@ and nosec (no security) comment handling.
 
 **Test Execution Flow:**
 1. Get tests for the node type from testset
-2. For each test:
-   - Create a Context wrapper
-   - Execute the test function
+2. Create one Context wrapper, shared by the tests of the node
+3. For each test:
+   - Execute and time the test function
    - Handle results (single Issue or list of Issues)
    - Check for nosec comments
    - Annotate issues with file/location information
    - Calculate scores
-3. Return aggregated scores
+4. Return aggregated scores
 
 **Nosec Handling:**
 The tester respects # nosec comments that allow developers to suppress
@@ -23,8 +23,8 @@ specific security warnings. Nosec comments can be:
 - General: # nosec (suppress all tests on this line)
 """
 
-import copy
 import logging
+import time
 from . import constants
 from . import context as b_context
 from . import utils
@@ -82,13 +82,13 @@ class SecurityTester:
         Run all security tests for a specific node type.
         
         Executes all tests registered for the given checktype (e.g., "Call",
-        "Import", "Str"). For each test:
-        1. Creates a Context wrapper
-        2. Executes the test function
-        3. Processes results (handles both single and multiple issues)
-        4. Checks nosec comments
-        5. Annotates issues with file/location information
-        6. Calculates scores
+        "Import", "Str"). The tests share one Context wrapper, so derived
+        fields are computed once per node. For each test:
+        1. Executes and times the test function
+        2. Processes results (handles both single and multiple issues)
+        3. Checks nosec comments
+        4. Annotates issues with file/location information
+        5. Calculates scores
         
         Args:
             raw_context: Raw context dictionary from visitor
@@ -103,16 +103,20 @@ class SecurityTester:
         }
 
         tests = self.testset.get_tests(checktype)
+        # The raw context is built per node, so the tests can share it
+        temp_context = raw_context
+        context = b_context.Context(temp_context)
         for test in tests:
             name = test.__name__
-            # Execute test with an instance of the context class
-            temp_context = copy.copy(raw_context)
-            context = b_context.Context(temp_context)
             try:
-                if hasattr(test, "_config"):
-                    result = test(context, test._config)
-                else:
-                    result = test(context)
+                start = time.perf_counter()
+                try:
+                    if hasattr(test, "_config"):
+                        result = test(context, test._config)
+                    else:
+                        result = test(context)
+                finally:
+                    self.metrics.note_test_time(name, time.perf_counter() - start)
 
                 if result is not None:
                     # Handle both single issues and lists of issues
@@ -200,6 +204,10 @@ class SecurityTester:
         Returns:
             Set of test IDs to skip, or None if no nosec comments found
         """
+        # Without nosec comments there is no need for the line range
+        if not self.nosec_lines:
+            return None
+
         nosec_tests_to_skip = set()
         # Get nosec tests from the issue's line number
         base_tests = (
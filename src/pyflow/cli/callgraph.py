@@ -5,9 +5,6 @@ CLI functionality for call graph analysis.
 import sys
 from pathlib import Path
 
-from pyflow.analysis.callgraph.ast_based import analyze_file as analyze_file_ast
-from pyflow.analysis.callgraph.pycg_based import analyze_file_pycg
-
 
 def run_callgraph(input_path, args):
     """Build and visualize call graphs from Python code."""
@@ -18,9 +15,13 @@ def run_callgraph(input_path, args):
 
         # Generate call graph analysis based on selected algorithm
         if args.algorithm == "simple":
+            from pyflow.analysis.callgraph.ast_based import analyze_file as analyze_file_ast
+
             output = analyze_file_ast(str(input_path))
         elif args.algorithm == "pycg":
             # Use the PyCG-based algorithm
+            from pyflow.analysis.callgraph.pycg_based import analyze_file_pycg
+
             try:
                 output = analyze_file_pycg(str(input_path), args.verbose)
             except ImportError:
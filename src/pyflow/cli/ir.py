@@ -11,18 +11,8 @@ import fnmatch
 from pathlib import Path
 import argparse
 
-from pyflow.application.context import CompilerContext
-from pyflow.application.program import Program
-from pyflow.application.pipeline import evaluate
-from pyflow.frontend.programextractor import extractProgram, Extractor
-from pyflow.util.application.console import Console
-from pyflow.analysis.cfg import transform, dump as cfg_dump, ssa
-from pyflow.analysis.cfg.dump import generate_clang_style_cfg
-from pyflow.analysis.cdg import construct_cdg, dump_cdg
-from pyflow.analysis.ddg import construction, dump as ddg_dump
-from pyflow.analysis.dataflowIR import convert
-from pyflow.analysis.programculler import findLiveCode
-import pyflow.util.pydot as pydot
+# The analysis stack is imported inside the dump functions so that building
+# the argument parser stays cheap; see SubCommand in main.py.
 
 
 def add_ir_parser(subparsers):
@@ -96,6 +86,10 @@ def dump_ir(compiler, liveCode, function_name: str, output_dir: str, ir_type: st
         return False
 
     def _dump_impl():
+        from pyflow.analysis.cfg import transform, dump as cfg_dump, ssa
+        from pyflow.analysis.cfg.dump import generate_clang_style_cfg
+        import pyflow.util.pydot as pydot
+
         os.makedirs(output_dir, exist_ok=True)
         output_file = os.path.join(output_dir, f"{function_name}_{ir_type.lower()}.{format}")
 
@@ -171,6 +165,9 @@ def _dump_graph_ir(compiler, liveCode, function_name: str, output_dir: str, form
         base_structure = builder_func(compiler, func)
 
         # Construct and dump the graph IR
+        from pyflow.analysis.cdg import construct_cdg
+        from pyflow.analysis.ddg import construction
+
         graph_ir = construct_cdg(base_structure) if ir_name == "CDG" else construction.construct_ddg(base_structure)
         dump_func(graph_ir, output_file, format, function_name)
         print(f"{ir_name} dumped to: {output_file}")
@@ -185,12 +182,18 @@ def _dump_graph_ir(compiler, liveCode, function_name: str, output_dir: str, form
 
 def dump_cdg_func(compiler, liveCode, function_name: str, output_dir: str, format: str = "text", program=None):
     """Dump the Control Dependence Graph for a specific function."""
+    from pyflow.analysis.cfg import transform
+    from pyflow.analysis.cdg import dump_cdg
+
     return _dump_graph_ir(compiler, liveCode, function_name, output_dir, format,
                          lambda c, f: transform.evaluate(c, f), dump_cdg, "CDG", program)
 
 
 def dump_ddg(compiler, liveCode, function_name: str, output_dir: str, format: str = "text", program=None):
     """Dump the Data Dependence Graph for a specific function."""
+    from pyflow.analysis.ddg import dump as ddg_dump
+    from pyflow.analysis.dataflowIR import convert
+
     return _dump_graph_ir(compiler, liveCode, function_name, output_dir, format,
                          convert.evaluateCode, ddg_dump.dump_ddg, "DDG", program)
 
@@ -251,6 +254,13 @@ def create_interface_from_paths(python_files, args):
 
 def run_ir_dump(input_path: Path, args):
     """Run IR dumping for the specified function."""
+    from pyflow.application.context import CompilerContext
+    from pyflow.application.program import Program
+    from pyflow.application.pipeline import evaluate
+    from pyflow.frontend.programextractor import extractProgram, Extractor
+    from pyflow.util.application.console import Console
+    from pyflow.analysis.programculler import findLiveCode
+
     try:
         if input_path.is_file():
             python_files = [input_path]
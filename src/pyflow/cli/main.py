@@ -7,27 +7,58 @@ operations.
 
 import sys
 import argparse
+import importlib
 from pathlib import Path
 
 # Add the src directory to the path so we can import pyflow modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from .optimize import run_analysis, list_optimization_passes, add_optimize_parser
-from .ir import run_ir_dump, add_ir_parser
-from .security import run_security_analysis, add_security_parser
-from . import callgraph
 
+class SubCommand(object):
+    """Lightweight descriptor for a CLI subcommand.
 
-
-def main():
-    """Main entry point for the PyFlow CLI.
-    
-    Parses command-line arguments and dispatches to appropriate sub-commands
-    for optimization, call graph analysis, IR dumping, and security analysis.
-    
-    Returns:
-        int: Exit code (0 for success, non-zero for error).
+    Only the module and function names are recorded here. The command module
+    is imported when the parser is built (command modules keep their
+    top-level imports cheap), while the analysis stack behind the handler is
+    only imported once the command is actually dispatched.
     """
+
+    __slots__ = "name", "module", "setup", "handler"
+
+    def __init__(self, name, module, setup, handler):
+        self.name = name
+        self.module = module
+        self.setup = setup
+        self.handler = handler
+
+    def load(self):
+        return importlib.import_module(self.module, __package__)
+
+    def add_parser(self, subparsers):
+        return getattr(self.load(), self.setup)(subparsers)
+
+    def get_handler(self):
+        return getattr(self.load(), self.handler)
+
+
+COMMANDS = (
+    SubCommand("optimize", ".optimize", "add_optimize_parser", "run_analysis"),
+    SubCommand("callgraph", ".callgraph", "add_callgraph_parser", "run_callgraph"),
+    SubCommand("ir", ".ir", "add_ir_parser", "run_ir_dump"),
+    SubCommand("security", ".security", "add_security_parser", "run_security_analysis"),
+)
+
+
+def lookup_command(name):
+    """Return the registered SubCommand called name, or None."""
+    for command in COMMANDS:
+        if command.name == name:
+            return command
+    return None
+
+
+def build_parser():
+    """Build the top-level argument parser with all registered subcommands."""
     parser = argparse.ArgumentParser(
         description="PyFlow - A static compiler for Python", prog="pyflow"
     )
@@ -38,23 +69,27 @@ def main():
         dest="command", help="Available commands", required=True
     )
 
-    # Optimization command - use the modular parser
-    add_optimize_parser(subparsers)
+    for command in COMMANDS:
+        command.add_parser(subparsers)
+
+    return parser
+
 
-    # Call graph command - use the modular parser
-    callgraph.add_callgraph_parser(subparsers)
+def main():
+    """Main entry point for the PyFlow CLI.
     
-    # IR dumping command - use the modular parser
-    add_ir_parser(subparsers)
+    Parses command-line arguments and dispatches to appropriate sub-commands
+    for optimization, call graph analysis, IR dumping, and security analysis.
     
-    # Security analysis command - use the modular parser
-    add_security_parser(subparsers)
-
+    Returns:
+        int: Exit code (0 for success, non-zero for error).
+    """
+    parser = build_parser()
     args = parser.parse_args()
 
     # Handle special commands that don't require input
     if args.command == "optimize" and hasattr(args, "list_opt_passes") and args.list_opt_passes:
-        list_optimization_passes()
+        lookup_command("optimize").load().list_optimization_passes()
         return 0
 
     # Get input path based on command
@@ -82,18 +117,19 @@ def main():
         sys.exit(1)
 
     # Dispatch to appropriate command
-    if args.command == "optimize":
-        run_analysis(input_path, args)
-    elif args.command == "callgraph":
-        return callgraph.run_callgraph(input_path, args)
-    elif args.command == "ir":
-        run_ir_dump(input_path, args)
-    elif args.command == "security":
-        return run_security_analysis(args.targets, args)
-    else:
+    command = lookup_command(args.command)
+    if command is None:
         parser.print_help()
         sys.exit(1)
 
+    handler = command.get_handler()
+    if args.command == "security":
+        return handler(args.targets, args)
+    elif args.command == "callgraph":
+        return handler(input_path, args)
+    else:
+        handler(input_path, args)
+
 
 if __name__ == "__main__":
     main()
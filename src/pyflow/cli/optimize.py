@@ -5,11 +5,8 @@ import os
 import fnmatch
 from pathlib import Path
 
-from pyflow.application.context import CompilerContext
-from pyflow.application.program import Program
-from pyflow.application.pipeline import evaluate
-from pyflow.frontend.programextractor import extractProgram
-from pyflow.util.application.console import Console
+# The analysis stack is imported inside the command handlers so that building
+# the argument parser stays cheap; see SubCommand in main.py.
 
 # Constants
 OPTIMIZATION_PASSES = {
@@ -74,6 +71,12 @@ def list_optimization_passes():
     
 def run_analysis(input_path, args):
     """Run PyFlow analysis on the input path (file or directory)."""
+    from pyflow.application.context import CompilerContext
+    from pyflow.application.program import Program
+    from pyflow.application.pipeline import evaluate
+    from pyflow.frontend.programextractor import extractProgram
+    from pyflow.util.application.console import Console
+
     try:
         # Get Python files to analyze
         if input_path.is_file():
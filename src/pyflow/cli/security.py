@@ -5,9 +5,6 @@ import argparse
 import logging
 import sys
 
-from pyflow.checker.core.manager import SecurityManager
-from pyflow.checker.core.config import SecurityConfig
-
 
 def add_security_parser(subparsers):
     """Add security subcommand parser."""
@@ -43,6 +40,9 @@ def add_security_parser(subparsers):
 
 def run_security_analysis(targets, args):
     """Main CLI entry point"""
+    from pyflow.checker.core.manager import SecurityManager
+    from pyflow.checker.core.config import SecurityConfig
+
     # args is already parsed by the main CLI parser
     
     # Set up logging
@@ -67,6 +67,11 @@ def run_security_analysis(targets, args):
     # Run security checks
     manager.run_tests()
     
+    if args.verbose:
+        print("Slowest rules:")
+        for name, seconds, runs in manager.metrics.slowest_tests():
+            print(f"  {name:<45} {seconds * 1000.0:8.2f} ms {runs:8d} runs")
+
     # Report results
     issues = manager.get_issue_list()
     
@@ -11,10 +11,35 @@ outputDirectory = os.path.normpath(os.path.join(base, "..", "summaries"))
 
 doDump = False
 maskDumpErrors = False
+
+# Report pages are rendered by this many forked workers (0 = one per CPU).
+dumpWorkers = 1
+# Render the invocation graph with Graphviz while the pages are written.
+dumpGraphs = False
 doThreadCleanup = False
 
 dumpStats = False
 
+# Inlining may grow the live program by this fraction of its ops
+# (None = inline everything feasible).
+inlineGrowth = 0.5
+
+
+# CPA contexts per code before new signatures are widened (None = unbounded).
+cpaContextBudget = 64
+# "params" widens parameter types to Any, "path" also drops the call path.
+cpaContextWidening = "params"
+# Order of the CPA constraint worklist, "scc" (topological) or "fifo".
+cpaWorklist = "scc"
+
+# IPA type splits past this many types become megamorphic (None = never).
+ipaSplitLimit = 4
+# "type" splits by exact CPA type, "base" regroups by base class at the limit.
+ipaSplitPolicy = "type"
+
+# Let temporaries with disjoint live ranges share locals once the last
+# analysis pass is done.
+coalesceLocals = True
 
 # Pointer analysis testing
 useXTypes = True
@@ -10,6 +10,7 @@ generation, focusing on inputs that explore new code paths.
 1. **Fuzzer** (`fuzzer.py`):
    - Main fuzzing engine with coverage tracking
    - Multiprocessing-based execution
+   - Parallel jobs (--jobs N) sharing an on-disk corpus directory
    - Memory and timeout management
 
 2. **Corpus** (`corpus.py`):
@@ -18,9 +19,9 @@ generation, focusing on inputs that explore new code paths.
    - Saves interesting inputs that increase coverage
 
 3. **Tracer** (`tracer.py`):
-   - Line-level code coverage tracking using sys.settrace
-   - Tracks coverage across file boundaries
-   - Provides coverage metrics
+   - Edge coverage in a fixed-size AFL-style map
+   - sys.monitoring on Python 3.12+, sys.settrace as a fallback
+   - New coverage detected against a virgin map
 
 4. **Dictionary** (`dictionnary.py`):
    - Optional dictionary of interesting keywords/tokens
@@ -29,6 +29,19 @@ The corpus implements 15 different mutation strategies:
 14. Replace uint32 with interesting value
 15. Replace ASCII digit with another digit
 
+**Seed Scheduling:**
+- uniform: every corpus input is picked with the same probability
+- weighted: inputs are picked proportionally to the number of edges they
+  were first to reach, discounted by their size (see seed_weight).  The
+  tracer stops instrumenting edges once they are seen, so per-edge hit
+  counts are not available; an edge first reached by an input stands in
+  for a rare one
+
+**Corpus Minimization:**
+minimize() keeps a subset of inputs that preserves every covered edge,
+using greedy weighted set cover (edges gained per byte). The fuzzer's
+merge mode replays the corpus to feed it and rewrites the directory.
+
 **Interesting Values:**
 Predefined sets of "interesting" values that often trigger edge cases:
 - INTERESTING8: Common 8-bit values (boundaries, powers of 2)
@@ -38,6 +51,8 @@ Predefined sets of "interesting" values that often trigger edge cases:
 
 import os
 import math
+import heapq
+import bisect
 import random
 import struct
 import hashlib
@@ -55,6 +70,64 @@ INTERESTING8 = [-128, -1, 0, 1, 16, 32, 64, 100, 127]
 INTERESTING16 = [0, 128, 255, 256, 512, 1000, 1024, 4096, 32767, 65535]
 INTERESTING32 = [0, 1, 32768, 65535, 65536, 100663045, 2147483647, 4294967295]
 
+# Input size at which the weighted schedule halves an input's weight
+SIZE_DISCOUNT = 64
+
+SCHEDULES = ('uniform', 'weighted')
+
+
+def seed_weight(buf, edges):
+    """
+    Weight of an input in the weighted seed schedule.
+
+    Args:
+        buf: The input
+        edges: Number of edges the input was first to reach
+
+    Returns:
+        edges, discounted by the input size
+    """
+    return edges * SIZE_DISCOUNT / (SIZE_DISCOUNT + len(buf))
+
+
+def minimize(edge_sets, sizes):
+    """
+    Choose a small subset of inputs covering all edges of all inputs.
+
+    Greedy weighted set cover: repeatedly keep the input with the most
+    not-yet-covered edges per byte. Gains only shrink as edges get covered,
+    so candidates are re-evaluated lazily from a heap.
+
+    Args:
+        edge_sets: Per input, the set of edges it covers
+        sizes: Per input, its size in bytes
+
+    Returns:
+        Sorted indices of the inputs to keep
+    """
+    def priority(gain, i):
+        # Most edges per byte first; smaller, then earlier, inputs win ties
+        return (-gain / (sizes[i] + 1.0), sizes[i], i)
+
+    heap = [priority(len(edges), i) for i, edges in enumerate(edge_sets) if edges]
+    heapq.heapify(heap)
+
+    covered = set()
+    keep = []
+    while heap:
+        _, _, i = heapq.heappop(heap)
+        gain = len(edge_sets[i] - covered)
+        if not gain:
+            continue
+        current = priority(gain, i)
+        if heap and heap[0] < current:
+            # Stale gain; re-queue with the up-to-date priority
+            heapq.heappush(heap, current)
+            continue
+        covered |= edge_sets[i]
+        keep.append(i)
+    return sorted(keep)
+
 
 class Corpus(object):
     """
@@ -84,8 +157,13 @@ class Corpus(object):
         _seed_run_finished: Whether seed phase is complete
         _seed_idx: Current index in seed phase
         _save_corpus: Whether to save interesting inputs to disk
+        _known: File names already present in the corpus directory
+        _pending: Inputs synced from other jobs, not yet executed
+        _schedule: Seed schedule, one of SCHEDULES
+        _cum_weights: Cumulative seed weights, parallel to _inputs
+            (weighted schedule only)
     """
-    def __init__(self, dirs=None, max_input_size=4096, dict_path=None):
+    def __init__(self, dirs=None, max_input_size=4096, dict_path=None, schedule='uniform'):
         """
         Initialize a fuzzing corpus.
         
@@ -94,8 +172,15 @@ class Corpus(object):
                  First directory is used to save generated test cases.
             max_input_size: Maximum size in bytes for generated inputs
             dict_path: Path to dictionary file (optional)
+            schedule: How seeds are picked for mutation ('uniform' or 'weighted')
         """
+        if schedule not in SCHEDULES:
+            raise ValueError('unknown seed schedule: {}'.format(schedule))
+        self._schedule = schedule
+        self._cum_weights = []
         self._inputs = []
+        self._known = set()
+        self._pending = []
         self._dict = dictionnary.Dictionary(dict_path)
         self._max_input_size = max_input_size
         self._dirs = dirs if dirs else []
@@ -114,6 +199,7 @@ class Corpus(object):
                     fname = os.path.join(path, i)
                     if os.path.isfile(fname):
                         self._add_file(fname)
+                        self._known.add(fname)
         
         # Seed phase tracking
         self._seed_run_finished = not self._inputs
@@ -121,7 +207,7 @@ class Corpus(object):
         self._save_corpus = dirs and os.path.isdir(dirs[0])
         
         # Always start with empty input
-        self._inputs.append(bytearray(0))
+        self._append(bytearray(0), 1)
 
     def _add_file(self, path):
         """
@@ -131,13 +217,37 @@ class Corpus(object):
             path: Path to file to load
         """
         with open(path, 'rb') as f:
-            self._inputs.append(bytearray(f.read()))
+            self._append(bytearray(f.read()), 1)
+
+    def _append(self, buf, edges):
+        """Add an input credited with reaching edges new edges."""
+        self._inputs.append(buf)
+        if self._schedule == 'weighted':
+            total = self._cum_weights[-1] if self._cum_weights else 0.0
+            self._cum_weights.append(total + seed_weight(buf, edges))
+
+    @property
+    def inputs(self):
+        """Get the distinct inputs currently in the corpus."""
+        seen = set()
+        result = []
+        for buf in self._inputs:
+            key = bytes(buf)
+            if key not in seen:
+                seen.add(key)
+                result.append(buf)
+        return result
 
     @property
     def length(self):
         """Get the number of inputs in the corpus."""
         return len(self._inputs)
 
+    @property
+    def max_length(self):
+        """Get the size of the largest input in the corpus."""
+        return max(map(len, self._inputs))
+
     @staticmethod
     def _rand(n):
         """
@@ -222,7 +332,7 @@ class Corpus(object):
         byte_to_copy = min(end_source-start_source, end_dst-start_dst)
         dst[start_dst:start_dst+byte_to_copy] = src[start_source:start_source+byte_to_copy]
 
-    def put(self, buf):
+    def put(self, buf, edges=1):
         """
         Add an input to the corpus (if it increased coverage).
         
@@ -232,30 +342,105 @@ class Corpus(object):
         
         Args:
             buf: Bytearray input to add
+            edges: Number of edges the input was first to reach (used by
+                the weighted seed schedule)
         """
-        self._inputs.append(buf)
+        self._append(buf, edges)
         if self._save_corpus:
-            m = hashlib.sha256()
-            m.update(buf)
-            fname = os.path.join(self._dirs[0], m.hexdigest())
-            with open(fname, 'wb') as f:
+            self._save(buf)
+
+    def _save(self, buf):
+        """Write buf to the corpus directory, named by its SHA256."""
+        m = hashlib.sha256()
+        m.update(buf)
+        fname = os.path.join(self._dirs[0], m.hexdigest())
+        if fname not in self._known:
+            self._known.add(fname)
+            # Write then rename, so jobs syncing the directory never
+            # read a partial file.
+            tmp = os.path.join(self._dirs[0], '.tmp-%d-%s' % (os.getpid(), m.hexdigest()))
+            with open(tmp, 'wb') as f:
                 f.write(buf)
+            os.replace(tmp, fname)
+        return fname
+
+    def rewrite(self, inputs):
+        """
+        Replace the contents of the corpus directory with inputs.
+
+        Used by corpus minimization. Files of the other seed directories
+        are left untouched.
+
+        Args:
+            inputs: Inputs to keep
+
+        Returns:
+            Number of files removed from the corpus directory
+        """
+        if not self._save_corpus:
+            raise ValueError('corpus minimization needs a corpus directory')
+        keep = set(self._save(buf) for buf in inputs)
+        removed = 0
+        for name in os.listdir(self._dirs[0]):
+            fname = os.path.join(self._dirs[0], name)
+            if fname not in keep and os.path.isfile(fname):
+                os.remove(fname)
+                self._known.discard(fname)
+                removed += 1
+
+        self._inputs = []
+        self._cum_weights = []
+        for buf in inputs:
+            self._append(buf, 1)
+        self._append(bytearray(0), 1)
+        return removed
+
+    def sync(self):
+        """
+        Pick up inputs other fuzzing jobs saved to the corpus directory.
+
+        New files are queued and returned by generate_input() before any
+        mutation, so this job's worker measures their coverage; they only
+        join this job's corpus (via put) if they increase its coverage.
+
+        Returns:
+            Number of newly queued inputs
+        """
+        if not self._save_corpus:
+            return 0
+        count = 0
+        for name in os.listdir(self._dirs[0]):
+            fname = os.path.join(self._dirs[0], name)
+            if name.startswith('.') or fname in self._known:
+                continue
+            self._known.add(fname)
+            with open(fname, 'rb') as f:
+                self._pending.append(bytearray(f.read()))
+            count += 1
+        return count
 
     def generate_input(self):
         """
         Generate the next input to test.
         
+        **Sync Phase:**
+        Inputs picked up by sync() are returned first, unmutated.
+
         **Seed Phase:**
         First runs through all seed inputs in order to establish baseline.
         
         **Mutation Phase:**
         After seeds are exhausted, generates new inputs by:
-        1. Selecting random input from corpus
+        1. Selecting an input from corpus (per the seed schedule)
         2. Mutating it using various strategies
         
         Returns:
             Bytearray input to test
         """
+        # Inputs synced from other jobs run before anything else
+        if self._pending:
+            return self._pending.pop()
+
         # Seed phase: run through all seed inputs first
         if not self._seed_run_finished:
             next_input = self._inputs[self._seed_idx]
@@ -264,8 +449,12 @@ class Corpus(object):
                 self._seed_run_finished = True
             return next_input
 
-        # Mutation phase: select random input and mutate it
-        buf = self._inputs[self._rand(len(self._inputs))]
+        # Mutation phase: select an input and mutate it
+        if self._schedule == 'weighted':
+            pick = random.random() * self._cum_weights[-1]
+            buf = self._inputs[bisect.bisect_right(self._cum_weights, pick)]
+        else:
+            buf = self._inputs[self._rand(len(self._inputs))]
         return self.mutate(buf)
 
     def mutate(self, buf):
@@ -10,6 +10,22 @@ coverage to guide input generation.
 - Worker process: Executes target function, measures coverage
 - Communication: Pipe for sending inputs and receiving coverage
 
+**Batch Mode (batch_size > 1):**
+- The main process generates a batch of inputs into shared memory and
+  sends only their count; the worker runs them back-to-back and returns
+  the number of new edges per input
+- One pipe round-trip per batch instead of per input; crashes and
+  timeouts are still attributed to the exact input
+
+**Parallel Fuzzing (jobs > 1):**
+- The main process becomes a supervisor that forks one fuzzing job per
+  core; every job runs the loop above with its own worker and its own
+  random mutation stream
+- Jobs share the first corpus directory: new-coverage inputs are written
+  there and periodically synced into the other jobs
+- Workers also mark their edges in a shared-memory coverage map, from which
+  the supervisor logs aggregated coverage and exec counts
+
 **Fuzzing Loop:**
 1. Generate input (from corpus or mutation)
 2. Send input to worker process
@@ -28,13 +44,15 @@ coverage to guide input generation.
 import os
 import time
 import sys
+import random
 import psutil
 import hashlib
 import logging
+import tempfile
 import multiprocessing as mp
 
-from pyflow.fuzzer.corpus import Corpus
-from pyflow.fuzzer.tracer import trace, get_coverage
+from pyflow.fuzzer.corpus import Corpus, minimize
+from pyflow.fuzzer import tracer
 
 
 # Set multiprocessing start method to 'fork' on Unix (faster than 'spawn')
@@ -48,8 +66,35 @@ logging.getLogger().setLevel(logging.DEBUG)
 # Time window for periodic statistics logging (in seconds)
 SAMPLING_WINDOW = 5
 
+# Interval between corpus directory syncs in parallel mode (in seconds)
+SYNC_INTERVAL = 1
+
+# Exit code used for crashes (and by jobs to report them to the supervisor)
+CRASH_EXIT_CODE = 76
+
+
+def _setup_worker(close_fd_mask):
+    """Silence the fuzzee and enable coverage tracing in a worker process."""
+    # Silence the fuzzee's noise (optional)
+    class DummyFile:
+        """No-op file object to discard output."""
+        def write(self, x):
+            pass
+    
+    logging.captureWarnings(True)
+    logging.getLogger().setLevel(logging.ERROR)
+    
+    # Optionally close stdout/stderr to reduce noise
+    if close_fd_mask & 1:
+        sys.stdout = DummyFile()
+    if close_fd_mask & 2:
+        sys.stderr = DummyFile()
+
+    # Enable coverage tracing
+    tracer.install()
+
 
-def worker(target, child_conn, close_fd_mask):
+def worker(target, child_conn, close_fd_mask, coverage_map=None):
     """
     Worker process for executing fuzz targets.
     
@@ -66,32 +111,19 @@ def worker(target, child_conn, close_fd_mask):
     hangs in the target function don't kill the main fuzzer process.
     
     **Coverage Tracking:**
-    sys.settrace(trace) enables line-level coverage tracking. After each
-    execution, get_coverage() returns the total number of unique line
-    transitions seen.
+    tracer.install() enables edge coverage tracking (sys.monitoring on
+    3.12+, sys.settrace otherwise). After each execution, tracer.collect()
+    folds newly seen edges out of the virgin map and get_coverage() returns
+    the total number of distinct edges seen.
     
     Args:
         target: Target function to fuzz (takes bytearray input)
         child_conn: Child end of pipe for receiving inputs
         close_fd_mask: Bitmask for closing stdout/stderr (1=stdout, 2=stderr)
+        coverage_map: Shared byte array of tracer.MAP_SIZE entries; edges
+            seen by this worker are set to 1 (parallel mode only)
     """
-    # Silence the fuzzee's noise (optional)
-    class DummyFile:
-        """No-op file object to discard output."""
-        def write(self, x):
-            pass
-    
-    logging.captureWarnings(True)
-    logging.getLogger().setLevel(logging.ERROR)
-    
-    # Optionally close stdout/stderr to reduce noise
-    if close_fd_mask & 1:
-        sys.stdout = DummyFile()
-    if close_fd_mask & 2:
-        sys.stderr = DummyFile()
-
-    # Enable coverage tracing
-    sys.settrace(trace) 
+    _setup_worker(close_fd_mask)
     
     # Main worker loop
     while True:
@@ -107,7 +139,127 @@ def worker(target, child_conn, close_fd_mask):
             break
         else:
             # Success - send coverage count back
-            child_conn.send_bytes(b'%d' % get_coverage())
+            edges = tracer.collect()
+            if coverage_map is not None:
+                for edge in edges:
+                    coverage_map[edge] = 1
+            child_conn.send_bytes(b'%d' % tracer.get_coverage())
+
+
+def batch_worker(target, child_conn, close_fd_mask, coverage_map, batch):
+    """
+    Worker process executing batches of inputs (batch mode).
+
+    Like worker(), but the parent only sends the number of inputs it placed
+    in the shared Batch buffers. The inputs are executed back-to-back and
+    the number of new edges of each one is written to batch.deltas, so a
+    batch costs a single pipe round-trip.
+
+    Before running input i the worker publishes i and its start time in
+    batch.progress / batch.started, which lets the parent attribute a crash
+    or timeout to the exact input.
+
+    Args:
+        target: Target function to fuzz (takes bytearray input)
+        child_conn: Child end of pipe for receiving batch sizes
+        close_fd_mask: Bitmask for closing stdout/stderr (1=stdout, 2=stderr)
+        coverage_map: Shared edge map (parallel mode only, else None)
+        batch: Batch shared with the parent
+    """
+    _setup_worker(close_fd_mask)
+
+    data = memoryview(batch.data).cast('B')
+    offsets = batch.offsets
+    deltas = batch.deltas
+    started = batch.started
+    progress = batch.progress
+    now = time.time
+    collect = tracer.collect
+
+    while True:
+        count = int(child_conn.recv_bytes())
+        for i in range(count):
+            started.value = now()
+            progress.value = i
+            buf = bytes(data[offsets[i]:offsets[i + 1]])
+            try:
+                target(buf)
+            except Exception as e:
+                logging.exception(e)
+                child_conn.send(e)
+                return
+            edges = collect()
+            deltas[i] = len(edges)
+            if edges and coverage_map is not None:
+                for edge in edges:
+                    coverage_map[edge] = 1
+        child_conn.send_bytes(b'%d' % tracer.get_coverage())
+
+
+def merge_worker(target, child_conn, close_fd_mask):
+    """
+    Worker process replaying inputs for corpus minimization.
+
+    Coverage is reset before every input, so the edges sent back are all
+    edges of that input rather than only the ones new to the worker.
+
+    Args:
+        target: Target function to fuzz (takes bytearray input)
+        child_conn: Child end of pipe for receiving inputs
+        close_fd_mask: Bitmask for closing stdout/stderr (1=stdout, 2=stderr)
+    """
+    _setup_worker(close_fd_mask)
+
+    while True:
+        buf = child_conn.recv_bytes()
+        tracer.reset()
+        try:
+            target(buf)
+        except Exception as e:
+            logging.exception(e)
+            child_conn.send(e)
+            break
+        child_conn.send(tracer.collect())
+
+
+class Batch(object):
+    """
+    Shared-memory buffers carrying a batch of inputs to the batch worker.
+
+    Inputs are packed back to back into data; input i occupies
+    data[offsets[i]:offsets[i + 1]]. The worker reports the number of new
+    edges of input i in deltas[i], and the index and start time of the
+    input it is executing in progress and started.
+
+    Attributes:
+        size: Maximum number of inputs per batch
+        inputs: Inputs of the batch currently in flight (parent side)
+    """
+    def __init__(self, size, slot_size):
+        self.size = size
+        self.data = mp.RawArray('B', size * slot_size)
+        self.offsets = mp.RawArray('q', size + 1)
+        self.deltas = mp.RawArray('q', size)
+        self.progress = mp.RawValue('q', 0)
+        self.started = mp.RawValue('d', 0.0)
+        self.inputs = []
+
+    def fill(self, corpus, count):
+        """Generate count inputs from the corpus into the shared buffers."""
+        data = memoryview(self.data).cast('B')
+        offsets = self.offsets
+        inputs = self.inputs
+        del inputs[:]
+        offset = 0
+        for i in range(count):
+            buf = corpus.generate_input()
+            end = offset + len(buf)
+            data[offset:end] = buf
+            offsets[i + 1] = end
+            offset = end
+            inputs.append(buf)
+        self.progress.value = 0
+        self.started.value = time.time()
 
 
 class Fuzzer(object):
@@ -147,9 +299,14 @@ class Fuzzer(object):
         _total_executions: Total number of test executions
         _executions_in_sample: Executions in current sampling window
         _last_sample_time: Time of last statistics log
-        _total_coverage: Total unique line transitions seen
+        _total_coverage: Total distinct edges seen
         _p: Worker process handle
-        runs: Maximum number of runs (-1 = unlimited)
+        _jobs: Number of parallel fuzzing jobs
+        _batch_size: Inputs executed per worker round-trip
+        _job_id: Index of this job in parallel mode (None otherwise)
+        _coverage_map: Shared edge map (parallel mode only)
+        _executions: Shared per-job execution counters (parallel mode only)
+        runs: Maximum number of runs (-1 = unlimited, per job)
     """
     def __init__(self,
                  target,
@@ -161,7 +318,10 @@ class Fuzzer(object):
                  max_input_size=4096,
                  close_fd_mask=0,
                  runs=-1,
-                 dict_path=None):
+                 dict_path=None,
+                 jobs=1,
+                 batch_size=1,
+                 schedule='uniform'):
         """
         Initialize a fuzzer.
         
@@ -176,20 +336,33 @@ class Fuzzer(object):
             close_fd_mask: Bitmask for closing stdout/stderr (default: 0)
             runs: Maximum number of runs (-1 = unlimited, default: -1)
             dict_path: Path to dictionary file (optional)
+            jobs: Number of parallel fuzzing jobs (default: 1)
+            batch_size: Inputs executed per worker round-trip (default: 1)
+            schedule: Seed schedule, 'uniform' or 'weighted' (default: 'uniform')
         """
         self._target = target
         self._dirs = [] if dirs is None else dirs
+        self._jobs = jobs
+        self._batch_size = batch_size
+        self._max_input_size = max_input_size
+        if jobs > 1 and not self._dirs:
+            # Parallel jobs synchronize through a corpus directory
+            self._dirs = [tempfile.mkdtemp(prefix='corpus-')]
+            logging.info('INFO: using {} as shared corpus directory'.format(self._dirs[0]))
         self._exact_artifact_path = exact_artifact_path
         self._rss_limit_mb = rss_limit_mb
         self._timeout = timeout
         self._regression = regression
         self._close_fd_mask = close_fd_mask
-        self._corpus = Corpus(self._dirs, max_input_size, dict_path)
+        self._corpus = Corpus(self._dirs, max_input_size, dict_path, schedule)
         self._total_executions = 0
         self._executions_in_sample = 0
         self._last_sample_time = time.time()
         self._total_coverage = 0
         self._p = None
+        self._job_id = None
+        self._coverage_map = None
+        self._executions = None
         self.runs = runs
 
     def log_stats(self, log_type):
@@ -216,8 +389,9 @@ class Fuzzer(object):
         execs_per_second = int(self._executions_in_sample / (endTime - self._last_sample_time))
         self._last_sample_time = time.time()
         self._executions_in_sample = 0
-        logging.info('#{} {}     cov: {} corp: {} exec/s: {} rss: {} MB'.format(
-            self._total_executions, log_type, self._total_coverage, self._corpus.length, execs_per_second, rss))
+        job = '' if self._job_id is None else 'job {} '.format(self._job_id)
+        logging.info('{}#{} {}     cov: {} corp: {} exec/s: {} rss: {} MB'.format(
+            job, self._total_executions, log_type, self._total_coverage, self._corpus.length, execs_per_second, rss))
         return rss
 
     def write_sample(self, buf, prefix='crash-'):
@@ -252,9 +426,123 @@ class Fuzzer(object):
         if len(buf) < 200:
             logging.info('sample = {}'.format(buf.hex()))
 
+    def merge(self):
+        """
+        Minimize the corpus (like libFuzzer -merge=1 / afl-cmin).
+
+        Replays every distinct input of the corpus directories in a worker,
+        keeps the subset chosen by corpus.minimize (all covered edges are
+        preserved, preferring inputs with more edges per byte) and rewrites
+        the first directory to contain exactly that subset. Inputs that
+        crash or time out are left out and reported. The empty input is
+        always part of the corpus, so it is not replayed or kept.
+
+        Exits the process with exit code 0.
+        """
+        inputs = [buf for buf in self._corpus.inputs if buf]
+        logging.info('#0 MERGE units: {}'.format(len(inputs)))
+
+        edge_sets = []
+        parent_conn = None
+        for i, buf in enumerate(inputs):
+            if parent_conn is None:
+                parent_conn, child_conn = mp.Pipe()
+                self._p = mp.Process(target=merge_worker, args=(self._target, child_conn, self._close_fd_mask))
+                self._p.start()
+
+            parent_conn.send_bytes(buf)
+            if not parent_conn.poll(self._timeout):
+                logging.info('MERGE: input {} timed out, skipping'.format(i))
+                self._p.kill()
+                edges = ()
+            else:
+                edges = parent_conn.recv()
+                if isinstance(edges, Exception):
+                    logging.info('MERGE: input {} crashed, skipping'.format(i))
+                    edges = ()
+            if not isinstance(edges, list):
+                # The worker is gone; restart it for the next input
+                self._p.join()
+                parent_conn = None
+            edge_sets.append(frozenset(edges))
+
+        if parent_conn is not None:
+            self._p.terminate()
+            self._p.join()
+
+        keep = [inputs[i] for i in minimize(edge_sets, [len(buf) for buf in inputs])]
+        removed = self._corpus.rewrite(keep)
+        logging.info('MERGE: kept {} of {} inputs ({} -> {} bytes), {} edges, removed {} files'.format(
+            len(keep), len(inputs), sum(map(len, inputs)), sum(map(len, keep)),
+            len(frozenset().union(*edge_sets)), removed))
+        sys.exit(0)
+
     def start(self):
         """
-        Start the fuzzing loop.
+        Start fuzzing.
+
+        With a single job this runs the fuzzing loop (see _fuzz) in the
+        current process. With several jobs it forks them and supervises
+        (see _supervise). Exits the process with the resulting exit code.
+        """
+        if self._jobs > 1:
+            exit_code = self._supervise()
+        else:
+            exit_code = self._fuzz()
+        sys.exit(exit_code)
+
+    def _supervise(self):
+        """
+        Run self._jobs fuzzing jobs in parallel and log aggregated stats.
+
+        Every job is a forked copy of this fuzzer running _fuzz with its own
+        worker, so crash, timeout and OOM handling stay per job. A job that
+        stops does not stop the others.
+
+        Returns:
+            First non-zero job exit code, or 0
+        """
+        coverage_map = mp.Array('B', tracer.MAP_SIZE, lock=False)
+        executions = mp.Array('q', self._jobs, lock=False)
+
+        jobs = []
+        for job_id in range(self._jobs):
+            p = mp.Process(target=self._job, args=(job_id, coverage_map, executions))
+            p.start()
+            jobs.append(p)
+        logging.info('#0 STARTED {} jobs, corpus: {}'.format(self._jobs, self._dirs[0]))
+
+        last_executions = 0
+        last_time = time.time()
+        alive = jobs
+        while alive:
+            alive[0].join(SAMPLING_WINDOW)
+            alive = [p for p in jobs if p.is_alive()]
+
+            now = time.time()
+            total = sum(executions)
+            logging.info('#{} PULSE     cov: {} jobs: {} exec/s: {}'.format(
+                total, tracer.MAP_SIZE - bytes(coverage_map).count(0), len(alive),
+                int((total - last_executions) / max(now - last_time, 1e-6))))
+            last_executions = total
+            last_time = now
+
+        exit_codes = [p.exitcode for p in jobs if p.exitcode]
+        return exit_codes[0] if exit_codes else 0
+
+    def _job(self, job_id, coverage_map, executions):
+        """Entry point of a forked fuzzing job (parallel mode)."""
+        # Forked jobs inherit the parent's random state; reseed so every job
+        # explores its own mutation stream.
+        random.seed()
+        self._job_id = job_id
+        self._coverage_map = coverage_map
+        self._executions = executions
+        sys.exit(self._fuzz())
+
+    def _fuzz(self):
+        """
+        Run the fuzzing loop of one job.
         
         This is the main fuzzing loop that:
         1. Spawns worker process
@@ -274,72 +562,174 @@ class Fuzzer(object):
         **Coverage-Guided Strategy:**
         Only inputs that increase code coverage are added to the corpus.
         This focuses fuzzing on exploring new code paths.
+
+        Returns:
+            Exit code (CRASH_EXIT_CODE if the target raised, 0 otherwise)
         """
         logging.info("#0 READ units: {}".format(self._corpus.length))
-        exit_code = 0
-        
+        exit_code = None
+        last_sync = time.time()
+
         # Create pipe for communication with worker
         parent_conn, child_conn = mp.Pipe()
         
         # Spawn worker process
-        self._p = mp.Process(target=worker, args=(self._target, child_conn, self._close_fd_mask))
+        if self._batch_size > 1:
+            # Every slot must fit the largest seed or any mutated input
+            slot_size = max(self._max_input_size, self._corpus.max_length)
+            batch = Batch(self._batch_size, slot_size)
+            self._p = mp.Process(target=batch_worker, args=(self._target, child_conn, self._close_fd_mask,
+                                                            self._coverage_map, batch))
+        else:
+            batch = None
+            self._p = mp.Process(target=worker, args=(self._target, child_conn, self._close_fd_mask,
+                                                      self._coverage_map))
         self._p.start()
 
         # Main fuzzing loop
-        while True:
+        while exit_code is None:
             # Check if maximum runs reached
             if self.runs != -1 and self._total_executions >= self.runs:
                 self._p.terminate()
                 logging.info('did %d runs, stopping now.', self.runs)
+                exit_code = 0
                 break
 
-            # Generate next input (from corpus or mutation)
-            buf = self._corpus.generate_input()
-            
-            # Send input to worker
-            parent_conn.send_bytes(buf)
-            
-            # Wait for response with timeout
-            if not parent_conn.poll(self._timeout):
-                # Timeout: worker didn't respond in time
-                self._p.kill()
-                logging.info("=================================================================")
-                logging.info("timeout reached. testcase took: {}".format(self._timeout))
-                self.write_sample(buf, prefix='timeout-')
-                break
-
-            try:
-                # Receive coverage count from worker
-                total_coverage = int(parent_conn.recv_bytes())
-            except ValueError:
-                # Exception occurred (worker sent exception object, not coverage)
-                self.write_sample(buf)
-                exit_code = 76  # Exit code for crash
-                break
+            # Pick up inputs found by other jobs
+            if self._jobs > 1 and time.time() - last_sync > SYNC_INTERVAL:
+                self._corpus.sync()
+                last_sync = time.time()
 
-            # Update statistics
-            self._total_executions += 1
-            self._executions_in_sample += 1
-            rss = 0
-            
-            # Check if coverage increased
-            if total_coverage > self._total_coverage:
-                # New coverage: add input to corpus and log
-                rss = self.log_stats("NEW")
-                self._total_coverage = total_coverage
-                self._corpus.put(buf)
+            if batch is None:
+                exit_code = self._run_one(parent_conn)
             else:
-                # No new coverage: log periodically
-                if (time.time() - self._last_sample_time) > SAMPLING_WINDOW:
-                    rss = self.log_stats('PULSE')
-
-            # Check memory limit
-            if rss > self._rss_limit_mb:
-                logging.info('MEMORY OOM: exceeded {} MB. Killing worker'.format(self._rss_limit_mb))
-                self.write_sample(buf)
-                self._p.kill()
-                break
+                exit_code = self._run_batch(parent_conn, batch)
 
         # Clean up worker process
         self._p.join()
-        sys.exit(exit_code)
+        return exit_code
+
+    def _run_one(self, parent_conn):
+        """
+        Execute a single input on the worker.
+
+        Returns:
+            None to keep fuzzing, otherwise the exit code
+        """
+        # Generate next input (from corpus or mutation)
+        buf = self._corpus.generate_input()
+        
+        # Send input to worker
+        parent_conn.send_bytes(buf)
+        
+        # Wait for response with timeout
+        if not parent_conn.poll(self._timeout):
+            return self._on_timeout(buf)
+
+        try:
+            # Receive coverage count from worker
+            total_coverage = int(parent_conn.recv_bytes())
+        except ValueError:
+            # Exception occurred (worker sent exception object, not coverage)
+            self.write_sample(buf)
+            return CRASH_EXIT_CODE
+
+        return self._record(buf, total_coverage - self._total_coverage)
+
+    def _run_batch(self, parent_conn, batch):
+        """
+        Execute a batch of inputs on the batch worker.
+
+        Results are recorded per input, in order, so corpus updates, crash,
+        timeout and OOM handling refer to the exact input responsible.
+
+        Returns:
+            None to keep fuzzing, otherwise the exit code
+        """
+        count = batch.size
+        if self.runs != -1:
+            count = min(count, self.runs - self._total_executions)
+        batch.fill(self._corpus, count)
+        parent_conn.send_bytes(b'%d' % count)
+
+        # Wait for the batch; time out on the input the worker is stuck on
+        remaining = self._timeout
+        while not parent_conn.poll(remaining):
+            elapsed = time.time() - batch.started.value
+            if elapsed >= self._timeout:
+                index = batch.progress.value
+                exit_code = self._record_batch(batch, index)
+                if exit_code is not None:
+                    return exit_code
+                return self._on_timeout(batch.inputs[index])
+            remaining = self._timeout - elapsed
+
+        try:
+            int(parent_conn.recv_bytes())
+        except ValueError:
+            # The worker stopped at the input that raised
+            index = batch.progress.value
+            exit_code = self._record_batch(batch, index)
+            if exit_code is not None:
+                return exit_code
+            self.write_sample(batch.inputs[index])
+            return CRASH_EXIT_CODE
+
+        return self._record_batch(batch, count)
+
+    def _record_batch(self, batch, count):
+        """Record the results of the first count inputs of the batch."""
+        deltas = batch.deltas
+        for i in range(count):
+            exit_code = self._record(batch.inputs[i], deltas[i])
+            if exit_code is not None:
+                return exit_code
+        return None
+
+    def _record(self, buf, new_coverage):
+        """
+        Account for one successful execution.
+
+        Adds the input to the corpus if it found new edges, logs statistics
+        and enforces the memory limit.
+
+        Args:
+            buf: Executed input
+            new_coverage: Number of edges first seen by this execution
+
+        Returns:
+            None to keep fuzzing, otherwise the exit code
+        """
+        # Update statistics
+        self._total_executions += 1
+        self._executions_in_sample += 1
+        if self._executions is not None:
+            self._executions[self._job_id] = self._total_executions
+        rss = 0
+        
+        # Check if coverage increased
+        if new_coverage > 0:
+            # New coverage: add input to corpus and log
+            rss = self.log_stats("NEW")
+            self._total_coverage += new_coverage
+            self._corpus.put(buf, new_coverage)
+        else:
+            # No new coverage: log periodically
+            if (time.time() - self._last_sample_time) > SAMPLING_WINDOW:
+                rss = self.log_stats('PULSE')
+
+        # Check memory limit
+        if rss > self._rss_limit_mb:
+            logging.info('MEMORY OOM: exceeded {} MB. Killing worker'.format(self._rss_limit_mb))
+            self.write_sample(buf)
+            self._p.kill()
+            return 0
+        return None
+
+    def _on_timeout(self, buf):
+        """Kill the worker stuck on buf and save it as a timeout sample."""
+        self._p.kill()
+        logging.info("=================================================================")
+        logging.info("timeout reached. testcase took: {}".format(self._timeout))
+        self.write_sample(buf, prefix='timeout-')
+        return 0
@@ -53,6 +53,10 @@ class PythonFuzz(object):
     - --close-fd-mask: Close stdout/stderr (0-3)
     - --runs: Maximum runs (-1 = unlimited)
     - --timeout: Timeout per test (default: 30)
+    - --jobs: Number of parallel fuzzing jobs (default: 1)
+    - --batch-size: Inputs per worker round-trip (default: 1)
+    - --seed-schedule: uniform or weighted seed selection (default: uniform)
+    - --merge: Minimize the corpus into the first directory and exit
     """
     def __init__(self, func):
         """
@@ -85,13 +89,25 @@ class PythonFuzz(object):
         parser.add_argument('--runs', type=int, default=-1, help='Number of individual test runs, -1 (the default) to run indefinitely.')
         parser.add_argument('--timeout', type=int, default=30,
                             help='If input takes longer then this timeout the process is treated as failure case')
+        parser.add_argument('--jobs', type=int, default=1,
+                            help='Number of parallel fuzzing jobs sharing the first corpus directory')
+        parser.add_argument('--batch-size', type=int, default=1,
+                            help='Number of inputs the worker executes per round-trip; larger batches speed up fast targets')
+        parser.add_argument('--seed-schedule', choices=['uniform', 'weighted'], default='uniform',
+                            help='How seeds are picked for mutation; weighted favors small inputs reaching rare edges')
+        parser.add_argument('--merge', action='store_true',
+                            help='Minimize the corpus: keep a subset preserving coverage in the first directory, then exit')
         args = parser.parse_args()
         
         # Create and start fuzzer
         f = Fuzzer(self.function, args.dirs, args.exact_artifact_path,
                           args.rss_limit_mb, args.timeout, args.regression, args.max_input_size,
-                          args.close_fd_mask, args.runs, args.dict)
-        f.start()
+                          args.close_fd_mask, args.runs, args.dict, args.jobs, args.batch_size,
+                          args.seed_schedule)
+        if args.merge:
+            f.merge()
+        else:
+            f.start()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,63 @@
+"""
+Execs/sec of the coverage tracer backends on the test_crash zip target.
+
+Run directly: python -m pyflow.fuzzer.tests.bench_tracer [runs]
+"""
+
+import io
+import random
+import subprocess
+import sys
+import time
+import zipfile
+
+
+def fuzz(buf):
+    try:
+        z = zipfile.ZipFile(io.BytesIO(buf))
+        z.testzip()
+    except Exception:
+        pass
+
+
+def make_inputs(runs, seed=0):
+    rng = random.Random(seed)
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w') as z:
+        z.writestr('a.txt', 'hello' * 20)
+    base = out.getvalue()
+    inputs = []
+    for _ in range(runs):
+        buf = bytearray(base)
+        for _ in range(rng.randint(0, 4)):
+            buf[rng.randrange(len(buf))] = rng.randrange(256)
+        inputs.append(bytes(buf))
+    return inputs
+
+
+def measure(backend, runs):
+    from pyflow.fuzzer import tracer
+
+    inputs = make_inputs(runs)
+    if backend != 'none':
+        backend = tracer.install(backend == 'monitoring')
+    start = time.perf_counter()
+    for buf in inputs:
+        fuzz(buf)
+        tracer.collect()
+    elapsed = time.perf_counter() - start
+    tracer.uninstall()
+    return backend, runs / elapsed, tracer.get_coverage()
+
+
+def main(runs=3000):
+    # Each backend runs in a fresh interpreter: sys.monitoring DISABLE state
+    # and settrace hooks would otherwise leak between measurements.
+    for backend in ('none', 'settrace', 'monitoring'):
+        subprocess.check_call([sys.executable, '-c',
+            'from pyflow.fuzzer.tests.bench_tracer import measure; '
+            'print("%%-10s %%8d exec/s  cov %%d" %% measure(%r, %d))' % (backend, runs)])
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
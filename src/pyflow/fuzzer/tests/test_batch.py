@@ -0,0 +1,160 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import multiprocessing as mp
+
+from pyflow.fuzzer.fuzzer import Batch, Fuzzer, batch_worker, CRASH_EXIT_CODE
+
+
+class FixedCorpus(object):
+    def __init__(self, inputs):
+        self._inputs = list(inputs)
+        self.max_length = max(map(len, self._inputs))
+        self.added = []
+
+    @property
+    def length(self):
+        return len(self.added)
+
+    def generate_input(self):
+        return self._inputs.pop(0)
+
+    def put(self, buf, edges=1):
+        self.added.append(buf)
+
+
+def target(buf):
+    if buf == b'crash':
+        raise ValueError(buf)
+    if buf == b'hang':
+        time.sleep(60)
+    if buf[:1] == b'x':
+        buf.upper()
+
+
+class TestBatch(unittest.TestCase):
+    def test_fill(self):
+        "inputs are packed back to back and remembered in order"
+        inputs = [bytearray(b'abc'), bytearray(b''), bytearray(b'defg')]
+        batch = Batch(4, 8)
+        batch.fill(FixedCorpus(inputs), 3)
+
+        self.assertEqual(inputs, batch.inputs)
+        data = bytes(batch.data)
+        for i, buf in enumerate(inputs):
+            self.assertEqual(buf, data[batch.offsets[i]:batch.offsets[i + 1]])
+        self.assertEqual(0, batch.progress.value)
+
+    def test_refill(self):
+        "a new batch replaces the previous one"
+        batch = Batch(2, 4)
+        batch.fill(FixedCorpus([bytearray(b'aaaa'), bytearray(b'bb')]), 2)
+        batch.fill(FixedCorpus([bytearray(b'c')]), 1)
+        self.assertEqual([bytearray(b'c')], batch.inputs)
+        self.assertEqual(b'c', bytes(batch.data)[batch.offsets[0]:batch.offsets[1]])
+
+
+class TestBatchWorker(unittest.TestCase):
+    def setUp(self):
+        self.parent_conn, child_conn = mp.Pipe()
+        self.batch = Batch(4, 8)
+        self.p = mp.Process(target=batch_worker, args=(target, child_conn, 3, None, self.batch))
+        self.p.start()
+
+    def tearDown(self):
+        self.p.kill()
+        self.p.join()
+
+    def run_batch(self, inputs):
+        self.batch.fill(FixedCorpus(inputs), len(inputs))
+        self.parent_conn.send_bytes(b'%d' % len(inputs))
+
+    def test_batch(self):
+        "every input of the batch runs and reports its new edges"
+        self.run_batch([bytearray(b'a'), bytearray(b'xy'), bytearray(b'b')])
+        self.assertTrue(self.parent_conn.poll(10))
+        total = int(self.parent_conn.recv_bytes())
+
+        deltas = list(self.batch.deltas[:3])
+        self.assertEqual(2, self.batch.progress.value)
+        self.assertGreater(deltas[0], 0)
+        self.assertGreater(deltas[1], 0)
+        self.assertEqual(0, deltas[2])
+        self.assertEqual(sum(deltas), total)
+
+    def test_crash(self):
+        "the worker stops at the input that raised"
+        self.run_batch([bytearray(b'a'), bytearray(b'crash'), bytearray(b'b')])
+        self.assertTrue(self.parent_conn.poll(10))
+        self.assertIsInstance(self.parent_conn.recv(), ValueError)
+        self.assertEqual(1, self.batch.progress.value)
+        self.p.join(10)
+        self.assertFalse(self.p.is_alive())
+
+    def test_hang(self):
+        "the input being executed and its start time are published"
+        before = time.time()
+        self.run_batch([bytearray(b'a'), bytearray(b'b'), bytearray(b'hang'), bytearray(b'c')])
+        deadline = time.time() + 10
+        while self.batch.progress.value != 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(2, self.batch.progress.value)
+        self.assertFalse(self.parent_conn.poll(0.2))
+        self.assertGreaterEqual(self.batch.started.value, before)
+
+
+class TestBatchFuzzer(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.artifact = os.path.join(self.dir, 'artifact')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def fuzz(self, inputs, timeout=10):
+        fuzzer = Fuzzer(target, exact_artifact_path=self.artifact, timeout=timeout,
+                        close_fd_mask=3, batch_size=4, runs=len(inputs))
+        fuzzer._corpus = FixedCorpus(inputs)
+        exit_code = fuzzer._fuzz()
+        return fuzzer, exit_code
+
+    def artifact_data(self):
+        with open(self.artifact, 'rb') as f:
+            return f.read()
+
+    def test_crash_attribution(self):
+        "a crash in the second batch is saved as the input that raised"
+        inputs = [bytearray(b'a%d' % i) for i in range(6)]
+        inputs[5] = bytearray(b'crash')
+        inputs[1] = bytearray(b'xy')
+        fuzzer, exit_code = self.fuzz(inputs)
+
+        self.assertEqual(CRASH_EXIT_CODE, exit_code)
+        self.assertEqual(b'crash', self.artifact_data())
+        # The inputs that ran before it were recorded
+        self.assertEqual(5, fuzzer._total_executions)
+        self.assertIn(bytearray(b'xy'), fuzzer._corpus.added)
+
+    def test_timeout_attribution(self):
+        "a hang is saved as the input the worker was stuck on"
+        inputs = [bytearray(b'a'), bytearray(b'b'), bytearray(b'hang'), bytearray(b'c')]
+        fuzzer, exit_code = self.fuzz(inputs, timeout=1)
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual(b'hang', self.artifact_data())
+        self.assertEqual(2, fuzzer._total_executions)
+
+    def test_runs(self):
+        "a batch never runs past the maximum number of runs"
+        inputs = [bytearray(b'a%d' % i) for i in range(6)]
+        fuzzer, exit_code = self.fuzz(inputs)
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual(6, fuzzer._total_executions)
+        self.assertFalse(os.path.exists(self.artifact))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from pyflow.fuzzer.corpus import Corpus, minimize, seed_weight
+from pyflow.fuzzer.fuzzer import Fuzzer
+
+
+def target(buf):
+    if buf == b'crash':
+        raise ValueError(buf)
+    if buf[:1] == b'a':
+        if buf[1:2] == b'b':
+            return 2
+        return 1
+    return 0
+
+
+class TestMinimize(unittest.TestCase):
+    def test_covers_all_edges(self):
+        edge_sets = [{1, 2}, {2, 3}, {1, 2, 3}, {4}, set()]
+        sizes = [10, 10, 15, 5, 1]
+        keep = minimize(edge_sets, sizes)
+        self.assertEqual([2, 3], keep)
+
+    def test_prefers_small_inputs(self):
+        "an input whose edges are covered by smaller inputs is dropped"
+        edge_sets = [{1, 2, 3}, {1}, {2}, {3}]
+        sizes = [1000, 1, 1, 1]
+        self.assertEqual([1, 2, 3], minimize(edge_sets, sizes))
+
+    def test_duplicates(self):
+        "inputs with identical coverage collapse to the smallest one"
+        edge_sets = [{7, 8}, {7, 8}, {7, 8}]
+        sizes = [3, 1, 2]
+        self.assertEqual([1], minimize(edge_sets, sizes))
+
+
+class TestMerge(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_merge(self):
+        "merge keeps inputs covering every edge, without the empty seed"
+        corpus = Corpus([self.dir])
+        for buf in (b'a', b'aaaa', b'ab', b'abbbbbbb', b'z', b'zzzz', b'crash'):
+            corpus.put(bytearray(buf))
+
+        fuzzer = Fuzzer(target, dirs=[self.dir], close_fd_mask=3, timeout=10)
+        with self.assertRaises(SystemExit) as cm:
+            fuzzer.merge()
+        self.assertEqual(0, cm.exception.code)
+
+        kept = set(bytes(buf) for buf in Corpus([self.dir]).inputs if buf)
+        self.assertEqual({b'a', b'ab', b'z'}, kept)
+        self.assertEqual(3, len(os.listdir(self.dir)))
+
+
+class TestCorpusSchedule(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_weights(self):
+        self.assertGreater(seed_weight(b'a', 4), seed_weight(b'a', 1))
+        self.assertGreater(seed_weight(b'a', 4), seed_weight(b'a' * 1000, 4))
+
+    def test_weighted_pick(self):
+        "weighted schedule favors inputs that reached more edges"
+        random.seed(0)
+        corpus = Corpus([self.dir], schedule='weighted')
+        corpus.put(bytearray(b'x'), 100)
+        corpus.mutate = lambda buf: buf
+        picks = [corpus.generate_input() for _ in range(200)]
+        self.assertGreater(picks.count(bytearray(b'x')), 150)
+
+    def test_rewrite(self):
+        corpus = Corpus([self.dir])
+        for buf in (b'a', b'bb', b'ccc'):
+            corpus.put(bytearray(buf))
+        removed = corpus.rewrite([bytearray(b'bb')])
+        self.assertEqual(2, removed)
+        self.assertEqual(1, len(os.listdir(self.dir)))
+        # The empty input stays in the corpus, but not on disk
+        self.assertEqual([bytearray(b'bb'), bytearray()], corpus.inputs)
+        self.assertEqual([bytearray(b'bb')], Corpus([self.dir]).inputs[:1])
+
+    def test_unknown_schedule(self):
+        self.assertRaises(ValueError, Corpus, [self.dir], schedule='fastest')
+
+
+if __name__ == '__main__':
+    unittest.main()
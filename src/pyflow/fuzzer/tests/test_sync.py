@@ -0,0 +1,38 @@
+import shutil
+import tempfile
+import unittest
+
+from pyflow.fuzzer.corpus import Corpus
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_sync(self):
+        "inputs saved by one job are queued once by another"
+        a = Corpus([self.dir])
+        b = Corpus([self.dir])
+
+        a.put(bytearray(b'hello'))
+        self.assertEqual(0, a.sync())
+        self.assertEqual(1, b.sync())
+        self.assertEqual(0, b.sync())
+
+        # Synced inputs run unmutated before anything else
+        self.assertEqual(b'hello', b.generate_input())
+
+    def test_put_existing(self):
+        "putting an input that is already on disk does not duplicate it"
+        a = Corpus([self.dir])
+        a.put(bytearray(b'abc'))
+        b = Corpus([self.dir])
+        b.put(bytearray(b'abc'))
+        self.assertEqual(0, b.sync())
+
+
+if __name__ == '__main__':
+    unittest.main()
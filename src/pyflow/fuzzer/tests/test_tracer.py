@@ -0,0 +1,73 @@
+import sys
+import unittest
+
+from pyflow.fuzzer import tracer
+
+
+def target(buf):
+    if len(buf) > 2:
+        if buf[0] == ord('F'):
+            return 1
+        return 2
+    return 0
+
+
+class TracerBackendMixin(object):
+    use_monitoring = False
+
+    def setUp(self):
+        tracer.reset()
+        self.backend = tracer.install(self.use_monitoring)
+        if self.use_monitoring and self.backend != 'monitoring':
+            tracer.uninstall()
+            self.skipTest('sys.monitoring not available')
+
+    def tearDown(self):
+        tracer.uninstall()
+        tracer.reset()
+
+    def run_target(self, *bufs):
+        # One call site for every input, so the harness itself only adds
+        # coverage during the first iterations.
+        results = []
+        for buf in bufs:
+            target(buf)
+            results.append(tracer.collect())
+        return results
+
+    def test_new_coverage(self):
+        "new paths leave the virgin map, repeated paths do not"
+        results = self.run_target(b'', b'', b'', b'', b'abc', b'xyz', b'xyz', b'Fab', b'Fxy')
+        self.assertTrue(results[0])
+        self.assertFalse(results[3])
+        self.assertTrue(results[4])
+        self.assertFalse(results[6])
+        self.assertTrue(results[7])
+        self.assertFalse(results[8])
+        self.assertEqual(tracer.get_coverage(), sum(map(len, results)))
+
+    def test_reset(self):
+        "reset forgets coverage and re-enables disabled locations"
+        self.run_target(b'abc')
+        tracer.reset()
+        self.assertEqual(0, tracer.get_coverage())
+        self.assertTrue(self.run_target(b'abc')[0])
+
+    def test_edges_in_map(self):
+        edges = self.run_target(b'Fab')[0]
+        for edge in edges:
+            self.assertTrue(0 <= edge < tracer.MAP_SIZE)
+            self.assertEqual(0, tracer.virgin_map[edge])
+
+
+class TestSettraceTracer(TracerBackendMixin, unittest.TestCase):
+    use_monitoring = False
+
+
+@unittest.skipUnless(hasattr(sys, 'monitoring'), 'requires Python 3.12+')
+class TestMonitoringTracer(TracerBackendMixin, unittest.TestCase):
+    use_monitoring = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,90 +1,220 @@
 """
 Code Coverage Tracer for Fuzzing.
 
-This module provides line-level code coverage tracking using Python's
-sys.settrace mechanism. It tracks which lines are executed during fuzzing
-to guide input generation.
+This module provides edge coverage tracking for the fuzzer. Coverage is
+recorded AFL-style into a fixed-size edge-hit map that is compared against a
+"virgin" map of edges never seen before.
 
-**Coverage Tracking:**
-- Tracks line-level coverage (which lines are executed)
-- Tracks transitions between files
-- Provides total coverage count (number of unique line transitions)
+**Coverage Backends:**
+- sys.monitoring (Python 3.12+): JUMP, BRANCH and PY_START events are
+  hashed into the map. Locations whose edges have all been seen return
+  sys.monitoring.DISABLE, so hot code stops paying for instrumentation.
+- sys.settrace (fallback): line events are hashed into the map as
+  (previous location, current location) pairs.
 
 **Coverage Representation:**
-Coverage is stored as (prev_line, curr_line) pairs for each file.
-This captures both which lines are executed and the transitions between
-lines, providing more detailed coverage information than just line sets.
+- Edge index = code object id mixed with source and destination offsets,
+  masked to MAP_SIZE entries.
+- virgin_map: bytearray of MAP_SIZE entries, an entry is 1 while the edge
+  has never been observed. A hit is compared against the virgin map on the
+  spot, so executions that find nothing new cost no extra bookkeeping.
+- new_edges: indices that left the virgin map since the last collect().
 
 **Usage:**
-The tracer is set up using sys.settrace(trace) in the worker process.
-After each test execution, get_coverage() returns the total number of
-unique line transitions seen so far.
+The worker process calls install() once, then after each execution calls
+collect() to obtain the edges first seen by that execution. get_coverage()
+returns the total number of distinct edges seen so far.
 """
 
-import collections
 import sys
 
-# Global state for coverage tracking
-prev_line = 0
-prev_filename = ''
-# Coverage data: filename -> set of (prev_line, curr_line) transitions
-data = collections.defaultdict(set)
+# Size of the edge map; must be a power of two
+MAP_SIZE = 1 << 16
+MAP_MASK = MAP_SIZE - 1
 
-def trace(frame, event, arg):
+# Entry is 1 while the edge has never been seen
+_VIRGIN = b'\x01' * MAP_SIZE
+virgin_map = bytearray(_VIRGIN)
+
+# Edges first seen since the last collect()
+new_edges = []
+
+# Number of distinct edges seen so far
+total_edges = 0
+
+# Active backend: None, 'monitoring' or 'settrace'
+backend = None
+
+# settrace state: hashed previous location (AFL-style prev_loc >> 1)
+prev_location = 0
+
+# settrace: frames of this module are not traced
+_GLOBALS = globals()
+
+# sys.monitoring state: branch location -> first destination seen
+_branches = {}
+_DISABLE = None
+
+
+def _on_start(code, instruction_offset):
+    edge = (id(code) >> 4) & MAP_MASK
+    if virgin_map[edge]:
+        virgin_map[edge] = 0
+        new_edges.append(edge)
+    return _DISABLE
+
+
+def _on_jump(code, instruction_offset, destination_offset):
+    # Unconditional jumps have a single destination.
+    edge = ((id(code) >> 4) ^ instruction_offset * 40503 ^ destination_offset * 9973) & MAP_MASK
+    if virgin_map[edge]:
+        virgin_map[edge] = 0
+        new_edges.append(edge)
+    return _DISABLE
+
+
+def _on_branch(code, instruction_offset, destination_offset):
+    edge = ((id(code) >> 4) ^ instruction_offset * 40503 ^ destination_offset * 9973) & MAP_MASK
+    if virgin_map[edge]:
+        virgin_map[edge] = 0
+        new_edges.append(edge)
+
+    # A conditional branch can only be disabled once both directions are seen.
+    # (Keyed on id(code): hashing a code object is comparatively expensive.)
+    key = (id(code), instruction_offset)
+    seen = _branches.get(key)
+    if seen is None:
+        _branches[key] = destination_offset
+    elif seen != destination_offset:
+        del _branches[key]
+        return _DISABLE
+
+
+def trace(frame, event, arg, _id=id, _virgin=virgin_map):
     """
-    Trace function for sys.settrace.
-    
-    This function is called by Python for each line execution when
-    sys.settrace(trace) is active. It tracks line transitions to measure
-    code coverage.
-    
-    **Coverage Model:**
-    - Tracks transitions: (previous_line, current_line) pairs
-    - Handles file boundaries: concatenates filenames for inter-file transitions
-    - Only processes 'line' events (ignores call, return, etc.)
-    
+    Trace function for sys.settrace (fallback backend).
+
+    Only 'line' events are recorded; every line transition becomes an edge
+    hashed from the code object and line number. Calls into this module are
+    not traced.
+
     Args:
         frame: Current execution frame
         event: Event type ('line', 'call', 'return', etc.)
         arg: Event argument (unused for 'line' events)
-        
+        _id, _virgin: Bound as defaults to keep the per-line path on locals
+
     Returns:
         The trace function itself (to continue tracing)
     """
-    # Only track line events (actual line executions)
     if event != 'line':
+        # Do not trace the tracer's own bookkeeping (e.g. collect()).
+        if event == 'call' and frame.f_globals is _GLOBALS:
+            return None
         return trace
 
-    global prev_line
-    global prev_filename
+    global prev_location
+
+    location = ((_id(frame.f_code) >> 4) ^ frame.f_lineno * 40503) & MAP_MASK
+    edge = location ^ prev_location
+    if _virgin[edge]:
+        _virgin[edge] = 0
+        new_edges.append(edge)
+    prev_location = location >> 1
+
+    return trace
+
+
+def _install_monitoring():
+    global _DISABLE
+    monitoring = sys.monitoring
+    tool = monitoring.COVERAGE_ID
+    if monitoring.get_tool(tool) is not None:
+        return False
+
+    monitoring.use_tool_id(tool, "pyflow.fuzzer")
+    _DISABLE = monitoring.DISABLE
+    events = monitoring.events
+    monitoring.register_callback(tool, events.PY_START, _on_start)
+    monitoring.register_callback(tool, events.JUMP, _on_jump)
+    monitoring.register_callback(tool, events.BRANCH, _on_branch)
+    monitoring.set_events(tool, events.PY_START | events.JUMP | events.BRANCH)
+    return True
+
+
+def install(use_monitoring=True):
+    """
+    Start collecting coverage in the current process.
 
-    func_filename = frame.f_code.co_filename
-    func_line_no = frame.f_lineno
+    Prefers sys.monitoring when available (and the coverage tool id is free),
+    otherwise falls back to sys.settrace.
 
-    if func_filename != prev_filename:
-        # File boundary: track transition from previous file to current file
-        # We concatenate filenames to track inter-file transfers
-        # This is a simple approach that works for coverage-guided fuzzing
-        data[func_filename + prev_filename].add((prev_line, func_line_no))
+    Returns:
+        Name of the backend that was installed
+    """
+    global backend
+    if use_monitoring and hasattr(sys, 'monitoring') and _install_monitoring():
+        backend = 'monitoring'
     else:
-        # Same file: track line transition within file
-        data[func_filename].add((prev_line, func_line_no))
+        sys.settrace(trace)
+        backend = 'settrace'
+    return backend
 
-    # Update previous state for next transition
-    prev_line = func_line_no
-    prev_filename = func_filename
 
-    return trace
+def uninstall():
+    """Stop collecting coverage."""
+    global backend
+    if backend == 'monitoring':
+        monitoring = sys.monitoring
+        monitoring.set_events(monitoring.COVERAGE_ID, 0)
+        monitoring.free_tool_id(monitoring.COVERAGE_ID)
+        _branches.clear()
+    elif backend == 'settrace':
+        sys.settrace(None)
+    backend = None
+
+
+def reset():
+    """Forget all coverage seen so far, including disabled locations."""
+    global total_edges, prev_location
+    virgin_map[:] = _VIRGIN
+    del new_edges[:]
+    total_edges = 0
+    prev_location = 0
+    if backend == 'monitoring':
+        _branches.clear()
+        sys.monitoring.restart_events()
+
+
+def collect():
+    """
+    Return the edges first seen since the previous call.
+
+    Called by the worker after each execution; the returned list is empty
+    when the execution found no new coverage.
+
+    Returns:
+        List of map indices that just left the virgin map
+    """
+    global total_edges, prev_location
+    prev_location = 0
+    if not new_edges:
+        return []
+    edges = new_edges[:]
+    del new_edges[:]
+    total_edges += len(edges)
+    return edges
 
 
 def get_coverage():
     """
     Get total code coverage count.
-    
-    Returns the total number of unique line transitions seen so far.
-    This is used by the fuzzer to determine if a test case increased coverage.
-    
+
+    Returns the total number of distinct edges seen so far. This is used by
+    the fuzzer to determine if a test case increased coverage.
+
     Returns:
-        Total number of unique (prev_line, curr_line) transitions
+        Total number of distinct edges
     """
-    return sum(map(len, data.values()))
+    return total_edges
+
@@ -0,0 +1,49 @@
+"""Explicit-stack AST traversal.
+
+Recursive visitors built on visitChildren use one Python frame per level of
+nesting, so deeply nested code can hit the recursion limit. A StackWalker
+visits the same nodes in the same order with a heap-allocated stack.
+"""
+
+from pyflow.util.typedispatch import *
+
+
+class StackWalker(TypeDispatcher):
+    """Base class for visitors that walk an AST without recursion.
+
+    Handlers are dispatched on each node in preorder and return the children
+    to descend into, or None to stop at that node.  Returning node.children()
+    is the equivalent of calling node.visitChildren(self) in a recursive
+    visitor.  After the children of a node have been walked, leave(node) is
+    called, which gives subclasses a postorder hook.
+    """
+
+    @dispatch(list, tuple)
+    def visitContainer(self, node):
+        return node
+
+    def leave(self, node):
+        pass
+
+    def walk(self, node):
+        """Walk node and everything it contains."""
+        children = self(node)
+        if children is None:
+            return
+
+        stack = [(node, iter(children))]
+        while stack:
+            parent, remaining = stack[-1]
+            for child in remaining:
+                children = self(child)
+                if children is not None:
+                    stack.append((child, iter(children)))
+                    break
+            else:
+                stack.pop()
+                self.leave(parent)
+
+    def walkChildren(self, node):
+        """Walk the children of node, even if it is a shared node."""
+        for child in node.children():
+            self.walk(child)
@@ -544,9 +544,19 @@ class Code(BaseCode):
             codeparameters:CodeParameters
             ast:Suite"""
     __shared__ = True
+    __slots__ = "generation", "opIndex"
 
     __emptyAnnotation__ = annotations.emptyCodeAnnotation
 
+    def __postinit__(self):
+        # Called on construction and by _replaceChildren.
+        self.generation = getattr(self, "generation", -1) + 1
+        self.opIndex = None
+
+    def mutated(self):
+        """Invalidate cached analysis of the body after an in-place edit."""
+        self.generation += 1
+
     def __repr__(self):
         return "Code(%s/%d)" % (self.name, id(self))
 
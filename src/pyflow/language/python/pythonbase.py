@@ -320,6 +320,13 @@ class BaseCode(PythonASTNode):
         """
         return None
 
+    def mutated(self):
+        """Note that the body was edited in place.
+        
+        Code with a body overrides this to invalidate cached analysis.
+        """
+        pass
+
 
 class AbstractCode(BaseCode):
     """Abstract code definition (not implemented).
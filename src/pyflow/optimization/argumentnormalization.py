@@ -255,6 +255,7 @@ class ArgumentNormalizationTransform(TypeDispatcher):
             returnparams,
         )
         node.ast = self(node.ast)
+        node.mutated()
 
 
 def evaluate(compiler, prgm):
@@ -266,5 +266,6 @@ def callConverter(extractor, node):
     if not node.annotation.lowered:
         converter = ConvertCalls(extractor, node)
         node.replaceChildren(converter)
+        node.mutated()
         node.rewriteAnnotation(lowered=True)
     return node
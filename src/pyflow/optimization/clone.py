@@ -618,6 +618,7 @@ class FunctionCloner(TypeDispatcher):
 
     def process(self):
         self.code.replaceChildren(self)
+        self.code.mutated()
 
 
 def rewriteProgram(compiler, prgm, cloner):
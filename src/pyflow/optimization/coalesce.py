@@ -0,0 +1,200 @@
+"""Local slot coalescing.
+
+Lowering and inlining leave optimized functions with many short lived
+temporaries.  Temporaries whose live ranges never overlap can share a single
+local, which cuts the number of locals that lifetime analysis, shape analysis
+and the dump must track.
+
+Liveness is computed backwards over the numbering read/modify information
+with the reverse data flow framework.  Each assignment interferes with the
+locals live after it, and the locals live at entry interfere with each
+other.  The interference graph is colored by colorGraph, and each color
+class is renamed to one of its members, whose references annotation becomes
+the union of the class.
+
+Only locals defined by assignments are coalesced.  Parameters, loop
+indices and type switch targets keep their identity.
+"""
+
+from pyflow.util.typedispatch import *
+from pyflow.util.graphalgorithim.color import colorGraph
+from pyflow.language.python import ast
+from pyflow.language.asttools.annotation import mergeContextualAnnotation
+
+from pyflow.analysis.astcollector import getOps
+from pyflow.analysis.numbering.readmodify import FindReadModify
+from pyflow.optimization.dataflow.reverse import ReverseFlowTraverse
+from pyflow.optimization.dataflow.base import top
+from pyflow.optimization.dce import liveMeet
+from pyflow.optimization import rewrite
+
+
+class CoalesceStatistics(object):
+    def __init__(self):
+        self.codes = 0
+        self.skipped = 0
+        self.before = 0
+        self.after = 0
+        self.candidates = 0
+        self.edges = 0
+
+    def output(self, console):
+        console.output("Codes:         %d (%d skipped)" % (self.codes, self.skipped))
+        console.output("Candidates:    %d" % self.candidates)
+        console.output("Interference:  %d edges" % self.edges)
+        console.output("Locals:        %d -> %d" % (self.before, self.after))
+
+
+class FindInterference(TypeDispatcher):
+    """Strategy for ReverseFlowTraverse that records interference.
+
+    The traversal keeps the set of live locals in its flow dictionary, this
+    strategy kills the locals a statement modifies and marks the ones it
+    reads.
+    """
+
+    def __init__(self, lut, candidates):
+        self.lut = lut
+        self.graph = dict([(lcl, set()) for lcl in candidates])
+
+    def interfere(self, a, b):
+        if a is not b and a in self.graph and b in self.graph:
+            self.graph[a].add(b)
+            self.graph[b].add(a)
+
+    def live(self):
+        # Only candidates take part in the graph.
+        return [lcl for lcl in self.flow._current.lut if lcl in self.graph]
+
+    def marker(self, node):
+        if self.flow._current is not None and isinstance(node, ast.Local):
+            self.flow.define(node, top)
+
+    @defaultdispatch
+    def default(self, node):
+        info = self.lut.get(node)
+        if info is None or self.flow._current is None:
+            return node
+
+        if info.localModify:
+            live = self.live()
+            for lcl in info.localModify:
+                # Targets are assigned together, so they interfere.
+                for other in info.localModify:
+                    self.interfere(lcl, other)
+                for other in live:
+                    self.interfere(lcl, other)
+            for lcl in info.localModify:
+                self.flow.undefine(lcl)
+
+        for lcl in info.localRead:
+            self.flow.define(lcl, top)
+        return node
+
+
+# The candidates are listed in the order they are assigned, so the coloring
+# does not depend on hashing.
+def findCandidates(code, lut):
+    candidates = {}
+    p = code.codeparameters
+    excluded = set(p.returnparams)
+    excluded.update(p.params)
+    excluded.update((p.selfparam, p.vparam, p.kparam))
+
+    for node, info in lut.items():
+        if isinstance(node, ast.Assign):
+            for lcl in node.lcls:
+                candidates[lcl] = None
+        elif isinstance(node, ast.For):
+            excluded.add(node.index)
+        elif isinstance(node, ast.TypeSwitchCase):
+            excluded.add(node.expr)
+
+    annotated = code.annotation.contexts is not None
+    return [
+        lcl
+        for lcl in candidates
+        if lcl not in excluded
+        and not (annotated and lcl.annotation.references is None)
+    ]
+
+
+def interferenceGraph(code):
+    """Build the interference graph of the coalescing candidates of code.
+
+    Returns None if the read/modify analysis cannot handle the code.
+    """
+    try:
+        lut = FindReadModify().processCode(code)
+    except TypeDispatchError:
+        return None
+
+    strategy = FindInterference(lut, findCandidates(code, lut))
+    traverse = ReverseFlowTraverse(liveMeet, strategy)
+    strategy.flow = traverse.flow
+
+    # Only the flow is wanted, the rebuilt tree is discarded.
+    traverse(code.ast)
+
+    # Locals live at entry may be used before they are defined on some path.
+    if traverse.flow._current is not None:
+        live = strategy.live()
+        for lcl in live:
+            for other in live:
+                strategy.interfere(lcl, other)
+
+    return strategy.graph
+
+
+def evaluateCode(compiler, code, stats=None):
+    """Coalesce the temporaries of code.
+
+    Returns the number of locals removed.
+    """
+    if stats is None:
+        stats = CoalesceStatistics()
+
+    G = interferenceGraph(code)
+    if G is None:
+        stats.skipped += 1
+        return 0
+
+    stats.codes += 1
+    stats.candidates += len(G)
+    stats.edges += sum([len(neighbors) for neighbors in G.values()]) // 2
+
+    solution, group, numColors = colorGraph(G)
+
+    replace = {}
+    for lcls in group:
+        representative = lcls[0]
+        references = representative.annotation.references
+        for lcl in lcls[1:]:
+            references = mergeContextualAnnotation(
+                references, lcl.annotation.references
+            )
+            replace[lcl] = representative
+
+        if len(lcls) > 1 and references is not None:
+            representative.rewriteAnnotation(references=references)
+
+    rewrite.rewrite(compiler, code, replace)
+    return len(replace)
+
+
+def evaluate(compiler, prgm):
+    with compiler.console.scope("coalesce locals"):
+        stats = CoalesceStatistics()
+
+        for code in prgm.liveCode:
+            if not code.isStandardCode() or code.annotation.descriptive:
+                continue
+
+            ops, lcls = getOps(code)
+            stats.before += len(lcls)
+            evaluateCode(compiler, code, stats)
+            ops, lcls = getOps(code)
+            stats.after += len(lcls)
+
+        stats.output(compiler.console)
+        return stats
@@ -14,11 +14,15 @@ The optimization:
 This is a whole-program optimization that requires call graph information.
 """
 
+import time
+
 from pyflow.util.typedispatch import *
 from pyflow.language.python import ast
 
 import pyflow.optimization.simplify as simplify
 
+from pyflow import config
+from pyflow.analysis import programculler
 from pyflow.analysis.astcollector import getOps
 
 
@@ -136,6 +140,207 @@ class CodeInliningAnalysis(TypeDispatcher):
         self.numOps[node] = self.ops
 
 
+class CallSite(object):
+    """A call that could be replaced by the body of its only target."""
+
+    __slots__ = "caller", "op", "callee", "frequency", "folding", "cost", "priority"
+
+    def __init__(self, caller, op, callee, frequency, folding):
+        self.caller = caller
+        self.op = op
+        self.callee = callee
+        self.frequency = frequency
+        self.folding = folding
+        self.cost = 0
+        self.priority = 0.0
+
+
+class InliningCostModel(object):
+    """Chooses call sites to inline under a global code growth budget.
+
+    Code size is measured in ops.  Inlining a site grows the program by the
+    size of the callee, less the call itself, unless the site is the only
+    use of the callee, which then becomes dead.  Uses are counted over every
+    live op invoking the callee, including the calls that cannot be
+    inlined.  Sites are ranked by
+    frequency (the caller contexts that reach them) and folding benefit
+    (constant arguments) per op of growth, and admitted in that order until
+    the budget is spent.
+
+    The plan uses estimated sizes.  The transform charges the real size of
+    each callee as it inlines, so the budget holds even when the estimates
+    are off.
+
+    Args:
+        analysis: CodeInliningAnalysis instance
+        prgm: Program being optimized
+        growth: Allowed growth as a fraction of the live program's ops, or
+            None to inline everything feasible
+    """
+
+    def __init__(self, analysis, prgm, growth):
+        self.analysis = analysis
+        self.entryCode = prgm.interface.entryCode()
+        self.growth = growth
+
+        self.size = {}
+        self.sites = []
+        self.uses = {}
+
+        self.admitted = set()
+        self.limit = None
+        self.spent = 0
+
+        self.opsBefore = 0
+        self.opsAfter = 0
+        self.inlined = 0
+        self.notPlanned = 0
+        self.overBudget = 0
+        self.simplifyTime = 0.0
+
+    def codeSize(self, code):
+        ops, lcls = getOps(code)
+        return len(ops)
+
+    def collect(self, liveCode):
+        for code in liveCode:
+            self.size[code] = self.codeSize(code)
+
+        for code in liveCode:
+            ops, lcls = getOps(code)
+            for op in ops:
+                # Every invocation keeps its targets alive, whether or not
+                # it can be inlined itself.
+                for callee in self.invoked(op):
+                    self.uses[callee] = self.uses.get(callee, 0) + 1
+
+            if code.isStandardCode() and not code.annotation.descriptive:
+                for op in ops:
+                    site = self.callSite(code, op)
+                    if site is not None:
+                        self.sites.append(site)
+
+        self.opsBefore = sum(self.size.values())
+
+    def invoked(self, op):
+        invokes = op.annotation.invokes
+        if invokes is None:
+            return ()
+        return set([code for code, context in invokes[0]])
+
+    def callSite(self, code, op):
+        if isinstance(op, ast.Call):
+            selfarg = op.expr
+        elif isinstance(op, ast.DirectCall):
+            selfarg = op.selfarg
+        else:
+            return None
+
+        if op.kargs or op.vargs or op.kwds:
+            return None
+
+        invokes = op.annotation.invokes
+        if invokes is None:
+            return None
+
+        callee = None
+        frequency = 0
+        for invs in invokes[1]:
+            for dst, context in invs:
+                if callee is None:
+                    callee = dst
+                elif callee is not dst:
+                    return None
+            if invs:
+                frequency += 1
+
+        if callee is None or callee is code or not self.analysis.canInline[callee]:
+            return None
+
+        folding = 0
+        for arg in [selfarg] + list(op.args):
+            if isinstance(arg, ast.Existing):
+                folding += 1
+
+        return CallSite(code, op, callee, frequency, folding)
+
+    def growthOf(self, callee, size):
+        if self.uses.get(callee) == 1 and callee not in self.entryCode:
+            # The callee dies once its only caller absorbs it.
+            return -1
+        return size - 1
+
+    def plan(self, liveCode):
+        """Select the call sites to inline, in priority order."""
+        self.collect(liveCode)
+
+        for site in self.sites:
+            site.cost = self.growthOf(site.callee, self.size[site.callee])
+            site.priority = (
+                site.frequency * (1.0 + site.folding) / (1.0 + max(site.cost, 0))
+            )
+
+        if self.growth is None:
+            self.admitted = set([site.op for site in self.sites])
+            return
+
+        self.limit = self.growth * self.opsBefore
+
+        size = dict(self.size)
+        estimated = 0
+        ranked = sorted(
+            enumerate(self.sites), key=lambda item: (-item[1].priority, item[0])
+        )
+        for index, site in ranked:
+            # Callees may have grown from sites admitted earlier.
+            cost = self.growthOf(site.callee, size[site.callee])
+            if estimated + cost <= self.limit:
+                estimated += cost
+                size[site.caller] += size[site.callee] - 1
+                self.admitted.add(site.op)
+
+    def charge(self, op, callee):
+        """Account for inlining callee at op; False if it may not be inlined."""
+        if op not in self.admitted:
+            self.notPlanned += 1
+            return False
+
+        if self.limit is not None:
+            cost = self.growthOf(callee, self.codeSize(callee))
+            if self.spent + cost > self.limit:
+                self.overBudget += 1
+                return False
+
+            self.spent += cost
+
+        self.inlined += 1
+        return True
+
+    def finish(self, prgm):
+        live = programculler.makeCGF(prgm.interface).liveFunc
+        self.opsAfter = sum([self.codeSize(code) for code in live])
+
+    def output(self, console):
+        console.output("call sites      %d" % len(self.sites))
+        console.output(
+            "inlined         %d (%d not planned, %d over budget)"
+            % (self.inlined, self.notPlanned, self.overBudget)
+        )
+        if self.limit is None:
+            console.output("budget          unbounded")
+        else:
+            console.output("budget          %.1f ops, %d spent" % (self.limit, self.spent))
+
+        if self.opsBefore:
+            change = 100.0 * (self.opsAfter - self.opsBefore) / self.opsBefore
+        else:
+            change = 0.0
+        console.output(
+            "ops             %d -> %d (%+.1f%%)" % (self.opsBefore, self.opsAfter, change)
+        )
+        console.output("simplify time   %.3f s" % self.simplifyTime)
+
+
 class OpInliningTransform(TypeDispatcher):
     """Transforms code for inlining at a specific call site.
     
@@ -254,11 +459,12 @@ class CodeInliningTransform(TypeDispatcher):
         prgm: Program being optimized
         intrinsics: Intrinsic rewriter (for future use)
     """
-    def __init__(self, analysis, compiler, prgm, intrinsics):
+    def __init__(self, analysis, compiler, prgm, intrinsics, model):
         self.analysis = analysis
         self.compiler = compiler
         self.prgm = prgm
         self.intrinsics = intrinsics
+        self.model = model
         self.opinline = OpInliningTransform(analysis)
         self.processed = set()
         self.trace = set()
@@ -272,7 +478,6 @@ class CodeInliningTransform(TypeDispatcher):
     @dispatch(
         ast.Suite,
         list,
-        ast.Condition,
         ast.Switch,
         ast.For,
         ast.While,
@@ -300,6 +505,18 @@ class CodeInliningTransform(TypeDispatcher):
     def visitInlineLeaf(self, node, returnargs=None):
         return node
 
+    @dispatch(ast.Condition)
+    def visitCondition(self, node):
+        # The conditional is used as a value, so a call there cannot be
+        # replaced with statements.
+        preamble = self(node.preamble)
+        if isinstance(node.conditional, (ast.Call, ast.DirectCall, ast.MethodCall)):
+            self.processInvocations(node.conditional)
+
+        result = ast.Condition(preamble, node.conditional)
+        result.annotation = node.annotation
+        return result
+
     @dispatch(ast.Assign)
     def visitAssign(self, node):
         result = self(node.expr, node.lcls)
@@ -405,6 +622,9 @@ class CodeInliningTransform(TypeDispatcher):
             # 			print(node.code.annotation.origin)
             return None
 
+        if not self.model.charge(node, allCode):
+            return None
+
         # Eliminate the call
         self.analysis.numOps[self.code] -= 1
 
@@ -441,9 +661,12 @@ class CodeInliningTransform(TypeDispatcher):
                 result = self(node.ast)
                 if self.modified:
                     node.ast = result
+                    node.mutated()
                     # Always done immediately after inlining, so if we inline
                     # this function, less needs to be processed.
+                    start = time.perf_counter()
                     simplify.evaluateCode(self.compiler, self.prgm, node)
+                    self.model.simplifyTime += time.perf_counter() - start
             else:
                 ops, lcls = getOps(node)
                 for op in ops:
@@ -492,6 +715,9 @@ def evaluate(compiler, prgm):
         for code in prgm.liveCode:
             analysis.process(code)
 
+        model = InliningCostModel(analysis, prgm, config.inlineGrowth)
+        model.plan(prgm.liveCode)
+
         # Create a simple no-op intrinsic rewriter
         class NoOpIntrinsicRewriter:
             def __call__(self, strategy, node):
@@ -499,7 +725,7 @@ def evaluate(compiler, prgm):
 
         intrinsics = NoOpIntrinsicRewriter()
 
-        transform = CodeInliningTransform(analysis, compiler, prgm, intrinsics)
+        transform = CodeInliningTransform(analysis, compiler, prgm, intrinsics, model)
 
         for code in prgm.interface.entryCode():
             try:
@@ -507,3 +733,7 @@ def evaluate(compiler, prgm):
             except:
                 compiler.console.output("Failed to transform %r" % code)
                 raise
+
+        model.finish(prgm)
+        model.output(compiler.console)
+        return model
@@ -104,6 +104,7 @@ class MutateCode(TypeDispatcher):
         """
         assert node.isCode(), type(node)
         node.replaceChildren(self.strategy)
+        node.mutated()
         return node
 
 
@@ -140,6 +141,7 @@ class MutateCodeReversed(TypeDispatcher):
         """
         assert node.isCode(), type(node)
         node.replaceChildrenReversed(self.strategy)
+        node.mutated()
         return node
 
 
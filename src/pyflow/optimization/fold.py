@@ -746,6 +746,7 @@ def evaluateCode(compiler, prgm, node):
         rewrite = FoldRewrite(compiler.extractor, storeGraph, node)
         rewriteS = FoldTraverse(rewrite, node)
         node.replaceChildren(rewriteS)
+        node.mutated()
 
     # Add newly created objects to extractor's object list
     existing = set(compiler.extractor.desc.objects)
@@ -70,6 +70,7 @@ class Rewriter(TypeDispatcher):
 
     def processCode(self, code):
         code.replaceChildren(self)
+        code.mutated()
         return code
 
 
@@ -461,6 +461,7 @@ class LLTranslator(TypeDispatcher):
         self.code = node
         # Translate the AST
         node.ast = self(node.ast)
+        node.mutated()
         self.code = None
 
         # Apply optimizations
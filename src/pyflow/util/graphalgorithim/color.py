@@ -4,7 +4,10 @@ Graph coloring algorithm for undirected graphs.
 This module implements a greedy graph coloring algorithm that assigns colors
 to nodes such that no two adjacent nodes share the same color. The algorithm
 uses a heuristic that prioritizes nodes with the most remaining uncolored
-neighbors.
+neighbors.  Pending nodes are kept in a bucket queue indexed by that count,
+so choosing the next node does not scan the pending nodes.  A node that
+moves down a bucket leaves its old entry behind, and the entry is skipped
+when it reaches the front of its bucket.
 """
 
 import collections
@@ -41,6 +44,9 @@ def colorGraph(G):
     guarantee optimal coloring (minimum number of colors), but typically
     produces reasonable results efficiently.
 
+    Ties are broken in favor of the node that entered its bucket first, so
+    the coloring is deterministic for a given iteration order of G.
+
     Examples
     --------
     >>> # Simple path graph: 1-2-3
@@ -59,27 +65,38 @@ def colorGraph(G):
     constraint = collections.defaultdict(set)  # Maps node -> set of forbidden colors
     group = []  # List of color groups: group[color] = [nodes with this color]
 
-    pending = set()  # Nodes that haven't been colored yet
     remaining = {}  # Maps node -> number of uncolored neighbors
+    # Bucket queue: buckets[count] holds the pending nodes with that many
+    # uncolored neighbors, in insertion order.  Entries whose count is out of
+    # date are left in place and dropped when they surface.
+    buckets = collections.defaultdict(collections.deque)
+    maxRemain = 0
 
     # Initialize: all nodes are pending, count neighbors for each node
     for node, values in G.items():
-        remaining[node] = len(values)
-        pending.add(node)
+        count = len(values)
+        remaining[node] = count
+        buckets[count].append(node)
+        maxRemain = max(maxRemain, count)
+
+    pending = len(remaining)  # Nodes that haven't been colored yet
 
     while pending:
         # Select the next node to color using a greedy heuristic:
         # choose the node with the maximum number of remaining uncolored neighbors.
         # This heuristic helps constrain future choices and often leads to
         # better (fewer color) solutions.
-        maxRemain = -1
-        maxNode = None
-        for node in pending:
-            if remaining[node] > maxRemain:
-                maxNode = node
-                maxRemain = remaining[node]
-        assert maxNode is not None
-        pending.remove(maxNode)
+        # Counts only decrease, so the highest non-empty bucket only moves down,
+        # and an entry is current exactly when its count matches the node's.
+        while True:
+            bucket = buckets[maxRemain]
+            while bucket and remaining[bucket[0]] != maxRemain:
+                bucket.popleft()
+            if bucket:
+                break
+            maxRemain -= 1
+        maxNode = bucket.popleft()
+        pending -= 1
 
         # Determine the color for the selected node: find the lowest-numbered
         # color that is not forbidden (i.e., not used by any neighbor)
@@ -98,7 +115,11 @@ def colorGraph(G):
         group[color].append(current)
         # Update constraints for neighbors: they cannot use this color
         for other in G[current]:
-            remaining[other] -= 1  # One fewer uncolored neighbor
+            count = remaining[other]
+            if other not in solution:
+                # Move the neighbor down a bucket, the old entry goes stale
+                buckets[count - 1].append(other)
+            remaining[other] = count - 1  # One fewer uncolored neighbor
             constraint[other].add(color)  # This color is now forbidden
 
     return solution, group, numColors
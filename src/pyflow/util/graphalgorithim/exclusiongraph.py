@@ -27,11 +27,15 @@ class ExclusionGraph(object):
     ----------
     exInfo : dict
         Mapping from graph nodes to their ExclusionInfo objects
+    bits : dict
+        Mapping from path identifiers to the bits that encode them
     """
 
     def __init__(self):
         """Initialize an empty exclusion graph."""
         self.exInfo = {}
+        self.bits = {}
+        self.rootMask = self.nameBit(None)
 
     def getSwitch(self, node):
         """
@@ -75,71 +79,105 @@ class ExclusionGraph(object):
             names = [(info.switch, element) for element in info.mask]
         return names
 
-    def markSwitches(self, switch, partial, complete):
+    def nameBit(self, name):
         """
-        Mark switch information and check for conflicts while walking up switch chain.
+        Get the bit that encodes a path identifier.
 
         Parameters
         ----------
-        switch : ExclusionSwitch or None
-            The switch to process
-        partial : set
-            Set of partially marked path identifiers
-        complete : set
-            Set of completely marked path identifiers
+        name : tuple or None
+            A (switch, element) pair, or None for nodes under no switch
 
         Returns
         -------
-        bool
-            True if no conflicts found, False if a conflict is detected
+        int
+            A single bit, allocated on first use
         """
-        if switch is None:
-            return True
-
-        for name in self.infoNames(switch.info):
-            if name in complete:
-                return False
-            else:
-                partial.add(name)
-
-        # Recursively process parent switch in the dominance chain
-        if switch.idom is not None:
-            return self.markSwitches(switch.idom, partial, complete)
-        else:
-            return True
+        bit = self.bits.get(name)
+        if bit is None:
+            bit = 1 << len(self.bits)
+            self.bits[name] = bit
+        return bit
 
-    def markLeaf(self, info, partial, complete):
+    def namesMask(self, info):
         """
-        Mark a leaf node's exclusion information and check for conflicts.
+        Encode the path identifiers of exclusion information as a bitset.
 
         Parameters
         ----------
         info : ExclusionInfo or None
-            Exclusion information for the leaf node
-        partial : set
-            Set of partially marked path identifiers
-        complete : set
-            Set of completely marked path identifiers
+            Exclusion information for a node
 
         Returns
         -------
-        bool
-            True if successfully marked with no conflicts, False otherwise
+        int
+            The union of the bits of every (switch, element) pair
         """
+        mask = 0
         for name in self.infoNames(info):
-            if name in complete or name in partial:
-                return False
-            else:
-                complete.add(name)
-        return True
+            mask |= self.nameBit(name)
+        return mask
+
+    def switchMask(self, switch):
+        """
+        Encode the path identifiers of a switch and its dominating switches.
+
+        These are the paths a node under the switch partially occupies.  The
+        mask is cached on the switch.
+
+        Parameters
+        ----------
+        switch : ExclusionSwitch
+            The switch to encode
+
+        Returns
+        -------
+        int
+            The union of the bits of every switch in the dominance chain
+        """
+        if switch.path is None:
+            mask = self.namesMask(switch.info)
+            if switch.idom is not None:
+                mask |= self.switchMask(switch.idom)
+            switch.path = mask
+        return switch.path
+
+    def encode(self):
+        """Precompute the complete and partial path bitsets of every node."""
+        for info in self.exInfo.values():
+            info.complete = self.namesMask(info)
+            info.partial = self.switchMask(info.switch)
+
+    def masks(self, node):
+        """
+        Get the path bitsets of a node.
+
+        Parameters
+        ----------
+        node : any
+            A graph node
+
+        Returns
+        -------
+        tuple
+            (complete, partial) bitsets.  A node that is not under any switch
+            completely occupies the root path.
+        """
+        info = self.exInfo.get(node)
+        if info is None:
+            return self.rootMask, 0
+        else:
+            return info.complete, info.partial
 
     def mutuallyExclusive(self, *args):
         """
         Check if the given nodes are mutually exclusive.
 
         Two or more nodes are mutually exclusive if they cannot be executed
-        on the same execution path. This is determined by checking if their
-        exclusion paths conflict.
+        on the same execution path.  A node completely occupies the switch
+        branches that reach it and partially occupies the branches that reach
+        the switches above it.  The nodes conflict if one completely occupies
+        a path that another occupies in any way.
 
         Parameters
         ----------
@@ -164,23 +202,52 @@ class ExclusionGraph(object):
         if len(args) < 2:
             return True
 
-        partial = set()  # Paths partially marked (under switches)
-        complete = set()  # Paths completely marked (leaf nodes)
+        complete = 0  # Paths completely marked (leaf nodes)
+        partial = 0  # Paths partially marked (under switches)
 
         for arg in args:
-            info = self.exInfo.get(arg)
-
-            if info is not None:
-                # Mark switches in the dominance chain
-                if not self.markSwitches(info.switch, partial, complete):
-                    return False
-
-            # Mark the leaf node itself
-            if not self.markLeaf(info, partial, complete):
+            nodeComplete, nodePartial = self.masks(arg)
+            if nodePartial & complete or nodeComplete & (complete | partial):
                 return False
+            complete |= nodeComplete
+            partial |= nodePartial
 
         return True
 
+    def partition(self, nodes):
+        """
+        Partition nodes into groups of mutually exclusive nodes.
+
+        Each node is placed in the first group it is exclusive with, so the
+        grouping depends on the order of the nodes.
+
+        Parameters
+        ----------
+        nodes : iterable
+            The nodes to partition
+
+        Returns
+        -------
+        list of list
+            Groups in order of creation.  The nodes of each group are
+            mutually exclusive and keep their relative order.
+        """
+        groups = []
+        groupMasks = []
+
+        for node in nodes:
+            nodeComplete, nodePartial = self.masks(node)
+            for i, (complete, partial) in enumerate(groupMasks):
+                if not (nodePartial & complete or nodeComplete & (complete | partial)):
+                    groups[i].append(node)
+                    groupMasks[i] = (complete | nodeComplete, partial | nodePartial)
+                    break
+            else:
+                groups.append([node])
+                groupMasks.append((nodeComplete, nodePartial))
+
+        return groups
+
 
 class ExclusionSwitch(object):
     """
@@ -201,6 +268,9 @@ class ExclusionSwitch(object):
         The DJ graph node corresponding to this switch
     lut : dict
         Lookup table mapping child nodes to their path identifiers (masks)
+    path : int or None
+        Bitset of the path identifiers of this switch and the switches that
+        dominate it, once encoded
     """
 
     def __init__(self, idom, info, dj):
@@ -220,6 +290,7 @@ class ExclusionSwitch(object):
         self.idom = idom
         self.info = info
         self.dj = dj
+        self.path = None
 
     def __repr__(self):
         return "exswitch(%r)" % self.dj.node
@@ -294,6 +365,10 @@ class ExclusionInfo(object):
         The DJ graph node corresponding to this node
     mask : set
         Set of path identifiers indicating which switch branches reach this node
+    complete : int
+        Bitset of the (switch, element) pairs of the mask, once encoded
+    partial : int
+        Bitset of the path identifiers of the dominating switches, once encoded
     """
 
     def __init__(self, switch, dj):
@@ -311,6 +386,8 @@ class ExclusionInfo(object):
         self.switch = switch
         self.dj = dj
         self.mask = set()  # Path identifiers (typically branch indices)
+        self.complete = 0
+        self.partial = 0
 
     def simplify(self):
         """
@@ -552,7 +629,7 @@ class ExclusionGraphBuilder(object):
         """
         Complete the exclusion graph construction process.
 
-        Performs collection, analysis, and simplification phases.
+        Performs collection, analysis, simplification and encoding phases.
 
         Parameters
         ----------
@@ -572,6 +649,9 @@ class ExclusionGraphBuilder(object):
         for switch in self.switches.values():
             switch.simplify()
 
+        # Phase 4: Encode the paths as bitsets for exclusivity queries
+        self.exgraph.encode()
+
     def dump(self, dj, level):
         """
         Debug method to print exclusion graph structure.
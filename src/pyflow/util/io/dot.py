@@ -7,6 +7,8 @@ subgraphs, clusters, nodes, and edges with customizable attributes.
 """
 import os
 import re
+import shutil
+import subprocess
 
 __all__ = "Digraph", "Style", "createGraphic"
 
@@ -96,8 +98,10 @@ class Subgraph(object):
             fo: File object or filename string to write the DOT output to
         """
         if isinstance(fo, str):
-            fo = open(fo, "w")
-        self.outputDot(fo)
+            with open(fo, "w") as f:
+                self.outputDot(f)
+        else:
+            self.outputDot(fo)
 
     def outputDot(self, out, tabs=""):
         """
@@ -127,7 +131,7 @@ class Subgraph(object):
             dumpAttr(self.nodetype, out)
             out.write(";\n")
 
-        self.nodes.sort(key=lambda n: n.style)
+        self.nodes = groupByStyle(self.nodes)
         currentStyle = None
         for n in self.nodes:
             if currentStyle != n.style:
@@ -143,7 +147,7 @@ class Subgraph(object):
             dumpAttr(self.edgetype, out)
             out.write(";\n")
 
-        self.edges.sort(key=lambda e: e.style)
+        self.edges = groupByStyle(self.edges)
 
         directed = self.isDirected()
 
@@ -435,6 +439,25 @@ def Style(**kargs):
     return kargs
 
 
+def groupByStyle(items):
+    """
+    Order nodes or edges so that items sharing a style are adjacent.
+
+    Styles are plain dictionaries (or None) and cannot be sorted, so groups
+    are keyed on the style object and kept in order of first appearance.
+
+    Args:
+        items: Nodes or edges with a style attribute
+
+    Returns:
+        New list with the items grouped by style
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(id(item.style), []).append(item)
+    return [item for group in groups.values() for item in group]
+
+
 def dumpAttr(attr, out):
     """
     Output attributes in DOT format to the file object.
@@ -486,32 +509,38 @@ def createGraphic(g, name, format="png"):
         g: Subgraph instance to render
         name: Base name for output files (without extension)
         format: Output image format (e.g., "png", "svg", "pdf")
+
+    Returns:
+        Exit status of Graphviz, or None if it could not be found
     """
     dotfile = name + ".dot"
     g.createDotFile(dotfile)
-    compileDotFile(name, format)
+    return compileDotFile(name, format)
 
 
-def compileDotFile(name, format):
+def compileDotFile(name, format, prog="dot"):
     """
     Compile a DOT file to an image using Graphviz.
-    
-    Note: This function currently hardcodes the Windows path to Graphviz.
-    For cross-platform use, the dot executable should be located via PATH
-    or a configurable setting.
-    
+
+    The Graphviz executable is located on the PATH. When Graphviz is not
+    installed the DOT file is left in place and nothing is compiled.
+
     Args:
         name: Base name of the DOT file (without .dot extension)
         format: Output image format (e.g., "png", "svg", "pdf")
+        prog: Graphviz layout program to run (e.g., "dot", "neato")
+
+    Returns:
+        Exit status of Graphviz, or None if it could not be found
     """
     dotfile = name + ".dot"
     imagefile = name + "." + format
-    dot = r"c:\Program Files\ATT\Graphviz\bin\dot.exe"
-    # dot = r'c:\Program Files\ATT\Graphviz\bin\neato.exe'
+    exe = shutil.which(prog)
+    if exe is None:
+        return None
 
     options = ["-T" + format, "-o" + imagefile, dotfile]
-    cmd = ('"%s" ' % dot) + " ".join(options)
-    status = os.system(cmd)
+    return subprocess.call([exe] + options)
 
 
 if __name__ == "__main__":
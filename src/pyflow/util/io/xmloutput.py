@@ -115,7 +115,9 @@ class XMLOutput(object):
         self.tagStack = []
 
     def close(self):
-        """Close the output by clearing the file reference."""
+        """Close the underlying file and clear the file reference."""
+        if self.f is not None:
+            self.f.close()
         self.f = None
 
     def __lshift__(self, s):
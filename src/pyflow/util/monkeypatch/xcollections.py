@@ -178,6 +178,16 @@ class weakcache(object):
             return False
         return wr in self.data
 
+    def __len__(self):
+        """
+        Count the cached objects, including ones whose collection has not
+        been noticed yet.
+
+        Returns:
+            int: Number of entries in the cache
+        """
+        return len(self.data)
+
     def __iter__(self):
         """
         Iterate over all cached objects.
@@ -0,0 +1,92 @@
+"""
+Compare checking the calls of a large synthetic module against the call
+blacklist by scanning every BlacklistItem, as check_blacklist used to, with
+the compiled BlacklistTrie.  Wildcard patterns are added to the real
+blacklist so both paths pay for them.
+
+Run directly: PYTHONPATH=src python tests/bench_blacklist.py [calls] [wildcards]
+"""
+
+import ast
+import random
+import sys
+import time
+
+from pyflow.checker.core import blacklist, issue
+
+modules = ["os", "pickle", "random", "xml.etree.ElementTree", "json", "app.models", "Crypto.Hash.MD5"]
+functions = ["loads", "load", "random", "parse", "get", "new", "save", "run", "dumps"]
+
+
+def module(numCalls):
+    rng = random.Random(0)
+    lines = []
+    for i in range(numCalls):
+        lines.append("%s.%s(x%d)" % (rng.choice(modules), rng.choice(functions), i))
+    return "\n".join(lines) + "\n"
+
+
+def qualname(node):
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def wildcardItems(count):
+    cwe = issue.Cwe.DESERIALIZATION_OF_UNTRUSTED_DATA
+    return [
+        blacklist.BlacklistItem("wild%d" % i, "W%d" % i, cwe, ["vendor%d.*.unsafe_*" % i], "{name}")
+        for i in range(count)
+    ]
+
+
+def scan(items, names):
+    found = 0
+    for name in names:
+        for item in items:
+            if item.matches(name):
+                found += 1
+                break
+    return found
+
+
+def lookup(trie, names):
+    found = 0
+    for name in names:
+        if trie.lookup(name):
+            found += 1
+    return found
+
+
+def main(numCalls=5000, numWildcards=20):
+    tree = ast.parse(module(numCalls))
+    names = [qualname(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)]
+
+    items = blacklist.BlacklistManager().get_blacklist_items("Call") + wildcardItems(numWildcards)
+
+    start = time.perf_counter()
+    scanned = scan(items, names)
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trie = blacklist.BlacklistTrie(items)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    looked = lookup(trie, names)
+    indexed = time.perf_counter() - start
+
+    assert scanned == looked
+
+    print("calls %d, items %d, blacklisted %d" % (len(names), len(items), looked))
+    print("scan     %10.2f us/call" % (linear / len(names) * 1e6))
+    print("trie     %10.2f us/call" % (indexed / len(names) * 1e6))
+    print("build    %10.2f ms" % (build * 1e3))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,154 @@
+"""
+Compare scheduling a large generated hyperblock by scanning the whole
+wavefront for every op, as CFGResynthesis.chooseBest used to, with the
+priority-ordered Wavefront.
+
+Run directly: PYTHONPATH=src python tests/bench_cfgsynthesis.py [ops] [branch%]
+"""
+
+import random
+import sys
+import time
+
+from pyflow.analysis.cfgIR import dataflowsynthesis
+from pyflow.analysis.dataflowIR import graph
+
+
+class Op(graph.OpNode):
+    def __init__(self, hyperblock, predicate, reads=(), branch=False):
+        graph.OpNode.__init__(self, hyperblock)
+        self.branch = branch
+        self.predicate = None if predicate is None else predicate.addUse(self)
+        self.reads = [slot.addUse(self) for slot in reads]
+        self.modifies = []
+        self.predicates = []
+
+    @property
+    def canonicalpredicate(self):
+        return None if self.predicate is None else self.predicate.canonical()
+
+    def isBranch(self):
+        return self.branch
+
+    def define(self, slot):
+        slot = slot.addDefn(self)
+        if slot.isPredicate():
+            self.predicates.append(slot)
+        else:
+            self.modifies.append(slot)
+        return slot
+
+    def replaceUse(self, original, replacement):
+        if self.predicate is original:
+            self.predicate = replacement
+        else:
+            self.reads[self.reads.index(original)] = replacement
+
+    def forward(self):
+        return self.modifies + self.predicates
+
+    def reverse(self):
+        slots = list(self.reads)
+        if self.predicate is not None:
+            slots.insert(0, self.predicate)
+        return slots
+
+
+def dataflow(numOps, branchRate):
+    # Wide rather than deep: most ops read values defined near the entry, so
+    # the wavefront stays large.
+    rng = random.Random(0)
+    hyperblock = graph.Hyperblock("h")
+
+    entry = Op(hyperblock, None)
+    entryPredicate = entry.define(graph.PredicateNode(hyperblock, "p0"))
+    predicates = [entryPredicate]
+    values = [entry.define(graph.LocalNode(hyperblock)) for i in range(8)]
+
+    for i in range(numOps):
+        predicate = rng.choice(predicates)
+        reads = rng.sample(values[:16], 2)
+        if rng.random() < branchRate:
+            op = Op(hyperblock, predicate, reads, branch=True)
+            for j in range(2):
+                name = "p%d" % len(predicates)
+                predicates.append(op.define(graph.PredicateNode(hyperblock, name)))
+        else:
+            op = Op(hyperblock, predicate, reads)
+            values.append(op.define(graph.LocalNode(hyperblock)))
+
+    return [entry], hyperblock, entryPredicate
+
+
+class ScanWavefront(set):
+    def reprioritize(self, predicate):
+        pass
+
+
+class ScanResynthesis(dataflowsynthesis.CFGResynthesis):
+    # The scheduler before the wavefront was ordered.
+    def __init__(self):
+        dataflowsynthesis.CFGResynthesis.__init__(self)
+        self.wavefront = ScanWavefront()
+
+    def countDuplication(self, op):
+        if op.isPredicateOp():
+            return 0
+
+        count = 0
+        for block in self.blocks:
+            if op.canonicalpredicate in block.predicates:
+                count += 1
+        return count
+
+    def chooseBest(self):
+        best = None
+        bestcount = 0
+        for op in self.wavefront:
+            opcount = self.countDuplication(op)
+
+            if best is None or op.canonicalpredicate is None:
+                best = op
+                bestcount = opcount
+            else:
+                if op.canonicalpredicate in self.activePredicates:
+                    if (
+                        best.canonicalpredicate is not None
+                        and best.canonicalpredicate not in self.activePredicates
+                    ):
+                        best = op
+                        bestcount = opcount
+                    elif best.isBranch() and not op.isBranch():
+                        best = op
+                        bestcount = opcount
+                    elif opcount < bestcount:
+                        best = op
+                        bestcount = opcount
+
+        self.wavefront.remove(best)
+        return best
+
+
+def run(cls, args):
+    cfgr = cls()
+    start = time.perf_counter()
+    entryBlock, blocks = cfgr.gatherInfo(*args)
+    elapsed = time.perf_counter() - start
+    return cfgr, blocks, elapsed
+
+
+def main(numOps=2000, branchPercent=1):
+    for size in (numOps // 4, numOps // 2, numOps):
+        args = dataflow(size, branchPercent / 100.0)
+        scan, scanBlocks, scanTime = run(ScanResynthesis, args)
+        cfgr, blocks, ordered = run(dataflowsynthesis.CFGResynthesis, args)
+        assert len(scan.scheduled) == len(cfgr.scheduled)
+
+        print(
+            "ops %6d, blocks %5d   scan %10.2f ms   ordered %10.2f ms"
+            % (len(cfgr.scheduled), len(blocks), scanTime * 1e3, ordered * 1e3)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
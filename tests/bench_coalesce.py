@@ -0,0 +1,133 @@
+"""
+Coalesce the temporaries of a large generated function, report how many
+locals are left, and compare the time dead code elimination takes on the
+function before and after.  Coloring the interference graph by scanning
+the pending nodes, as colorGraph used to, is compared with the bucket
+queue.  The bucket queue is also timed on edgeless and path graphs of
+growing size, the sparse graphs coalescing produces, where its time should
+grow linearly.
+
+Run directly: PYTHONPATH=src python tests/bench_coalesce.py [statements] [live]
+"""
+
+import collections
+import random
+import sys
+import time
+
+from pyflow.language.python import ast
+from pyflow.analysis.astcollector import getOps
+from pyflow.util.graphalgorithim.color import colorGraph
+from pyflow.optimization import coalesce, dce
+
+
+def call(g, args):
+    op = ast.Call(g, args, [], None, None)
+    op.annotation = op.annotation.rewrite(reads=((), ()), modifies=((), ()))
+    return op
+
+
+def makeCode(numStatements, numLive):
+    # Every statement reads a few recently defined temporaries, so at most
+    # numLive of them are live at once.
+    rng = random.Random(0)
+    a = ast.Local("a")
+    g = ast.Local("g")
+    r = ast.Local("r")
+
+    recent = [a]
+    blocks = []
+    for i in range(numStatements):
+        t = ast.Local("t%d" % i)
+        args = rng.sample(recent, min(len(recent), 2))
+        blocks.append(ast.Assign(call(g, args), [t]))
+        recent = (recent + [t])[-numLive:]
+
+    blocks.append(ast.Assign(call(g, recent), [r]))
+    blocks.append(ast.Return([r]))
+    params = ast.CodeParameters(None, [a, g], ["a", "g"], [], None, None, [r])
+    return ast.Code("f", params, ast.Suite(blocks))
+
+
+def scanColorGraph(G):
+    # The coloring before the bucket queue.
+    solution = {}
+    numColors = 0
+    constraint = collections.defaultdict(set)
+    group = []
+
+    pending = set(G)
+    remaining = dict([(node, len(values)) for node, values in G.items()])
+
+    while pending:
+        maxRemain = -1
+        maxNode = None
+        for node in pending:
+            if remaining[node] > maxRemain:
+                maxNode = node
+                maxRemain = remaining[node]
+        pending.remove(maxNode)
+
+        for color in range(numColors):
+            if color not in constraint[maxNode]:
+                break
+        else:
+            color = numColors
+            numColors += 1
+            group.append([])
+
+        solution[maxNode] = color
+        group[color].append(maxNode)
+        for other in G[maxNode]:
+            remaining[other] -= 1
+            constraint[other].add(color)
+
+    return solution, group, numColors
+
+
+def sparseGraphs(numNodes):
+    empty = dict([(i, []) for i in range(numNodes)])
+    path = dict(
+        [(i, [j for j in (i - 1, i + 1) if 0 <= j < numNodes]) for i in range(numNodes)]
+    )
+    return [("empty", empty), ("path", path)]
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(numStatements=4000, numLive=8):
+    G = coalesce.interferenceGraph(makeCode(numStatements, numLive))
+    scanned, scan = timeit(scanColorGraph, G)
+    colored, bucket = timeit(colorGraph, G)
+
+    print("candidates %d, colors %d (scan %d)" % (len(G), colored[2], scanned[2]))
+    print("color scan    %10.2f ms" % (scan * 1e3))
+    print("color bucket  %10.2f ms" % (bucket * 1e3))
+
+    for numNodes in (20000, 40000, 80000):
+        for name, sparse in sparseGraphs(numNodes):
+            result, elapsed = timeit(colorGraph, sparse)
+            print("color %-5s %6d %10.2f ms" % (name, numNodes, elapsed * 1e3))
+
+    original = makeCode(numStatements, numLive)
+    code = makeCode(numStatements, numLive)
+    removed, elapsed = timeit(coalesce.evaluateCode, None, code)
+
+    before = len(getOps(original)[1])
+    after = len(getOps(code)[1])
+    assert before - after == removed
+
+    print("locals        %10d -> %d" % (before, after))
+    print("coalesce      %10.2f ms" % (elapsed * 1e3))
+
+    for name, c in (("original", original), ("coalesced", code)):
+        result, elapsed = timeit(dce.evaluateCode, None, c)
+        print("dce %-9s %10.2f ms" % (name, elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""
+Compare the validating (debug) and compiled lifetime analysis containers.
+
+Run directly: PYTHONPATH=src python tests/bench_database.py [rounds]
+"""
+
+import sys
+import time
+
+from pyflow.analysis import lifetimeanalysis
+from pyflow.analysis.lifetimeanalysis.database import base
+from pyflow.language.python import ast
+
+
+class Code(object):
+    def isCode(self):
+        return True
+
+
+def workload(rounds, codes, ops, contexts):
+    # The access pattern of ReadModifyAnalysis and LifetimeAnalysis.createDB
+    opDB = lifetimeanalysis.opDataflowSchema.instance()
+    invokes = lifetimeanalysis.invokesSchema.instance()
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        for code in codes:
+            for op in ops:
+                for context in contexts:
+                    opDB[code][op].merge(context, (i, context))
+                    opDB[code][op][context]
+                    invokes[code][op][context].add(code, context)
+    return time.perf_counter() - start
+
+
+def main(rounds=20):
+    codes = [Code() for i in range(20)]
+    ops = [ast.Local("op%d" % i) for i in range(20)]
+    contexts = list(range(10))
+    accesses = rounds * len(codes) * len(ops) * len(contexts)
+
+    results = {}
+    for debug in (True, False):
+        base.debug = debug
+        results[debug] = workload(rounds, codes, ops, contexts)
+        print(
+            "%-8s %8.3fs  %9d accesses/s"
+            % ("debug" if debug else "compiled", results[debug], accesses / results[debug])
+        )
+    base.debug = False
+    print("speedup  %8.2fx" % (results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,179 @@
+"""
+Time ordering a large generated dataflow graph with the dict and set based
+OrderSearcher and with the array backed one, then time each dataflow
+transform three ways: walking the graph itself as it used to, with the
+ordering computed for it, and reusing an ordering that is already cached.
+The difference between the last two is the time a shared ordering saves
+that transform.
+
+Run directly: PYTHONPATH=src python tests/bench_dataflowordering.py [ops] [repeat]
+"""
+
+import random
+import sys
+import time
+
+from pyflow.language.python import ast
+from pyflow.analysis.dataflowIR import graph, ordering, predicate
+from pyflow.analysis.dataflowIR.traverse import dfs
+from pyflow.analysis.dataflowIR.transform import dce, loadelimination
+
+
+def dataflowGraph(numOps):
+    rng = random.Random(0)
+    hyperblock = graph.Hyperblock(0)
+    dataflow = graph.DataflowGraph(hyperblock)
+    dataflow.initPredicate()
+
+    values = []
+    for i in range(4):
+        slot = graph.LocalNode(hyperblock)
+        dataflow.entry.addEntry("p%d" % i, slot)
+        values.append(slot)
+
+    for i in range(numOps):
+        op = graph.GenericOp(hyperblock, ast.Allocate(ast.Local("t")))
+        op.setPredicate(dataflow.entryPredicate)
+        for j, slot in enumerate(rng.sample(values[-64:], 2)):
+            op.addLocalRead(j, slot)
+        slot = graph.LocalNode(hyperblock)
+        op.addLocalModify(None, slot)
+        if rng.random() < 0.8:
+            values.append(slot)
+
+    dataflow.exit = graph.Exit(hyperblock)
+    dataflow.exit.setPredicate(dataflow.entryPredicate)
+    for i, slot in enumerate(values[-8:]):
+        dataflow.exit.addExit(i, slot)
+    return dataflow
+
+
+class DictOrderSearcher(object):
+    # The OrderSearcher before the ordering was array backed.
+    def __init__(self):
+        self.queue = []
+        self.enqueued = set()
+        self.preorder = {}
+        self.uid = 0
+        self.order = []
+
+    def mark(self, node):
+        if node not in self.enqueued:
+            self.enqueued.add(node)
+            self.queue.append(node)
+
+    def handleNode(self, node):
+        if node not in self.preorder:
+            self.preorder[node] = self.uid
+            self.uid += 1
+            self.queue.append(node)
+            for child in node.forward():
+                self.mark(child)
+        else:
+            self.uid += 1
+            if isinstance(node, graph.OpNode):
+                self.order.append(node)
+
+    def process(self, dataflow):
+        self.mark(dataflow.entry)
+        for node in dataflow.existing.values():
+            self.mark(node)
+        self.mark(dataflow.null)
+        self.mark(dataflow.entryPredicate)
+        while self.queue:
+            self.handleNode(self.queue.pop())
+        self.order.reverse()
+        return self.order
+
+
+def searchLive(dataflow):
+    # The set based liveness search of dce.
+    live = set([dataflow.exit])
+    queue = [dataflow.exit]
+    while queue:
+        current = queue.pop()
+        for prev in current.reverse():
+            if current.isOp() and current.isExit() and prev.isField() and prev.defn.isEntry():
+                continue
+            if prev not in live:
+                live.add(prev)
+                queue.append(prev)
+    return live
+
+
+def walkLoads(dataflow):
+    loads = set()
+
+    def collect(node):
+        if isinstance(node, graph.GenericOp) and node.isLoad():
+            loads.add(node)
+
+    dfs(dataflow, collect)
+    return loads
+
+
+def walkPredicates(dataflow):
+    pgb = predicate.PredicateGraphBuilder()
+    pgb.pg.entry = dataflow.entryPredicate.canonical()
+    dfs(dataflow, pgb)
+    pgb.pg.finalize()
+    return pgb.pg
+
+
+def liveness(dataflow):
+    order = ordering.evaluateDataflow(dataflow)
+    return dce.LivenessSearcher(order).process(dataflow)
+
+
+transforms = [
+    ("dce liveness", searchLive, liveness),
+    ("collect loads", walkLoads, loadelimination.collectLoads),
+    ("predicates", walkPredicates, predicate.buildPredicateGraph),
+]
+
+
+def timeit(func, dataflow, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(dataflow)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def cold(func):
+    def run(dataflow):
+        dataflow.invalidateOrder()
+        return func(dataflow)
+
+    return run
+
+
+def main(numOps=20000, repeat=5):
+    # The graph walk used by the old passes recurses.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * numOps))
+
+    dataflow = dataflowGraph(numOps)
+    order = ordering.OrderSearcher().process(dataflow)
+    print("ops %d, nodes %d" % (len(order.ops), len(order.nodes)))
+
+    byDict = timeit(lambda d: DictOrderSearcher().process(d), dataflow, repeat)
+    byArray = timeit(lambda d: ordering.OrderSearcher().process(d), dataflow, repeat)
+    print("order dict      %10.2f ms" % (byDict * 1e3))
+    print("order array     %10.2f ms" % (byArray * 1e3))
+
+    print("%-16s %10s %10s %10s %10s" % ("transform", "walk", "cold", "cached", "saved"))
+    for name, walk, transform in transforms:
+        walked = timeit(walk, dataflow, repeat)
+        uncached = timeit(cold(transform), dataflow, repeat)
+        ordering.evaluateDataflow(dataflow)
+        cached = timeit(transform, dataflow, repeat)
+        print(
+            "%-16s %7.2f ms %7.2f ms %7.2f ms %7.2f ms"
+            % (name, walked * 1e3, uncached * 1e3, cached * 1e3, (uncached - cached) * 1e3)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
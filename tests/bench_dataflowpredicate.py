@@ -0,0 +1,104 @@
+"""
+Build the predicate graph of nested type switches, then ask whether each
+predicate holds whenever another does, once through the dominator tree and
+twice through the memoized predicate algebra.  The second pass over the
+algebra is answered from its tables.  The hit rates of the tables are
+printed at the end.
+
+Run directly: PYTHONPATH=src python tests/bench_dataflowpredicate.py [depth] [cases] [repeat]
+"""
+
+import sys
+import time
+
+from pyflow.language.python import ast
+from pyflow.analysis.dataflowIR import graph, predicate
+from pyflow.analysis.dataflowIR.convert import gatedMerge
+
+
+class Console(object):
+    def output(self, text):
+        print(text)
+
+
+def dataflowGraph(depth, cases):
+    # Switch on every case of the previous switch, and merge the cases back.
+    hyperblocks = iter(range(1000000))
+    hyperblock = graph.Hyperblock(next(hyperblocks))
+    dataflow = graph.DataflowGraph(hyperblock)
+    dataflow.initPredicate()
+
+    c = ast.Local("c")
+    slot = graph.LocalNode(hyperblock, [c])
+    dataflow.entry.addEntry("c", slot)
+
+    preds = [dataflow.entryPredicate]
+
+    def switch(pred, level):
+        g = graph.GenericOp(pred.hyperblock, ast.TypeSwitch(c, []))
+        g.setPredicate(pred)
+        g.addLocalRead(c, slot)
+        for i in range(cases):
+            p = graph.PredicateNode(pred.hyperblock, i)
+            g.predicates.append(p.addDefn(g))
+        preds.extend(g.predicates)
+
+        if level < depth:
+            children = [switch(p, level + 1) for p in g.predicates]
+        else:
+            children = g.predicates
+        merged = gatedMerge(graph.Hyperblock(next(hyperblocks)), [(p, p) for p in children])
+        preds.append(merged)
+        return merged
+
+    joined = switch(dataflow.entryPredicate, 1)
+
+    dataflow.exit = graph.Exit(joined.hyperblock)
+    dataflow.exit.setPredicate(joined)
+    return dataflow, preds
+
+
+def timeit(func, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(depth=4, cases=3, repeat=3):
+    dataflow, preds = dataflowGraph(depth, cases)
+    algebra = predicate.PredicateAlgebra()
+
+    start = time.perf_counter()
+    pg = predicate.buildPredicateGraph(dataflow, algebra)
+    built = time.perf_counter() - start
+    print("predicates %d, queries %d" % (len(preds), len(preds) ** 2))
+    print("build           %10.2f ms" % (built * 1e3))
+
+    def byDominance():
+        return [pg.dominates(dst, src) for src in preds for dst in preds]
+
+    def byImplication():
+        return [pg.implies(src, dst) for src in preds for dst in preds]
+
+    dominated = timeit(byDominance, repeat)
+    start = time.perf_counter()
+    implied = byImplication()
+    cold = time.perf_counter() - start
+    warm = timeit(byImplication, repeat)
+
+    print("dominance       %10.2f ms" % (dominated * 1e3))
+    print("implies cold    %10.2f ms" % (cold * 1e3))
+    print("implies warm    %10.2f ms" % (warm * 1e3))
+    print(
+        "related by dominance %d, by implication %d"
+        % (sum(byDominance()), sum(implied))
+    )
+    algebra.output(Console())
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,119 @@
+"""
+Compare the work escape propagation does per IPA iteration when every
+escaping object is re-marked, as objectescape.process used to, with the
+incremental propagation that only marks what changed.
+
+Run directly: PYTHONPATH=src python tests/bench_escape.py [objects] [iterations]
+"""
+
+import random
+import sys
+import time
+
+from pyflow.analysis.ipa.constraints import qualifiers
+from pyflow.analysis.ipa.escape import objectescape
+from pyflow.analysis.ipa.ipanalysis import IPAnalysis
+from pyflow.analysis.storegraph.canonicalobjects import CanonicalObjects
+from pyflow.application.context import CompilerContext
+from pyflow.language.python import program
+
+
+class Extractor(object):
+    def __init__(self):
+        self.cache = {}
+
+    def getObject(self, pyobj):
+        result = self.cache.get(pyobj)
+        if result is None:
+            result = program.Object(pyobj)
+            self.cache[pyobj] = result
+        return result
+
+
+class Signature(object):
+    code = None
+
+
+class Bench(object):
+    def __init__(self, numObjects):
+        compiler = CompilerContext(None)
+        compiler.extractor = Extractor()
+        self.canonical = CanonicalObjects()
+        self.analysis = IPAnalysis(compiler, self.canonical, None, None)
+        self.context = self.analysis.getContext(Signature())
+
+        self.fieldName = self.obj("field")
+        self.fields = []
+        for i in range(numObjects):
+            param = self.name("param%d" % i, qualifiers.DN)
+            obj = self.context.region.object(param)
+            self.fields.append(obj.field("Attribute", self.fieldName))
+        self.values = 0
+
+    def obj(self, pyobj):
+        return self.analysis.extractor.getObject(pyobj)
+
+    def name(self, pyobj, qualifier=qualifiers.HZ):
+        xtype = self.canonical.existingType(self.obj(pyobj))
+        return self.analysis.objectName(xtype, qualifier)
+
+    def grow(self, rng):
+        # An iteration of the analysis adds a value to one field.
+        field = rng.choice(self.fields)
+        field.updateValues(frozenset([self.name("value%d" % self.values)]))
+        self.values += 1
+
+
+def rescan(context):
+    # The propagation objectescape.process used before it was incremental.
+    stats = context.analysis.escapeStats
+    stats.runs += 1
+    for obj in list(context.region.objects.values()):
+        if obj.flags & objectescape.escapes and not obj.dirty:
+            stats.visited += 1
+            for slot in obj.fields.values():
+                objectescape.markValues(context, slot.values, obj.flags)
+    for param in context.returns:
+        objectescape.markValues(context, param.values, objectescape.escapeReturn)
+
+    def propagate(context, obj):
+        stats.visited += 1
+        for slot in obj.fields.values():
+            objectescape.markValues(context, slot.values, obj.flags)
+
+    context.processObjects(propagate)
+
+
+def run(process, numObjects, iterations):
+    bench = Bench(numObjects)
+    rng = random.Random(0)
+    process(bench.context)
+
+    stats = bench.analysis.escapeStats
+    visited, marked = stats.visited, stats.marked
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        bench.grow(rng)
+        process(bench.context)
+    elapsed = time.perf_counter() - start
+
+    return (
+        (stats.visited - visited) / float(iterations),
+        (stats.marked - marked) / float(iterations),
+        elapsed / iterations,
+    )
+
+
+def main(numObjects=2000, iterations=200):
+    print("objects %d, iterations %d" % (numObjects, iterations))
+    for name, process in (("rescan", rescan), ("incremental", objectescape.process)):
+        visited, marked, elapsed = run(process, numObjects, iterations)
+        print(
+            "%-12s %8.1f visited %8.1f marked %8.1f us/iteration"
+            % (name, visited, marked, elapsed * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
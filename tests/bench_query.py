@@ -0,0 +1,74 @@
+"""
+Compare answering call graph queries by rescanning the live ops, as the
+dump report used to, with the precomputed ProgramQuery indexes.
+
+Run directly: PYTHONPATH=src python tests/bench_query.py [codes] [calls]
+"""
+
+import random
+import sys
+import time
+
+from pyflow.analysis import query
+from pyflow.analysis.astcollector import getOps
+from pyflow.language.python import ast
+
+
+def program(numCodes, numCalls):
+    rng = random.Random(0)
+    codes = []
+    for i in range(numCodes):
+        a = ast.Local("a")
+        params = ast.CodeParameters(None, [a], ["a"], [], None, None, [a])
+        code = ast.Code("f%d" % i, params, ast.Suite([]))
+        code.annotation = code.annotation.rewrite(contexts=("ctx",))
+        codes.append(code)
+
+    for code in codes:
+        a = code.codeparameters.params[0]
+        for j in range(numCalls):
+            callee = rng.choice(codes)
+            op = ast.Call(ast.Local(callee.name), [a], [], None, None)
+            invs = ((callee, "ctx"),)
+            op.annotation = op.annotation.rewrite(invokes=(invs, (invs,)))
+            code.ast.blocks.append(ast.Discard(op))
+        code.mutated()
+    return codes
+
+
+def scanCallers(codes, target):
+    callers = set()
+    for code in codes:
+        for op in getOps(code)[0]:
+            invokes = op.annotation.invokes
+            if invokes is not None:
+                for dst, context in invokes[0]:
+                    if dst is target:
+                        callers.add(code)
+    return callers
+
+
+def main(numCodes=300, numCalls=20):
+    codes = program(numCodes, numCalls)
+    targets = codes[:50]
+
+    start = time.perf_counter()
+    for target in targets:
+        scanCallers(codes, target)
+    scan = (time.perf_counter() - start) / len(targets)
+
+    q = query.ProgramQuery(codes)
+    start = time.perf_counter()
+    for target in targets:
+        q.callers(target)
+    indexed = (time.perf_counter() - start) / len(targets)
+
+    print("codes %d, call sites %d" % (numCodes, numCodes * numCalls))
+    print("scan     %10.1f us/query" % (scan * 1e6))
+    print("indexed  %10.1f us/query" % (indexed * 1e6))
+    print("build    %10.1f ms" % (q.buildTime * 1e3))
+    print("memory   %10.1f KB" % (q.memory() / 1024.0))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -27,3 +27,86 @@ def test_blacklisted_call_pickle_loads(scan):
     assert hits[0].severity == "MEDIUM"
     assert hits[0].confidence == "HIGH"
     assert hits[0].lineno == 1
+
+
+def _items():
+    from pyflow.checker.core import blacklist, issue
+
+    cwe = issue.Cwe.DESERIALIZATION_OF_UNTRUSTED_DATA
+    return [
+        blacklist.BlacklistItem("exact", "X1", cwe, ["pickle.loads", "dill.load"], "{name}"),
+        blacklist.BlacklistItem("module", "X2", cwe, ["pickle.*"], "{name}"),
+        blacklist.BlacklistItem("segment", "X3", cwe, ["xml.*.parse", "yaml.load?"], "{name}"),
+        blacklist.BlacklistItem("anything", "X4", cwe, ["*.unsafe_*"], "{name}"),
+    ]
+
+
+def test_trie_returns_all_matches_in_order():
+    from pyflow.checker.core import blacklist
+
+    trie = blacklist.BlacklistTrie(_items())
+
+    def ids(qualname):
+        return [item.id for item in trie.lookup(qualname)]
+
+    assert ids("pickle.loads") == ["X1", "X2"]
+    assert ids("pickle.x.unsafe_y") == ["X2", "X4"]
+    assert ids("xml.dom.minidom.parse") == ["X3"]
+    # Without a "*" the "?" is literal.
+    assert ids("yaml.load?") == ["X3"]
+    assert ids("yaml.loads") == []
+    assert ids("yaml.load") == []
+    assert ids("pickle") == []
+    assert ids("dill.load.more") == []
+    assert ids("") == []
+
+
+def test_trie_agrees_with_fnmatch():
+    from pyflow.checker.core import blacklist
+
+    manager = blacklist.BlacklistManager()
+    items = manager.get_blacklist_items("Call") + _items()
+    trie = blacklist.BlacklistTrie(items)
+
+    names = ["pickle.loads", "pickle.dumps", "eval", "evaluate", "random.random", "a.unsafe_b"]
+    for item in items:
+        names.extend(item.qualnames)
+        names.extend(name + ".x" for name in item.qualnames)
+        names.extend(name.rsplit(".", 1)[0] for name in item.qualnames)
+
+    for name in names:
+        expected = [item for item in items if item.matches(name)]
+        assert trie.lookup(name) == expected, name
+
+
+def test_only_star_makes_a_wildcard():
+    from pyflow.checker.core import blacklist
+
+    cwe = _items()[0].cwe
+    items = [
+        blacklist.BlacklistItem("literal", "Y1", cwe, ["mod.lo?d", "mod.[ab]"], "{name}"),
+        blacklist.BlacklistItem("wildcard", "Y2", cwe, ["m?d.*"], "{name}"),
+    ]
+    trie = blacklist.BlacklistTrie(items)
+
+    def ids(qualname):
+        return [item.id for item in trie.lookup(qualname)]
+
+    assert ids("mod.lo?d") == ["Y1", "Y2"]
+    assert ids("mod.[ab]") == ["Y1", "Y2"]
+    assert ids("mod.load") == ["Y2"]
+    assert ids("mod.a") == ["Y2"]
+    assert ids("mid.load") == ["Y2"]
+
+    for name in ["mod.lo?d", "mod.[ab]", "mod.load", "mod.a", "mid.load"]:
+        assert trie.lookup(name) == [item for item in items if item.matches(name)], name
+
+
+def test_manager_recompiles_grown_blacklist():
+    from pyflow.checker.core import blacklist
+
+    manager = blacklist.BlacklistManager()
+    assert manager.get_matching_items("Call", "os.unsafe_call") == []
+
+    manager.blacklists["Call"].append(_items()[3])
+    assert [item.id for item in manager.get_matching_items("Call", "os.unsafe_call")] == ["X4"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import ast
+
+from pyflow.checker.core import context as b_context
+from pyflow.checker.core import node_visitor
+
+
+def test_node_checktypes(scan):
+    testset = scan("x = 1\n").manager.b_ts
+
+    assert testset.get_node_checktypes(ast.Call) == ("Call",)
+    assert testset.get_node_checktypes(ast.Constant) == ("Str",)
+    assert testset.get_node_checktypes(ast.BinOp) == ()
+
+
+def test_inactive_nodes_skip_context(scan, monkeypatch):
+    visited = []
+    pre_visit = node_visitor.SecurityNodeVisitor.pre_visit
+
+    def recording_pre_visit(self, node):
+        visited.append(type(node).__name__)
+        return pre_visit(self, node)
+
+    monkeypatch.setattr(node_visitor.SecurityNodeVisitor, "pre_visit", recording_pre_visit)
+    res = scan(
+        """
+        import pickle
+        def f(a, b):
+            return pickle.loads(a + b * 2)
+        """
+    )
+
+    assert len(res.by_id("B301")) == 1
+    assert "Import" in visited and "FunctionDef" in visited and "Call" in visited
+    assert "BinOp" not in visited and "Name" not in visited and "Return" not in visited
+
+
+def test_linerange_is_lazy():
+    node = ast.parse("f(\n  1,\n  2)\n").body[0].value
+    context = node_visitor.NodeContext(node=node)
+
+    assert "linerange" not in context
+    assert context.get("linerange") == [1, 2, 3]
+    assert "linerange" in context
+    assert context.get("missing") is None
+
+
+def test_derived_fields_are_shared():
+    calls = []
+
+    def compute(context):
+        calls.append(context)
+        return len(calls)
+
+    context = b_context.Context({})
+    assert context.derived("answer", compute) == 1
+    assert context.derived("answer", compute) == 1
+    assert len(calls) == 1
+
+
+def test_rule_timing(scan):
+    res = scan("pickle.loads(b'')\neval('1')\n")
+    slowest = res.manager.metrics.slowest_tests(count=100)
+    runs = dict((name, count) for name, seconds, count in slowest)
+
+    assert runs["check_blacklisted_calls"] == 2
+    assert all(seconds >= 0.0 for name, seconds, count in slowest)
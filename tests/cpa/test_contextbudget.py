@@ -0,0 +1,121 @@
+import os
+import unittest
+
+import pyflow.analysis.cpa
+import pyflow.application.program
+from pyflow import config
+from pyflow.analysis import cpasignature
+from pyflow.application.context import CompilerContext
+from pyflow.application.interface import ExistingWrapper
+from pyflow.frontend.programextractor import Extractor, extractProgram
+from pyflow.util.application.console import Console
+from pyflow.util.python import replaceGlobals
+
+
+def poly(x):
+    return x + 1
+
+
+class Capture(object):
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestContextBudget(unittest.TestCase):
+    def setUp(self):
+        self.budget = config.cpaContextBudget
+        self.widening = config.cpaContextWidening
+        self.out = open(os.devnull, "w")
+
+    def tearDown(self):
+        config.cpaContextBudget = self.budget
+        config.cpaContextWidening = self.widening
+        self.out.close()
+
+    def analyze(self, budget, widening="params", opPathLength=0):
+        config.cpaContextBudget = budget
+        config.cpaContextWidening = widening
+
+        func = replaceGlobals(poly, {})
+        compiler = CompilerContext(Console(out=self.out))
+        program = pyflow.application.program.Program()
+        program.interface.func.append((func, (ExistingWrapper(0),)))
+
+        compiler.program = program
+        compiler.extractor = Extractor(compiler)
+        extractProgram(compiler, program)
+        dataflow = pyflow.analysis.cpa.evaluate(compiler, program, opPathLength)
+
+        for code in program.liveCode:
+            if code.name == "poly":
+                return compiler, dataflow, code
+        self.fail("poly is not live")
+
+    def invoke(self, compiler, dataflow, code, values):
+        # Call the code once for each value, as a polymorphic call site would.
+        srcOp = dataflow.canonical.opContext(
+            dataflow.externalFunction,
+            dataflow.externalOp,
+            dataflow.externalFunctionContext,
+        )
+        contexts = []
+        for value in values:
+            xtype = dataflow.canonical.existingType(compiler.extractor.getObject(value))
+            contexts.append(dataflow.canonicalContext(srcOp, code, None, (xtype,)))
+        return contexts
+
+    def testUnbounded(self):
+        compiler, dataflow, code = self.analyze(None)
+        self.invoke(compiler, dataflow, code, range(1, 8))
+
+        self.assertEqual(len(dataflow.codeContexts[code]), 8)
+        self.assertFalse(dataflow.mergedContexts)
+
+    def testWidened(self):
+        compiler, dataflow, code = self.analyze(3)
+        contexts = self.invoke(compiler, dataflow, code, range(1, 8))
+
+        self.assertEqual(len(dataflow.codeContexts[code]), 4)
+        self.assertEqual(len(dataflow.mergedContexts[code]), 5)
+
+        # Every signature past the budget shares one summary context.
+        widened = contexts[-1]
+        self.assertIs(widened.signature.params[0], cpasignature.Any)
+        self.assertEqual(contexts[2:], [widened] * 5)
+
+        # Known signatures keep their own context.
+        again = self.invoke(compiler, dataflow, code, [1])
+        self.assertEqual(again, contexts[:1])
+        self.assertIsNot(contexts[0].signature.params[0], cpasignature.Any)
+
+    def testPathPolicy(self):
+        compiler, dataflow, code = self.analyze(2, "path", opPathLength=1)
+        contexts = self.invoke(compiler, dataflow, code, range(1, 5))
+
+        widened = contexts[-1]
+        self.assertEqual(len(dataflow.codeContexts[code]), 3)
+        self.assertIs(widened.signature.params[0], cpasignature.Any)
+        self.assertIs(widened.opPath, dataflow.initialOpPath())
+
+    def testReported(self):
+        compiler, dataflow, code = self.analyze(3)
+        self.invoke(compiler, dataflow, code, range(1, 8))
+
+        out = Capture()
+        dataflow.console = Console(out=out)
+        dataflow.dumpContextInfo()
+
+        text = "".join(out.lines)
+        self.assertIn("Context budget: 3 per code, widening params", text)
+        self.assertIn("1 code, 5 signatures merged", text)
+        self.assertIn("poly", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
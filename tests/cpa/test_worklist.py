@@ -0,0 +1,131 @@
+import unittest
+
+from pyflow.analysis.cpa import worklist
+from pyflow.analysis.cpa.constraints import AssignmentConstraint
+from pyflow.analysis.storegraph import canonicalobjects, storegraph
+from pyflow.application.context import CompilerContext
+from pyflow.frontend.programextractor import Extractor
+from pyflow.language.python import ast
+from pyflow.util.application.console import Console
+
+
+class Capture(object):
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def flush(self):
+        pass
+
+
+class System(object):
+    # Just enough of InterproceduralDataflow to solve assignments.
+    def __init__(self, kind):
+        compiler = CompilerContext(Console(out=Capture()))
+        self.extractor = Extractor(compiler)
+        self.canonical = canonicalobjects.CanonicalObjects()
+        self.storeGraph = storegraph.StoreGraph(self.extractor, self.canonical)
+        self.code = ast.Code(
+            "f",
+            ast.CodeParameters(None, [], [], [], None, None, []),
+            ast.Suite([]),
+        )
+
+        self.constraints = []
+        self.dirty = worklist.worklists[kind](self)
+
+    def constraint(self, constraint):
+        self.constraints.append(constraint)
+
+    def slot(self, name):
+        slotName = self.canonical.localName(self.code, ast.Local(name), None)
+        return self.storeGraph.root(slotName)
+
+    def xtype(self, value):
+        return self.canonical.existingType(self.extractor.getObject(value))
+
+    def assign(self, source, dest):
+        AssignmentConstraint(self, source, dest)
+
+
+def fanIn(kind, branches=6, tail=40):
+    """Branches of increasing length carry one type each into a long tail.
+
+    Constraints are created downstream first, as the extractor does for a
+    callee that is discovered after its uses.
+    """
+    sys = System(kind)
+
+    join = sys.slot("join")
+    tailSlots = [join] + [sys.slot("t%d" % i) for i in range(tail)]
+    for i in reversed(range(tail)):
+        sys.assign(tailSlots[i], tailSlots[i + 1])
+
+    for b in range(branches):
+        slots = [sys.slot("b%d_%d" % (b, i)) for i in range(b + 1)] + [join]
+        for i in reversed(range(len(slots) - 1)):
+            sys.assign(slots[i], slots[i + 1])
+        slots[0].initializeType(sys.xtype(b))
+
+    sys.dirty.process()
+    return sys, tailSlots[-1]
+
+
+class TestWorklist(unittest.TestCase):
+    def testSameSolution(self):
+        fifo, fifoTail = fanIn("fifo")
+        scc, sccTail = fanIn("scc")
+
+        expected = set([fifo.xtype(b) for b in range(6)])
+        self.assertEqual(set(fifoTail.refs), expected)
+        self.assertEqual(set(sccTail.refs), set([scc.xtype(b) for b in range(6)]))
+
+    def testFewerFirings(self):
+        fifo, fifoTail = fanIn("fifo")
+        scc, sccTail = fanIn("scc")
+
+        self.assertGreater(scc.dirty.rankings, 0)
+        self.assertLess(scc.dirty.firings, fifo.dirty.firings)
+        # In rank order, every assignment updates its target exactly once.
+        self.assertEqual(scc.dirty.useful, len(scc.constraints))
+        self.assertLess(scc.dirty.useful, fifo.dirty.useful)
+
+    def testCycle(self):
+        sys = System("scc")
+        sys.dirty.rankMinimum = 0
+
+        slots = [sys.slot("c%d" % i) for i in range(5)]
+        for i in range(5):
+            sys.assign(slots[i], slots[(i + 1) % 5])
+        out = sys.slot("out")
+        sys.assign(slots[3], out)
+
+        slots[0].initializeType(sys.xtype(1))
+        slots[2].initializeType(sys.xtype(2))
+        sys.dirty.process()
+
+        types = set([sys.xtype(1), sys.xtype(2)])
+        for slot in slots + [out]:
+            self.assertEqual(set(slot.refs), types)
+
+        # The cycle is ranked before the assignment that leaves it.
+        rank = sys.dirty.rank
+        cycle = set([rank[constraint] for constraint in sys.constraints[:5]])
+        self.assertEqual(len(cycle), 1)
+        self.assertLess(cycle.pop(), rank[sys.constraints[5]])
+
+    def testOutput(self):
+        sys, tail = fanIn("scc")
+        out = Capture()
+        sys.dirty.output(Console(out=out))
+
+        text = "".join(out.lines)
+        self.assertIn("Worklist:      scc", text)
+        self.assertIn("Firings:       %d" % sys.dirty.firings, text)
+        self.assertIn("Max queue:", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -104,6 +104,67 @@ class TestObjectEscape(TestIPABase):
         self.assertFlags(o1, objectescape.escapeParam | objectescape.escapeReturn)
         self.assertFlags(o2, objectescape.escapeParam)
 
+    def testIncremental(self):
+        p0 = self.local(self.context, "param0")
+        self.context.params.append(p0)
+        n = self.local(self.context, "name")
+        no = self.const("nameObj", qualifiers.HZ)
+        n.updateSingleValue(no)
+
+        o1 = self.const("o1", qualifiers.HZ)
+        o2 = self.const("o2", qualifiers.HZ)
+        o3 = self.const("o3", qualifiers.HZ)
+        t1 = self.local(self.context, "temp1", o1)
+        p0.updateSingleValue(self.const("p", qualifiers.DN))
+
+        self.context.store(t1, p0, "Attribute", n)
+        self.analysis.updateConstraints()
+        objectescape.process(self.context)
+        self.assertFlags(o1, objectescape.escapeParam)
+
+        stats = self.analysis.escapeStats
+        marked, visited = stats.marked, stats.visited
+
+        # Nothing changed, so nothing is visited again.
+        objectescape.process(self.context)
+        self.assertEqual(stats.marked, marked)
+        self.assertEqual(stats.visited, visited)
+
+        # Only the new values of a grown field are marked.
+        t1.updateValues(frozenset([o2, o3]))
+        self.analysis.updateConstraints()
+        objectescape.process(self.context)
+        self.assertFlags(o2, objectescape.escapeParam)
+        self.assertFlags(o3, objectescape.escapeParam)
+        self.assertEqual(stats.marked, marked + 2)
+        self.assertEqual(stats.runs, 3)
+
+    def testNewFlagsRemark(self):
+        p0 = self.local(self.context, "param0")
+        self.context.params.append(p0)
+        t1 = self.local(self.context, "temp1")
+        n = self.local(self.context, "name")
+        r = self.local(self.context, "return")
+        self.context.returns.append(r)
+
+        n.updateSingleValue(self.const("nameObj", qualifiers.HZ))
+        o1 = self.const("o1", qualifiers.HZ)
+        t1.updateSingleValue(o1)
+        o2 = self.const("o2", qualifiers.DN)
+        p0.updateSingleValue(o2)
+
+        self.context.store(t1, p0, "Attribute", n)
+        self.analysis.updateConstraints()
+        objectescape.process(self.context)
+        self.assertFlags(o1, objectescape.escapeParam)
+
+        # The container is returned later, so its fields gain the flag too.
+        self.context.assign(p0, r)
+        self.analysis.updateConstraints()
+        objectescape.process(self.context)
+        self.assertFlags(o2, objectescape.escapeParam | objectescape.escapeReturn)
+        self.assertFlags(o1, objectescape.escapeParam | objectescape.escapeReturn)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
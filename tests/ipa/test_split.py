@@ -0,0 +1,117 @@
+import unittest
+
+from pyflow.analysis.ipa.calling import cpa
+from .base import TestIPABase
+
+
+class A(object):
+    pass
+
+
+class B(A):
+    pass
+
+
+class C(A):
+    pass
+
+
+class D(B):
+    pass
+
+
+class TestTypeSplit(TestIPABase):
+    def setUp(self):
+        TestIPABase.setUp(self)
+        self.context = self.makeContext()
+        self.notified = 0
+
+    def notify(self):
+        self.notified += 1
+
+    def split(self, limit, policy, *pyobjs):
+        self.analysis.splitLimit = limit
+        self.analysis.splitPolicy = policy
+
+        node = self.local(self.context, "x")
+        node.attachTypeSplit(self.notify)
+
+        values = [self.const(pyobj) for pyobj in pyobjs]
+        node.updateValues(frozenset(values))
+        self.analysis.updateConstraints()
+        return node, node.typeSplit, values
+
+    def testExact(self):
+        node, split, values = self.split(4, "type", 1, "a", 2.0)
+
+        self.assertFalse(split.megamorphic)
+        self.assertEqual(len(split.types()), 3)
+        for value in values:
+            target = node.getFiltered(value.cpaType())
+            self.assertEqual(target.values, frozenset([value]))
+
+    def testMegamorphic(self):
+        node, split, values = self.split(2, "type", 1, "a", 2.0)
+
+        self.assertTrue(split.megamorphic)
+        self.assertEqual(list(split.types()), [cpa.anyType])
+        self.assertIs(node.getFiltered(cpa.anyType), node)
+        self.assertEqual(self.analysis.splitStats.megamorphic, 1)
+
+    def testUnlimited(self):
+        node, split, values = self.split(None, "type", 1, "a", 2.0, True, None, ())
+
+        self.assertFalse(split.megamorphic)
+        self.assertEqual(len(split.types()), 6)
+        self.assertEqual(self.analysis.splitStats.megamorphic, 0)
+
+    def testGroupedByBase(self):
+        node, split, values = self.split(2, "base", B(), C(), D(), A())
+
+        self.assertFalse(split.megamorphic)
+        self.assertTrue(split.grouped)
+        self.assertEqual(list(split.types()), [cpa.TypeGroup(A)])
+
+        # The group node sees every value of the group.
+        group = node.getFiltered(cpa.TypeGroup(A))
+        self.assertEqual(group.values, frozenset(values))
+        self.assertEqual(self.analysis.splitStats.grouped, 1)
+        self.assertFalse(cpa.TypeGroup(A).isExisting())
+
+    def testBoolGroupsWithInt(self):
+        self.assertEqual(
+            cpa.typeGroup(self.const(True).cpaType()),
+            cpa.typeGroup(self.const(1).cpaType()),
+        )
+
+    def testGroupsStillTooMany(self):
+        node, split, values = self.split(2, "base", 1, "a", 2.0, ())
+
+        self.assertTrue(split.megamorphic)
+        self.assertEqual(self.analysis.splitStats.megamorphic, 1)
+
+    def testContextsByKind(self):
+        group = cpa.TypeGroup(A)
+        xtype = self.const(1).cpaType()
+
+        class Signature(object):
+            def __init__(self, *params):
+                self.selfparam = None
+                self.params = params
+                self.vparams = ()
+
+        class Context(object):
+            def __init__(self, signature):
+                self.signature = signature
+
+        contexts = [
+            Context(Signature(xtype)),
+            Context(Signature(xtype, group)),
+            Context(Signature(group, cpa.anyType)),
+        ]
+        counts = self.analysis.splitStats.contextsByKind(contexts)
+        self.assertEqual(counts, {"exact": 1, "grouped": 1, "megamorphic": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
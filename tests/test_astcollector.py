@@ -0,0 +1,104 @@
+import unittest
+
+from pyflow.analysis import astcollector
+from pyflow.language.python import ast
+from pyflow.optimization import rewrite
+from pyflow.util.application.console import Console
+
+
+class TestOpIndex(unittest.TestCase):
+    def setUp(self):
+        self.a = ast.Local("a")
+        self.b = ast.Local("b")
+        self.r = ast.Local("r")
+        self.op = ast.BinaryOp(self.a, "+", self.b)
+
+        params = ast.CodeParameters(
+            None, [self.a, self.b], ["a", "b"], [], None, None, [self.r]
+        )
+        body = ast.Suite(
+            [ast.Assign(self.op, [self.r]), ast.Return([self.r])]
+        )
+        self.code = ast.Code("f", params, body)
+        astcollector.stats.reset()
+
+    def testCached(self):
+        ops, lcls = astcollector.getOps(self.code)
+        self.assertEqual(ops, (self.op,))
+        self.assertEqual(lcls, frozenset([self.a, self.b, self.r]))
+
+        again, _ = astcollector.getOps(self.code)
+        self.assertIs(again, ops)
+        self.assertEqual(astcollector.stats.misses, 1)
+        self.assertEqual(astcollector.stats.hits, 1)
+
+    def testCopies(self):
+        copy = ast.Assign(self.a, [self.r])
+        self.code.ast.blocks.append(copy)
+        self.code.mutated()
+
+        ops, lcls, copies = astcollector.getAll(self.code)
+        self.assertEqual(copies, (copy,))
+
+    def testMutated(self):
+        astcollector.getOps(self.code)
+
+        other = ast.BinaryOp(self.b, "*", self.b)
+        self.code.ast.blocks.insert(0, ast.Discard(other))
+        self.code.mutated()
+
+        ops, lcls = astcollector.getOps(self.code)
+        self.assertEqual(ops, (other, self.op))
+        self.assertEqual(astcollector.stats.invalidations, 1)
+
+    def testReplacedBody(self):
+        astcollector.getOps(self.code)
+
+        # Assigning a field directly must not return a stale index.
+        self.code.ast = ast.Suite([ast.Return([self.a])])
+        ops, lcls = astcollector.getOps(self.code)
+        self.assertEqual(ops, ())
+        self.assertEqual(lcls, frozenset([self.a, self.b, self.r]))
+
+    def testRewrite(self):
+        astcollector.getOps(self.code)
+
+        other = ast.BinaryOp(self.b, "-", self.a)
+        rewrite.rewrite(None, self.code, {self.op: other})
+
+        ops, lcls = astcollector.getOps(self.code)
+        self.assertEqual(len(ops), 1)
+        self.assertEqual(ops[0].op, "-")
+        self.assertEqual(astcollector.stats.invalidations, 1)
+
+    def testCloneIsFresh(self):
+        astcollector.getOps(self.code)
+        cloned = self.code.clone()
+        self.assertIsNone(cloned.opIndex)
+
+        ops, lcls = astcollector.getOps(cloned)
+        self.assertEqual(ops, (self.op,))
+
+    def testOutputStats(self):
+        class Capture(object):
+            def __init__(self):
+                self.lines = []
+
+            def write(self, text):
+                self.lines.append(text)
+
+            def flush(self):
+                pass
+
+        out = Capture()
+        astcollector.getOps(self.code)
+        astcollector.getOps(self.code)
+        astcollector.outputStats(Console(out=out))
+
+        text = "".join(out.lines)
+        self.assertIn("op index hits          1", text)
+        self.assertIn("50.0%", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import random
+import unittest
+
+from pyflow.analysis.cfgIR import dataflowsynthesis
+from pyflow.analysis.dataflowIR import graph
+
+
+class Op(graph.OpNode):
+    # A minimal predicated op, enough for the scheduler to walk.
+    def __init__(self, hyperblock, predicate, reads=(), branch=False):
+        graph.OpNode.__init__(self, hyperblock)
+        self.branch = branch
+        self.predicate = None if predicate is None else predicate.addUse(self)
+        self.reads = [slot.addUse(self) for slot in reads]
+        self.modifies = []
+        self.predicates = []
+
+    @property
+    def canonicalpredicate(self):
+        return None if self.predicate is None else self.predicate.canonical()
+
+    def isBranch(self):
+        return self.branch
+
+    def define(self, slot):
+        slot = slot.addDefn(self)
+        if slot.isPredicate():
+            self.predicates.append(slot)
+        else:
+            self.modifies.append(slot)
+        return slot
+
+    def replaceUse(self, original, replacement):
+        if self.predicate is original:
+            self.predicate = replacement
+        else:
+            self.reads[self.reads.index(original)] = replacement
+
+    def forward(self):
+        return self.modifies + self.predicates
+
+    def reverse(self):
+        slots = list(self.reads)
+        if self.predicate is not None:
+            slots.insert(0, self.predicate)
+        return slots
+
+
+def randomGraph(numOps, seed, branchRate=0.15):
+    rng = random.Random(seed)
+    hyperblock = graph.Hyperblock("h")
+
+    entry = Op(hyperblock, None)
+    entryPredicate = entry.define(graph.PredicateNode(hyperblock, "p0"))
+    predicates = [entryPredicate]
+    values = [entry.define(graph.LocalNode(hyperblock))]
+
+    for i in range(numOps):
+        predicate = rng.choice(predicates)
+        reads = rng.sample(values, min(len(values), rng.randint(0, 2)))
+        if rng.random() < branchRate:
+            op = Op(hyperblock, predicate, reads, branch=True)
+            for j in range(2):
+                name = "p%d" % len(predicates)
+                predicates.append(op.define(graph.PredicateNode(hyperblock, name)))
+        else:
+            op = Op(hyperblock, predicate, reads)
+            values.append(op.define(graph.LocalNode(hyperblock)))
+
+    return hyperblock, entry, entryPredicate
+
+
+class ScanWavefront(object):
+    # Chooses by scanning every op, as chooseBest used to.
+    def __init__(self, priority):
+        self.priority = priority
+        self.ops = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    def add(self, op):
+        if op not in self.ops:
+            self.ops.append(op)
+
+    def update(self, ops):
+        for op in ops:
+            self.add(op)
+
+    def pop(self):
+        best = min(range(len(self.ops)), key=lambda i: (self.priority(self.ops[i]), i))
+        return self.ops.pop(best)
+
+    def reprioritize(self, predicate):
+        pass
+
+
+class ScanResynthesis(dataflowsynthesis.CFGResynthesis):
+    def __init__(self):
+        dataflowsynthesis.CFGResynthesis.__init__(self)
+        self.wavefront = ScanWavefront(self.priority)
+
+    def countDuplication(self, op):
+        if op.isPredicateOp():
+            return 0
+
+        count = 0
+        for block in self.blocks:
+            if op.canonicalpredicate in block.predicates:
+                count += 1
+        return count
+
+
+class TestWavefront(unittest.TestCase):
+    def setUp(self):
+        self.hyperblock = graph.Hyperblock("h")
+        self.priorities = {}
+        self.wavefront = dataflowsynthesis.Wavefront(
+            lambda op: self.priorities[op.canonicalpredicate]
+        )
+
+        definer = Op(self.hyperblock, None)
+        self.a = definer.define(graph.PredicateNode(self.hyperblock, "a"))
+        self.b = definer.define(graph.PredicateNode(self.hyperblock, "b"))
+
+    def drain(self):
+        order = []
+        while self.wavefront:
+            order.append(self.wavefront.pop())
+        return order
+
+    def testFIFOWithinPriority(self):
+        self.priorities.update({self.a: 1, self.b: 0})
+        a1, a2, b1 = [Op(self.hyperblock, p) for p in (self.a, self.a, self.b)]
+        self.wavefront.update([a1, a2, b1, a1])
+        self.assertEqual(len(self.wavefront), 3)
+        self.assertEqual(self.drain(), [b1, a1, a2])
+
+    def testReprioritize(self):
+        self.priorities.update({self.a: 1, self.b: 0})
+        a, b = Op(self.hyperblock, self.a), Op(self.hyperblock, self.b)
+        self.wavefront.update([a, b])
+
+        self.priorities[self.a] = -1
+        self.wavefront.reprioritize(self.a)
+        self.assertEqual(self.drain(), [a, b])
+
+
+class TestCFGResynthesis(unittest.TestCase):
+    def schedule(self, cls, hyperblock, entry, entryPredicate):
+        cfgr = cls()
+        entryBlock, blocks = cfgr.gatherInfo([entry], hyperblock, entryPredicate)
+        return cfgr, [(block.predicates, block.ops) for block in blocks]
+
+    def testMatchesScan(self):
+        for seed in range(20):
+            args = randomGraph(150, seed)
+            cfgr, blocks = self.schedule(dataflowsynthesis.CFGResynthesis, *args)
+            scan, expected = self.schedule(ScanResynthesis, *args)
+
+            self.assertEqual(blocks, expected)
+            self.assertEqual(len(cfgr.scheduled), len(scan.scheduled))
+
+    def testBlockCount(self):
+        cfgr, blocks = self.schedule(dataflowsynthesis.CFGResynthesis, *randomGraph(200, 0))
+        self.assertGreater(len(blocks), 1)
+
+        counts = {}
+        for predicates, ops in blocks:
+            for predicate in predicates:
+                counts[predicate] = counts.get(predicate, 0) + 1
+        self.assertEqual(dict((p, c) for p, c in cfgr.blockCount.items() if c), counts)
+
+    def testEverythingScheduled(self):
+        hyperblock, entry, entryPredicate = randomGraph(200, 1)
+        cfgr, blocks = self.schedule(
+            dataflowsynthesis.CFGResynthesis, hyperblock, entry, entryPredicate
+        )
+        self.assertEqual(cfgr.scheduled, set(cfgr.depends))
+        self.assertEqual(len(cfgr.wavefront), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
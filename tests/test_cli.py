@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Modules that only the optimize/ir pipelines need.
+HEAVY = (
+    "pyflow.application.pipeline",
+    "pyflow.analysis.cpa",
+    "pyflow.analysis.ipa",
+    "pyflow.analysis.lifetimeanalysis",
+    "pyflow.optimization",
+)
+
+STARTUP = textwrap.dedent(
+    """
+    import sys, time
+    start = time.perf_counter()
+    import importlib
+    cli = importlib.import_module("pyflow.cli.main")
+    sys.argv = ["pyflow"] + sys.argv[1:]
+    try:
+        cli.main()
+    except SystemExit:
+        pass
+    elapsed = time.perf_counter() - start
+    heavy = [m for m in %r if m in sys.modules]
+    sys.stderr.write("STARTUP %%.4f %%s\\n" %% (elapsed, ",".join(heavy)))
+    """
+    % (HEAVY,)
+)
+
+
+def runStartup(*argv):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP] + list(argv),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    line = [l for l in result.stderr.splitlines() if l.startswith("STARTUP ")][-1]
+    _, elapsed, heavy = (line.split(" ") + [""])[:3]
+    return float(elapsed), [m for m in heavy.split(",") if m]
+
+
+class TestLazySubcommands(unittest.TestCase):
+    def setUp(self):
+        self.target = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "full", "simple_math.py"
+        )
+
+    def assertLight(self, *argv):
+        elapsed, heavy = runStartup(*argv)
+        self.assertEqual(
+            heavy, [], "%s imported %r (%.3fs)" % (argv[0], heavy, elapsed)
+        )
+
+    def testSecurity(self):
+        self.assertLight("security", self.target)
+
+    def testCallgraph(self):
+        self.assertLight("callgraph", self.target)
+
+    def testOptimizeListPasses(self):
+        self.assertLight("optimize", "--list-opt-passes")
+
+    def testHelp(self):
+        self.assertLight("--help")
+
+    def testParserRegistersAllCommands(self):
+        import importlib
+
+        cli = importlib.import_module("pyflow.cli.main")
+        parser = cli.build_parser()
+        for command in cli.COMMANDS:
+            args = parser.parse_args([command.name, self.target])
+            self.assertEqual(args.command, command.name)
+            self.assertTrue(callable(command.get_handler()))
+
+
+if __name__ == "__main__":
+    unittest.main()
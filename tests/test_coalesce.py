@@ -0,0 +1,143 @@
+import unittest
+
+from pyflow.language.python import ast
+from pyflow.optimization import coalesce
+from pyflow.analysis.astcollector import getOps
+
+
+class TestCoalesce(unittest.TestCase):
+    def setUp(self):
+        self.a = ast.Local("a")
+        self.r = ast.Local("r")
+
+    def makeCode(self, blocks):
+        params = ast.CodeParameters(None, [self.a], ["a"], [], None, None, [self.r])
+        return ast.Code("f", params, ast.Suite(blocks))
+
+    def call(self, *args):
+        op = ast.Call(ast.Local("g"), list(args), [], None, None)
+        op.annotation = op.annotation.rewrite(reads=((), ()), modifies=((), ()))
+        return op
+
+    def condition(self, lcl):
+        return ast.Condition(ast.Suite([]), self.call(lcl))
+
+    def coalesce(self, code):
+        before = len(getOps(code)[1])
+        removed = coalesce.evaluateCode(None, code)
+        self.assertEqual(len(getOps(code)[1]), before - removed)
+        return removed
+
+    def testChain(self):
+        t = [ast.Local("t%d" % i) for i in range(4)]
+        blocks = [ast.Assign(ast.Allocate(self.a), [t[0]])]
+        for i in range(1, 4):
+            blocks.append(ast.Assign(ast.Allocate(t[i - 1]), [t[i]]))
+        blocks.append(ast.Assign(t[3], [self.r]))
+        blocks.append(ast.Return([self.r]))
+        code = self.makeCode(blocks)
+
+        G = coalesce.interferenceGraph(code)
+        self.assertEqual(list(G), t)
+        self.assertFalse(any(G.values()))
+
+        self.assertEqual(self.coalesce(code), 3)
+        ops, lcls = getOps(code)
+        self.assertEqual(lcls, set([self.a, self.r, t[0]]))
+
+    def testOverlapping(self):
+        t0, t1 = ast.Local("t0"), ast.Local("t1")
+        blocks = [
+            ast.Assign(ast.Allocate(self.a), [t0]),
+            ast.Assign(ast.Allocate(self.a), [t1]),
+            ast.Assign(self.call(t0, t1), [self.r]),
+            ast.Return([self.r]),
+        ]
+        code = self.makeCode(blocks)
+
+        G = coalesce.interferenceGraph(code)
+        self.assertEqual(G[t0], set([t1]))
+        self.assertEqual(self.coalesce(code), 0)
+
+    def testParametersKept(self):
+        t = ast.Local("t")
+        blocks = [
+            ast.Assign(ast.Allocate(self.a), [t]),
+            ast.Assign(self.call(t), [self.a]),
+            ast.Assign(self.a, [self.r]),
+            ast.Return([self.r]),
+        ]
+        code = self.makeCode(blocks)
+
+        self.assertEqual(list(coalesce.interferenceGraph(code)), [t])
+        self.assertEqual(self.coalesce(code), 0)
+
+    def testSwitch(self):
+        x, t, u = ast.Local("x"), ast.Local("t"), ast.Local("u")
+        blocks = [
+            ast.Assign(ast.Allocate(self.a), [x]),
+            ast.Switch(
+                self.condition(self.a),
+                ast.Suite([ast.Assign(ast.Allocate(x), [t]), ast.Assign(t, [self.r])]),
+                ast.Suite([ast.Assign(ast.Allocate(x), [u]), ast.Assign(u, [self.r])]),
+            ),
+            ast.Assign(self.call(x, self.r), [self.r]),
+            ast.Return([self.r]),
+        ]
+        code = self.makeCode(blocks)
+
+        G = coalesce.interferenceGraph(code)
+        self.assertEqual(G[x], set([t, u]))
+        self.assertEqual(G[t], set([x]))
+
+        # The branch temporaries share a slot, x is live across both.
+        self.assertEqual(self.coalesce(code), 1)
+        ops, lcls = getOps(code)
+        self.assertIn(x, lcls)
+        self.assertEqual(len(lcls & set([t, u])), 1)
+
+    def testLoop(self):
+        x, t, y = ast.Local("x"), ast.Local("t"), ast.Local("y")
+        blocks = [
+            ast.Assign(ast.Allocate(self.a), [x]),
+            ast.While(
+                self.condition(x),
+                ast.Suite([ast.Assign(ast.Allocate(x), [t]), ast.Assign(self.call(t), [y])]),
+                ast.Suite([]),
+            ),
+            ast.Assign(x, [self.r]),
+            ast.Return([self.r]),
+        ]
+        code = self.makeCode(blocks)
+
+        # x is live around the back edge, so it overlaps the body temporaries.
+        G = coalesce.interferenceGraph(code)
+        self.assertEqual(G[x], set([t, y]))
+        self.coalesce(code)
+
+        ops, lcls = getOps(code)
+        self.assertIn(x, lcls)
+        self.assertEqual(len(lcls & set([t, y])), 1)
+
+    def testUseBeforeDefinition(self):
+        # On the path that skips the switch, x is read undefined.
+        x, t = ast.Local("x"), ast.Local("t")
+        blocks = [
+            ast.Assign(ast.Allocate(self.a), [t]),
+            ast.Switch(
+                self.condition(t),
+                ast.Suite([ast.Assign(ast.Allocate(self.a), [x])]),
+                ast.Suite([]),
+            ),
+            ast.Assign(x, [self.r]),
+            ast.Return([self.r]),
+        ]
+        code = self.makeCode(blocks)
+
+        G = coalesce.interferenceGraph(code)
+        self.assertIn(t, G[x])
+        self.assertEqual(self.coalesce(code), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
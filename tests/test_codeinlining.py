@@ -0,0 +1,162 @@
+import unittest
+
+from pyflow.language.python import ast, program
+from pyflow.optimization import codeinlining
+
+
+class Interface(object):
+    def __init__(self, entry):
+        self.entry = entry
+
+    def entryCode(self):
+        return frozenset(self.entry)
+
+
+class Program(object):
+    def __init__(self, entry):
+        self.interface = Interface(entry)
+
+
+class TestInliningCostModel(unittest.TestCase):
+    def makeCode(self, name, numOps, calls=(), contexts=1):
+        a = ast.Local("a")
+        r = ast.Local("r")
+        blocks = []
+        for i in range(numOps):
+            blocks.append(ast.Assign(ast.Allocate(a), [a]))
+
+        for callee, frequency, args in calls:
+            op = ast.Call(ast.Local(callee.name), list(args), [], None, None)
+            invs = [((callee, "ctx"),)] * frequency + [()] * (contexts - frequency)
+            invokes = (((callee, "ctx"),), tuple(invs))
+            op.annotation = op.annotation.rewrite(invokes=invokes)
+            blocks.append(ast.Assign(op, [r]))
+
+        blocks.append(ast.Return([r]))
+        params = ast.CodeParameters(None, [a], ["a"], [], None, None, [r])
+        code = ast.Code(name, params, ast.Suite(blocks))
+        return code
+
+    def plan(self, codes, growth, entry):
+        analysis = codeinlining.CodeInliningAnalysis()
+        for code in codes:
+            analysis.process(code)
+        model = codeinlining.InliningCostModel(analysis, Program(entry), growth)
+        model.plan(codes)
+        return model
+
+    def sites(self, model):
+        return dict([(site.callee.name, site) for site in model.sites])
+
+    def admitted(self, model):
+        return set([site.callee.name for site in model.sites if site.op in model.admitted])
+
+    def testUnbounded(self):
+        big = self.makeCode("big", 20)
+        small = self.makeCode("small", 1)
+        main = self.makeCode("main", 1, [(big, 1, ()), (small, 1, ())])
+        model = self.plan([main, big, small], None, [main, big, small])
+
+        self.assertEqual(self.admitted(model), set(["big", "small"]))
+        self.assertIsNone(model.limit)
+
+    def testCheapestFirst(self):
+        big = self.makeCode("big", 20)
+        small = self.makeCode("small", 2)
+        main = self.makeCode("main", 10, [(big, 1, ()), (small, 1, ())])
+        model = self.plan([main, big, small], 0.1, [main, big, small])
+
+        sites = self.sites(model)
+        self.assertGreater(sites["small"].priority, sites["big"].priority)
+        self.assertEqual(self.admitted(model), set(["small"]))
+
+    def testFrequencyAndFolding(self):
+        hot = self.makeCode("hot", 4)
+        cold = self.makeCode("cold", 4)
+        folded = self.makeCode("folded", 4)
+        main = self.makeCode(
+            "main",
+            2,
+            [
+                (hot, 3, ()),
+                (cold, 1, ()),
+                (folded, 1, (ast.Existing(program.Object(3)), ast.Existing(program.Object(5)))),
+            ],
+            contexts=3,
+        )
+        model = self.plan([main, hot, cold, folded], None, [main, hot, cold, folded])
+
+        sites = self.sites(model)
+        self.assertEqual(sites["folded"].folding, 2)
+        self.assertEqual(sites["hot"].frequency, 3)
+        self.assertGreater(sites["hot"].priority, sites["cold"].priority)
+        self.assertGreater(sites["folded"].priority, sites["cold"].priority)
+
+    def testSoleCaller(self):
+        # A callee with one caller is free to inline, as it dies afterwards.
+        helper = self.makeCode("helper", 30)
+        main = self.makeCode("main", 2, [(helper, 1, ())])
+        model = self.plan([main, helper], 0.0, [main])
+
+        self.assertEqual(self.sites(model)["helper"].cost, -1)
+        self.assertEqual(self.admitted(model), set(["helper"]))
+
+    def testIneligibleCaller(self):
+        # A call with *args cannot be inlined, but keeps the helper alive.
+        helper = self.makeCode("helper", 30)
+        main = self.makeCode("main", 2, [(helper, 1, ())])
+        other = self.makeCode("other", 2, [(helper, 1, ())])
+        call = other.ast.blocks[-2].expr
+        call.vargs = ast.Local("v")
+        model = self.plan([main, other, helper], 0.0, [main, other])
+
+        self.assertEqual(model.uses[helper], 2)
+        self.assertEqual([site.caller for site in model.sites], [main])
+        self.assertEqual(self.sites(model)["helper"].cost, 29)
+        self.assertEqual(self.admitted(model), set())
+
+    def testPolymorphicCaller(self):
+        helper = self.makeCode("helper", 30)
+        alternate = self.makeCode("alternate", 3)
+        main = self.makeCode("main", 2, [(helper, 1, ())])
+        other = self.makeCode("other", 2, [(helper, 1, ())])
+        call = other.ast.blocks[-2].expr
+        targets = ((helper, "ctx"), (alternate, "ctx"))
+        call.annotation = call.annotation.rewrite(invokes=(targets, (targets,)))
+        model = self.plan([main, other, helper, alternate], 0.0, [main, other])
+
+        self.assertEqual(model.uses[helper], 2)
+        self.assertEqual(model.uses[alternate], 1)
+        self.assertEqual(self.sites(model)["helper"].cost, 29)
+
+    def testGrownCallee(self):
+        callee = self.makeCode("callee", 2)
+        main = self.makeCode("main", 4, [(callee, 1, ()), (callee, 1, ())])
+        model = self.plan([main, callee], 0.5, [main])
+        self.assertEqual(len(model.admitted), 2)
+
+        # The callee grew after planning, so only the first site still fits.
+        a = callee.codeparameters.params[0]
+        for i in range(3):
+            callee.ast.blocks.insert(0, ast.Discard(ast.Allocate(a)))
+        callee.mutated()
+
+        first, second = model.sites
+        self.assertTrue(model.charge(first.op, callee))
+        self.assertFalse(model.charge(second.op, callee))
+        self.assertEqual(model.inlined, 1)
+        self.assertEqual(model.overBudget, 1)
+        self.assertLessEqual(model.spent, model.limit)
+
+    def testNotPlanned(self):
+        callee = self.makeCode("callee", 2)
+        main = self.makeCode("main", 1, [(callee, 1, ())])
+        model = self.plan([main, callee], 0.5, [main, callee])
+
+        other = ast.Call(ast.Local("x"), [], [], None, None)
+        self.assertFalse(model.charge(other, callee))
+        self.assertEqual(model.notPlanned, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
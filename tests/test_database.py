@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import unittest
 
 
+import pyflow.analysis.lifetimeanalysis.database.base as base
 import pyflow.analysis.lifetimeanalysis.database.structure as structure
 import pyflow.analysis.lifetimeanalysis.database.tupleset as tupleset
 import pyflow.analysis.lifetimeanalysis.database.mapping as mapping
@@ -261,5 +262,81 @@ class TestMapMapForget(unittest.TestCase):
         self.assertEqual(f, set((1, 2, 3, 4, 5)))
 
 
+class DebugModeMixin(object):
+    def setUp(self):
+        self.oldDebug = base.debug
+        base.debug = True
+        super(DebugModeMixin, self).setUp()
+
+    def tearDown(self):
+        base.debug = self.oldDebug
+
+
+class TestDebugTupleSet(DebugModeMixin, TestTupleSet):
+    pass
+
+
+class TestDebugMapping(DebugModeMixin, TestMapping):
+    pass
+
+
+class TestDebugMapMapForget(DebugModeMixin, TestMapMapForget):
+    pass
+
+
+class TestCompiledMode(unittest.TestCase):
+    def setUp(self):
+        intSchema = structure.TypeSchema(int)
+        self.schema = mapping.MappingSchema(
+            intSchema, mapping.MappingSchema(intSchema, lattice.setUnionSchema)
+        )
+        self.oldDebug = base.debug
+
+    def tearDown(self):
+        base.debug = self.oldDebug
+
+    def testValidation(self):
+        base.debug = True
+        m = self.schema.instance()
+        self.assertRaises(structure.base.SchemaError, m.__getitem__, "a")
+        self.assertRaises(structure.base.SchemaError, m[1].merge, 2.0, (1,))
+
+        base.debug = False
+        m = self.schema.instance()
+        self.assertIsInstance(m, mapping.CompiledMapping)
+        self.assertIsInstance(m[1], mapping.CompiledMapping)
+        m["a"].merge(2.0, (1,))
+        self.assertEqual(m["a"][2.0], set((1,)))
+
+    def testUnionMerge(self):
+        base.debug = False
+        m = self.schema.instance()[1]
+
+        self.assertEqual(m.merge(1, ()), False)
+        self.assertEqual(m[1], None)
+        self.assertEqual(m.merge(1, (1, 2)), True)
+        self.assertEqual(m.merge(1, (2,)), False)
+        self.assertEqual(m.merge(1, (3,)), True)
+        self.assertEqual(m[1], set((1, 2, 3)))
+
+        # The merged value is copied, not aliased.
+        value = set((4,))
+        m.merge(2, value)
+        value.add(5)
+        self.assertEqual(m[2], set((4,)))
+
+    def testUnionMergeMatchesDebug(self):
+        results = []
+        for debug in (True, False):
+            base.debug = debug
+            m = self.schema.instance()[1]
+            results.append(
+                [m.merge(1, value) for value in (None, (1,), None, (), (1,), (2,))]
+            )
+            results.append(m[1])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[1], results[3])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,174 @@
+import random
+import unittest
+
+from pyflow.language.python import ast
+from pyflow.analysis.dataflowIR import graph, ordering, predicate
+from pyflow.analysis.dataflowIR.transform import dce, driver, loadelimination
+
+
+class Console(object):
+    def __init__(self):
+        self.lines = []
+
+    def output(self, text):
+        self.lines.append(text)
+
+
+class RandomProgram(object):
+    # Loads and stores over a few heap fields, every op is numbered so two
+    # graphs built from the same seed can be compared.
+    def __init__(self, numOps, seed, numFields=3):
+        self.rng = random.Random(seed)
+        self.hyperblock = graph.Hyperblock(0)
+        self.dataflow = graph.DataflowGraph(self.hyperblock)
+        self.dataflow.initPredicate()
+        self.index = {}
+
+        self.env = {}
+        for i in range(3):
+            self.define(ast.Local("p%d" % i), self.dataflow.entry, "p%d" % i)
+        self.name = list(self.env)[0]
+
+        self.heap = {}
+        for i in range(numFields):
+            key = "f%d" % i
+            slot = graph.FieldNode(self.hyperblock, key)
+            self.dataflow.entry.addEntry(key, slot)
+            self.heap[key] = slot
+
+        for i in range(numOps):
+            if self.rng.random() < 0.4:
+                self.store()
+            else:
+                self.load()
+
+        exit = graph.Exit(self.hyperblock)
+        exit.setPredicate(self.dataflow.entryPredicate)
+        for lcl in list(self.env)[-4:]:
+            exit.addExit(lcl, self.env[lcl])
+        for key, slot in self.heap.items():
+            exit.addExit(key, slot)
+        self.dataflow.exit = exit
+
+    def define(self, lcl, op, name=None):
+        slot = graph.LocalNode(self.hyperblock, [lcl])
+        if op.isEntry():
+            op.addEntry(name, slot)
+        else:
+            op.addLocalModify(lcl, slot)
+        self.env[lcl] = slot
+
+    def pick(self):
+        return self.rng.choice(list(self.env)[-6:])
+
+    def makeOp(self, node):
+        g = graph.GenericOp(self.hyperblock, node)
+        g.setPredicate(self.dataflow.entryPredicate)
+        self.index[g] = len(self.index)
+        return g
+
+    def read(self, g, lcl):
+        g.addLocalRead(lcl, self.env[lcl])
+
+    def store(self):
+        key = self.rng.choice(list(self.heap))
+        expr, value = self.pick(), self.pick()
+        g = self.makeOp(ast.Store(expr, "Attribute", self.name, value))
+        for lcl in (expr, self.name, value):
+            self.read(g, lcl)
+
+        g.addPsedoRead(key, self.heap[key])
+        slot = graph.FieldNode(self.hyperblock, key)
+        g.addModify(key, slot)
+        self.heap[key] = slot
+
+    def load(self):
+        key = self.rng.choice(list(self.heap))
+        expr = self.pick()
+        g = self.makeOp(ast.Load(expr, "Attribute", self.name))
+        self.read(g, expr)
+        self.read(g, self.name)
+
+        g.addRead(key, self.heap[key])
+        self.define(ast.Local("v%d" % len(self.index)), g)
+
+
+def fixpoint(dataflow):
+    # Rerun the whole transforms until nothing changes.
+    while True:
+        dce.evaluateDataflow(dataflow)
+        pg = predicate.buildPredicateGraph(dataflow)
+        loads = loadelimination.collectLoads(dataflow)
+        if not loadelimination.eliminateLoads(loads, pg):
+            break
+        dataflow.invalidateOrder()
+
+
+def survivors(program):
+    order = ordering.evaluateDataflow(program.dataflow)
+    return sorted([program.index[op] for op in order.ops if op in program.index])
+
+
+class TestEditTracker(unittest.TestCase):
+    def testTouched(self):
+        hyperblock = graph.Hyperblock(0)
+        a = graph.LocalNode(hyperblock)
+        b = graph.LocalNode(hyperblock)
+
+        g = graph.GenericOp(hyperblock, ast.Allocate(ast.Local("t")))
+        with graph.EditTracker() as outer:
+            with graph.EditTracker() as inner:
+                g.addLocalRead("a", a)
+            g.replaceUse(a, b)
+
+        self.assertEqual(list(inner), [a, g])
+        self.assertEqual(set(outer), set([a, b, g]))
+
+        # Not tracked.
+        g.replaceUse(b, a)
+        self.assertEqual(set(outer), set([a, b, g]))
+
+
+class TestDriver(unittest.TestCase):
+    def testMatchesFixpoint(self):
+        for seed in range(20):
+            program = RandomProgram(80, seed)
+            reference = RandomProgram(80, seed)
+
+            stats = driver.evaluateDataflow(program.dataflow)
+            fixpoint(reference.dataflow)
+
+            self.assertEqual(survivors(program), survivors(reference))
+
+            # Dead code was tracked down incrementally.
+            self.assertFalse(dce.evaluateDataflow(program.dataflow))
+            self.assertFalse(
+                loadelimination.eliminateLoads(
+                    loadelimination.collectLoads(program.dataflow),
+                    predicate.buildPredicateGraph(program.dataflow),
+                )
+            )
+
+            self.assertEqual(stats.rounds[-1].eliminated, 0)
+            self.assertEqual([info.number for info in stats.rounds], list(range(1, len(stats.rounds) + 1)))
+
+    def testRounds(self):
+        stats = driver.evaluateDataflow(RandomProgram(200, 0).dataflow)
+        first, second = stats.rounds[:2]
+
+        self.assertGreater(first.eliminated, 0)
+        self.assertGreater(second.dead, 0)
+        self.assertLess(second.examined, first.examined)
+
+        console = Console()
+        stats.output(console)
+        self.assertEqual(len(console.lines), len(stats.rounds) + 2)
+        self.assertTrue(console.lines[-1].startswith("Total"))
+
+    def testMaxRounds(self):
+        stats = driver.evaluateDataflow(RandomProgram(200, 0).dataflow, maxRounds=1)
+        self.assertEqual(len(stats.rounds), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import random
+import unittest
+
+from pyflow.language.python import ast
+from pyflow.analysis.dataflowIR import graph, ordering
+from pyflow.analysis.dataflowIR.transform import dce
+
+
+def randomDataflow(numOps, seed, deadRate=0.2):
+    # A single hyperblock of generic ops reading earlier values.  Values with
+    # several uses get splits, some values are never used.
+    rng = random.Random(seed)
+    hyperblock = graph.Hyperblock(0)
+    dataflow = graph.DataflowGraph(hyperblock)
+    dataflow.initPredicate()
+    predicate = dataflow.entryPredicate
+
+    values = []
+    for i in range(3):
+        slot = graph.LocalNode(hyperblock, [ast.Local("p%d" % i)])
+        dataflow.entry.addEntry("p%d" % i, slot)
+        values.append(slot)
+
+    # Passed straight to the exit, so it is not live.
+    field = graph.FieldNode(hyperblock, "f")
+    dataflow.entry.addEntry("f", field)
+
+    for i in range(numOps):
+        op = graph.GenericOp(hyperblock, ast.Allocate(ast.Local("t")))
+        op.setPredicate(predicate)
+        for j, slot in enumerate(rng.sample(values, min(len(values), rng.randint(1, 2)))):
+            op.addLocalRead("r%d" % j, slot)
+
+        slot = graph.LocalNode(hyperblock, [ast.Local("v%d" % i)])
+        op.addLocalModify(None, slot)
+        if rng.random() >= deadRate:
+            values.append(slot)
+
+    exit = graph.Exit(hyperblock)
+    exit.setPredicate(predicate)
+    exit.addExit("r", values[-1])
+    exit.addExit("f", field)
+    dataflow.exit = exit
+
+    return dataflow
+
+
+def chainDataflow(length):
+    hyperblock = graph.Hyperblock(0)
+    dataflow = graph.DataflowGraph(hyperblock)
+    dataflow.initPredicate()
+
+    slot = graph.LocalNode(hyperblock)
+    dataflow.entry.addEntry("a", slot)
+    for i in range(length):
+        op = graph.GenericOp(hyperblock, ast.Allocate(ast.Local("t")))
+        op.setPredicate(dataflow.entryPredicate)
+        op.addLocalRead("a", slot)
+        slot = graph.LocalNode(hyperblock)
+        op.addLocalModify(None, slot)
+
+    dataflow.exit = graph.Exit(hyperblock)
+    dataflow.exit.setPredicate(dataflow.entryPredicate)
+    dataflow.exit.addExit("r", slot)
+    return dataflow
+
+
+def searchLive(dataflow):
+    # The set based backwards search dce used before the ordering.
+    live = set()
+    queue = [dataflow.exit]
+    live.add(dataflow.exit)
+    while queue:
+        current = queue.pop()
+        for prev in current.reverse():
+            if current.isOp() and current.isExit() and prev.isField() and prev.defn.isEntry():
+                continue
+            if prev not in live:
+                live.add(prev)
+                queue.append(prev)
+    return live
+
+
+class TestOrdering(unittest.TestCase):
+    def assertTopological(self, order):
+        for uid, node in enumerate(order.nodes):
+            self.assertEqual(node.uid, uid)
+            self.assertTrue(order.contains(node))
+            for next in node.forward():
+                self.assertLess(uid, next.uid, (node, next))
+
+    def testTopological(self):
+        for seed in range(10):
+            dataflow = randomDataflow(100, seed)
+            order = ordering.evaluateDataflow(dataflow)
+
+            self.assertTopological(order)
+            self.assertEqual(order.ops, [node for node in order.nodes if node.isOp()])
+            self.assertIn(dataflow.entry, order.ops)
+            self.assertIn(dataflow.exit, order.ops)
+
+    def testDeep(self):
+        # Deeper than the recursion limit.
+        dataflow = chainDataflow(5000)
+        order = ordering.evaluateDataflow(dataflow)
+        self.assertTopological(order)
+        self.assertIs(order.ops[-1], dataflow.exit)
+
+    def testCached(self):
+        dataflow = randomDataflow(20, 0)
+        order = ordering.evaluateDataflow(dataflow)
+        self.assertIs(ordering.evaluateDataflow(dataflow), order)
+
+        dataflow.invalidateOrder()
+        fresh = ordering.evaluateDataflow(dataflow)
+        self.assertIsNot(fresh, order)
+        self.assertEqual(fresh.nodes, order.nodes)
+
+    def testStaleIds(self):
+        old = ordering.evaluateDataflow(randomDataflow(20, 0))
+        dataflow = randomDataflow(20, 1)
+        order = ordering.evaluateDataflow(dataflow)
+        self.assertFalse(order.contains(old.nodes[-1]))
+
+
+class TestDataflowDCE(unittest.TestCase):
+    def testMatchesSearch(self):
+        for seed in range(10):
+            dataflow = randomDataflow(100, seed)
+            order = ordering.evaluateDataflow(dataflow)
+            expected = searchLive(dataflow)
+
+            live = dce.LivenessSearcher(order).process(dataflow)
+            self.assertEqual(set([node for node in order.nodes if live[node.uid]]), expected)
+
+    def testEliminate(self):
+        dataflow = randomDataflow(100, 0)
+        expected = searchLive(dataflow)
+
+        self.assertTrue(dce.evaluateDataflow(dataflow))
+        self.assertIsNone(dataflow.order)
+
+        # Splits left with a single use are collapsed.
+        order = ordering.evaluateDataflow(dataflow)
+        ops = set([node for node in order.ops if not node.isSplit()])
+        expected = set([node for node in expected if node.isOp() and not node.isSplit()])
+        self.assertEqual(ops, expected)
+        self.assertNotIn("f", dataflow.exit.reads)
+
+        # Nothing left to remove, so the ordering is kept.
+        self.assertFalse(dce.evaluateDataflow(dataflow))
+        self.assertIs(dataflow.order, order)
+
+    def testUnorderedNodes(self):
+        dataflow = randomDataflow(20, 0)
+        order = ordering.evaluateDataflow(dataflow)
+        live = dce.LivenessSearcher(order).process(dataflow)
+        killer = dce.LivenessKiller(order, live)
+
+        self.assertFalse(killer.dead(dataflow.exit))
+
+        fresh = graph.LocalNode(dataflow.exit.hyperblock)
+        self.assertEqual(fresh.uid, -1)
+        self.assertTrue(killer.dead(fresh))
+
+        # Ids from another ordering index the flags of unrelated live nodes.
+        stale = ordering.evaluateDataflow(randomDataflow(20, 1))
+        stale = [node for node in stale.nodes if node.uid < len(live) and live[node.uid]]
+        self.assertTrue(stale)
+        for node in stale:
+            self.assertTrue(killer.dead(node))
+
+
+if __name__ == "__main__":
+    unittest.main()
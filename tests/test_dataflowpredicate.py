@@ -0,0 +1,196 @@
+import unittest
+
+from pyflow.language.python import ast
+from pyflow.analysis.dataflowIR import graph, predicate
+from pyflow.analysis.dataflowIR.convert import gatedMerge
+from pyflow.analysis.dataflowIR.transform import loadelimination
+
+
+class Console(object):
+    def __init__(self):
+        self.lines = []
+
+    def output(self, text):
+        self.lines.append(text)
+
+
+class TestPredicateAlgebra(unittest.TestCase):
+    def setUp(self):
+        self.algebra = predicate.PredicateAlgebra()
+        self.a = [self.algebra.case("a", i, 2) for i in range(2)]
+        self.b = [self.algebra.case("b", i, 3) for i in range(3)]
+
+    def testHashConsed(self):
+        algebra = self.algebra
+        x = algebra.and_(self.a[0], self.b[1])
+        self.assertIs(algebra.and_(self.b[1], self.a[0]), x)
+        self.assertIs(algebra.and_(x, self.a[0]), x)
+        self.assertIs(algebra.case("a", 0, 2), self.a[0])
+
+        y = algebra.or_(algebra.or_(self.b[0], self.b[1]), self.b[2])
+        self.assertIs(y, algebra.true)
+        self.assertIs(algebra.and_(self.a[0], self.a[1]), algebra.false)
+
+    def testImplies(self):
+        algebra = self.algebra
+        x = algebra.and_(self.a[0], self.b[1])
+
+        self.assertTrue(algebra.implies(x, self.a[0]))
+        self.assertTrue(algebra.implies(x, algebra.or_(self.b[0], self.b[1])))
+        self.assertTrue(algebra.implies(algebra.false, x))
+        self.assertFalse(algebra.implies(self.a[0], x))
+        self.assertFalse(algebra.implies(algebra.true, self.a[0]))
+
+    def testStatistics(self):
+        algebra = self.algebra
+        algebra.and_(self.a[0], self.b[1])
+        hits = algebra.conjunctions.hits
+        algebra.and_(self.b[1], self.a[0])
+        self.assertEqual(algebra.conjunctions.hits, hits + 1)
+        self.assertEqual(len(algebra.conjunctions), 1)
+
+        # The first case of "a" was asked for again.
+        self.assertEqual(algebra.cases.hits, 0)
+        algebra.case("a", 0, 2)
+        self.assertEqual(algebra.cases.hits, 1)
+        self.assertEqual(algebra.cases.rate(), 1.0 / 6.0)
+
+        console = Console()
+        algebra.output(console)
+        self.assertEqual(len(console.lines), len(algebra.tables()) + 2)
+
+
+class NestedSwitches(object):
+    # entry -> switch a (2 cases), under case a0 switch b (3 cases).  The
+    # cases of b are merged into m, which holds exactly where a0 does but is
+    # not dominated by it, and m is merged with a1 back into the entry.
+    def __init__(self):
+        hyperblock = graph.Hyperblock(0)
+        self.hyperblock = hyperblock
+        self.dataflow = graph.DataflowGraph(hyperblock)
+        self.dataflow.initPredicate()
+        self.entry = self.dataflow.entryPredicate
+
+        self.params = {}
+        for name in ("c", "o", "n", "v"):
+            lcl = ast.Local(name)
+            slot = graph.LocalNode(hyperblock, [lcl])
+            self.dataflow.entry.addEntry(name, slot)
+            self.params[lcl] = slot
+        self.c, self.o, self.n, self.v = list(self.params)
+
+        self.field = graph.FieldNode(hyperblock, "f")
+        self.dataflow.entry.addEntry("f", self.field)
+
+        self.a = self.switch(self.entry, 2)
+        self.b = self.switch(self.a[0], 3)
+        self.m = gatedMerge(graph.Hyperblock(1), [(p, p) for p in self.b])
+        self.j = gatedMerge(graph.Hyperblock(2), [(self.m, self.m), (self.a[1], self.a[1])])
+
+    def switch(self, pred, count):
+        cases = [ast.TypeSwitchCase([], None, ast.Suite([])) for i in range(count)]
+        g = graph.GenericOp(self.hyperblock, ast.TypeSwitch(self.c, cases))
+        g.setPredicate(pred)
+        g.addLocalRead(self.c, self.params[self.c])
+        for i in range(count):
+            p = graph.PredicateNode(self.hyperblock, i)
+            g.predicates.append(p.addDefn(g))
+        return g.predicates
+
+    def generic(self, node, pred):
+        g = graph.GenericOp(pred.hyperblock, node)
+        g.setPredicate(pred)
+        for lcl in node.children():
+            if lcl in self.params:
+                g.addLocalRead(lcl, self.params[lcl])
+        return g
+
+    def store(self, pred):
+        g = self.generic(ast.Store(self.o, "Attribute", self.n, self.v), pred)
+        g.addPsedoRead("f", self.field)
+        self.field = graph.FieldNode(pred.hyperblock, "f")
+        g.addModify("f", self.field)
+        return g
+
+    def load(self, pred):
+        g = self.generic(ast.Load(self.o, "Attribute", self.n), pred)
+        g.addRead("f", self.field)
+        result = graph.LocalNode(pred.hyperblock, [ast.Local("r")])
+        g.addLocalModify(None, result)
+        return g, result
+
+    def finish(self, results):
+        exit = graph.Exit(self.j.hyperblock)
+        exit.setPredicate(self.j)
+        for i, slot in enumerate(results):
+            exit.addExit("r%d" % i, slot)
+        exit.addExit("f", self.field)
+        self.dataflow.exit = exit
+        return self.dataflow
+
+
+class TestPredicateGraph(unittest.TestCase):
+    def testTerms(self):
+        program = NestedSwitches()
+        pg = predicate.buildPredicateGraph(program.finish([]))
+
+        self.assertTrue(pg.equivalent(program.m, program.a[0]))
+        self.assertTrue(pg.equivalent(program.j, program.entry))
+        self.assertFalse(pg.equivalent(program.a[0], program.a[1]))
+
+        self.assertTrue(pg.implies(program.b[1], program.a[0]))
+        self.assertFalse(pg.implies(program.a[0], program.b[1]))
+
+        # Implication sees through the merge, dominance does not.
+        self.assertTrue(pg.implies(program.a[0], program.m))
+        self.assertFalse(pg.dominates(program.m, program.a[0]))
+
+    def testDominanceImplies(self):
+        program = NestedSwitches()
+        pg = predicate.buildPredicateGraph(program.finish([]))
+
+        preds = [program.entry, program.m, program.j] + program.a + program.b
+        for src in preds:
+            for dst in preds:
+                if pg.dominates(src, dst):
+                    self.assertTrue(pg.implies(dst, src), (src, dst))
+
+    def testSharedAlgebra(self):
+        algebra = predicate.PredicateAlgebra()
+        program = NestedSwitches()
+        dataflow = program.finish([])
+        first = predicate.buildPredicateGraph(dataflow, algebra)
+        hits = algebra.cases.hits
+        terms = len(algebra.manager.trees)
+        second = predicate.buildPredicateGraph(dataflow, algebra)
+
+        self.assertIs(first.algebra, second.algebra)
+        self.assertGreater(algebra.cases.hits, hits)
+        self.assertEqual(len(algebra.manager.trees), terms)
+        for pred in [program.m, program.j] + program.a + program.b:
+            self.assertIs(first.term(pred), second.term(pred))
+
+    def testLoadAfterMerge(self):
+        # The store is done under m, the load under a0.  m does not dominate
+        # a0, but holds whenever it does.
+        program = NestedSwitches()
+        program.store(program.m)
+        load, result = program.load(program.a[0])
+        dataflow = program.finish([result])
+
+        pg = predicate.buildPredicateGraph(dataflow)
+        self.assertTrue(loadelimination.attemptTransform(load, pg))
+        self.assertIs(dataflow.exit.reads["r0"].canonical(), program.params[program.v].canonical())
+
+    def testLoadUnderCase(self):
+        program = NestedSwitches()
+        program.store(program.b[0])
+        load, result = program.load(program.a[0])
+        dataflow = program.finish([result])
+
+        pg = predicate.buildPredicateGraph(dataflow)
+        self.assertFalse(loadelimination.attemptTransform(load, pg))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pyflow.analysis.cpa
+import pyflow.application.program
+from pyflow import config
+from pyflow.analysis import lifetimeanalysis
+from pyflow.analysis.dump import dumpreport
+from pyflow.application.context import CompilerContext
+from pyflow.application.interface import ExistingWrapper
+from pyflow.frontend.programextractor import Extractor, extractProgram
+from pyflow.util.application.console import Console
+from pyflow.util.io import dot
+from pyflow.util.python import replaceGlobals
+
+
+def func(a, b):
+    c = [a, b]
+    if a > b:
+        return c[0] * 2
+    return c[1] + a
+
+
+class TestDumpReport(unittest.TestCase):
+    def setUp(self):
+        self.compiler = CompilerContext(Console(out=open(os.devnull, "w")))
+        self.program = pyflow.application.program.Program()
+        self.program.interface.func.append(
+            (replaceGlobals(func, {}), (ExistingWrapper(3), ExistingWrapper(5)))
+        )
+        self.compiler.program = self.program
+        self.compiler.extractor = Extractor(self.compiler)
+        extractProgram(self.compiler, self.program)
+        pyflow.analysis.cpa.evaluate(self.compiler, self.program)
+        lifetimeanalysis.evaluate(self.compiler, self.program)
+
+        self.outputDirectory = config.outputDirectory
+        config.outputDirectory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(config.outputDirectory)
+        config.outputDirectory = self.outputDirectory
+        self.compiler.console.out.close()
+
+    def readReport(self, name):
+        reportDir = os.path.join(config.outputDirectory, name)
+        files = {}
+        for fn in os.listdir(reportDir):
+            with open(os.path.join(reportDir, fn)) as f:
+                files[fn] = f.read()
+        return files
+
+    def testAllPages(self):
+        dumpreport.evaluate(self.compiler, self.program, "linear", workers=1)
+        files = self.readReport("linear")
+
+        funcs = [fn for fn in files if fn.startswith("f0")]
+        heaps = [fn for fn in files if fn.startswith("h0")]
+        self.assertEqual(len(funcs), len(self.program.liveCode))
+        self.assertTrue(heaps)
+        for fn in funcs + heaps:
+            self.assertIn('href="%s' % fn, "".join(files.values()))
+
+    @unittest.skipIf(sys.platform == "win32", "report workers are forked")
+    def testWorkersMatchLinear(self):
+        dumpreport.evaluate(self.compiler, self.program, "linear", workers=1)
+        dumpreport.evaluate(self.compiler, self.program, "parallel", workers=3)
+        self.assertEqual(self.readReport("linear"), self.readReport("parallel"))
+
+    def testGraphs(self):
+        dumpreport.evaluate(self.compiler, self.program, "graphs", graphs=True)
+        files = self.readReport("graphs")
+        self.assertIn("invocations.dot", files)
+        self.assertIn("->", files["invocations.dot"])
+
+
+class TestDot(unittest.TestCase):
+    def testUnstyledNodes(self):
+        g = dot.Digraph()
+        boxish = dot.Style(shape="box")
+        g.node("a")
+        g.node("b", nodetype=boxish)
+        g.node("c")
+        g.edge("a", "b")
+        g.edge("b", "c")
+
+        path = os.path.join(tempfile.mkdtemp(), "g.dot")
+        g.createDotFile(path)
+        with open(path) as f:
+            text = f.read()
+        shutil.rmtree(os.path.dirname(path))
+
+        self.assertLess(text.index('"c"'), text.index('"b"'))
+        self.assertIn('"b" -> "c"', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import random
 import unittest
 
 from pyflow.util.graphalgorithim import exclusiongraph
+from pyflow.util.graphalgorithim.color import colorGraph
 
 
 class TestExclusionGraph(unittest.TestCase):
@@ -103,6 +105,85 @@ class TestExclusionGraph(unittest.TestCase):
         self.assertNotExclusive(1, 3)
         self.assertNotExclusive(2, 3)
 
+    def testRepeated(self):
+        self.build({0: [1, 2]}, [0])
+
+        self.assertNotExclusive(1, 1)
+        self.assertNotExclusive(1, 2, 1)
+
+    def testPartition(self):
+        self.build({0: [1, 2], 1: [3, 4], 2: [5, 6]}, [0])
+
+        groups = self.exg.partition([0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(groups, [[0], [1, 2], [3, 4, 5, 6]])
+        for group in groups:
+            self.assertExclusive(*group)
+
+    def testPartitionOrder(self):
+        self.build({0: [1, 2], 1: [3, 4], 2: [5, 6]}, [0])
+
+        # First fit: 3 takes the group 2 is in, so 1 needs its own.
+        self.assertEqual(self.exg.partition([2, 3, 1, 4]), [[2, 3, 4], [1]])
+        self.assertEqual(self.exg.partition([]), [])
+
+
+class TestColorGraph(unittest.TestCase):
+    def randomGraph(self, numNodes, density, seed):
+        rng = random.Random(seed)
+        G = dict([(i, set()) for i in range(numNodes)])
+        for i in range(numNodes):
+            for j in range(i + 1, numNodes):
+                if rng.random() < density:
+                    G[i].add(j)
+                    G[j].add(i)
+        return G
+
+    def assertValid(self, G, solution, group, numColors):
+        self.assertEqual(set(solution), set(G))
+        self.assertEqual(len(group), numColors)
+        members = [set(nodes) for nodes in group]
+        for node, neighbors in G.items():
+            self.assertIn(node, members[solution[node]])
+            for other in neighbors:
+                self.assertNotEqual(solution[node], solution[other])
+
+    def testPath(self):
+        G = {1: [2], 2: [1, 3], 3: [2]}
+        solution, group, numColors = colorGraph(G)
+        self.assertEqual(numColors, 2)
+        self.assertEqual(group, [[2], [1, 3]])
+
+    def testComplete(self):
+        G = {1: [2, 3], 2: [1, 3], 3: [1, 2]}
+        self.assertEqual(colorGraph(G)[2], 3)
+
+    def testEmpty(self):
+        self.assertEqual(colorGraph({}), ({}, [], 0))
+        self.assertEqual(colorGraph({1: [], 2: []})[1], [[1, 2]])
+
+    def testRandom(self):
+        for seed in range(10):
+            G = self.randomGraph(60, 0.1, seed)
+            result = colorGraph(G)
+            self.assertValid(G, *result)
+            self.assertEqual(colorGraph(G), result)
+
+    def testLargeSparse(self):
+        # Most nodes move down a bucket, leaving stale entries behind.
+        numNodes = 50000
+        path = dict(
+            [(i, [j for j in (i - 1, i + 1) if 0 <= j < numNodes]) for i in range(numNodes)]
+        )
+        result = colorGraph(path)
+        self.assertValid(path, *result)
+        self.assertEqual(result[2], 2)
+
+        star = dict([(i, [0]) for i in range(1, numNodes)])
+        star[0] = list(range(1, numNodes))
+        solution, group, numColors = colorGraph(star)
+        self.assertEqual(numColors, 2)
+        self.assertEqual(group[0], [0])
+
 
 if __name__ == "__main__":
     unittest.main()
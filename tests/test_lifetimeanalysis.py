@@ -0,0 +1,177 @@
+import collections
+import random
+import unittest
+
+from pyflow.analysis import lifetimeanalysis
+from pyflow.language.python import ast
+
+
+class Code(object):
+    def __init__(self, name):
+        self.name = name
+
+    def isCode(self):
+        return True
+
+    def __repr__(self):
+        return "Code(%s)" % self.name
+
+
+class Slot(object):
+    def __init__(self, obj, name):
+        self.object = obj
+        self.slotName = name
+
+    def __repr__(self):
+        return "Slot(%s, %s)" % (self.object, self.slotName)
+
+
+def naiveReads(nodes, edges, local, killed):
+    # Plain fixpoint: re-propagate the full set whenever something changes.
+    reads = dict([(node, set(local.get(node, ()))) for node in nodes])
+    changed = True
+    while changed:
+        changed = False
+        for src, op, dst in edges:
+            filtered = set(
+                [slot for slot in reads[dst] if slot.object not in killed[(src, op, dst)]]
+            )
+            if not filtered <= reads[src]:
+                reads[src].update(filtered)
+                changed = True
+    return reads
+
+
+class TestReadModifyPropagation(unittest.TestCase):
+    def buildGraph(self, rng, numCodes, numEdges, numObjects):
+        codes = [Code(i) for i in range(numCodes)]
+        context = "ctx"
+        nodes = [(code, context) for code in codes]
+
+        objects = ["o%d" % i for i in range(numObjects)]
+        slots = [Slot(obj, name) for obj in objects for name in ("a", "b")]
+
+        invokes = lifetimeanalysis.invokesSchema.instance()
+        edges = []
+        for i in range(numEdges):
+            src = rng.choice(codes)
+            dst = rng.choice(codes)
+            op = ast.Local("op%d" % i)
+            invokes[src][op][context].add(dst, context)
+            edges.append(((src, context), op, (dst, context)))
+
+        killed = collections.defaultdict(lambda: collections.defaultdict(set))
+        edgeKilled = {}
+        for src, op, dst in edges:
+            kill = set(rng.sample(objects, rng.randint(0, 2)))
+            killed[(src[0], op, src[1])][dst] = kill
+            edgeKilled[(src, op, dst)] = kill
+
+        local = {}
+        for node in nodes:
+            if rng.random() < 0.5:
+                local[node] = set(rng.sample(slots, rng.randint(1, 4)))
+
+        return nodes, edges, local, killed, edgeKilled, invokes
+
+    def checkGraph(self, seed, numCodes, numEdges, numObjects=6):
+        rng = random.Random(seed)
+        nodes, edges, local, killed, edgeKilled, invokes = self.buildGraph(
+            rng, numCodes, numEdges, numObjects
+        )
+
+        rm = lifetimeanalysis.ReadModifyAnalysis(
+            (), lifetimeanalysis.invertInvokes(invokes)
+        )
+        for node, slots in local.items():
+            rm.contextReads[node].update(slots)
+            rm.contextModifies[node].update(slots)
+        rm.process(killed)
+
+        expected = naiveReads(nodes, edges, local, edgeKilled)
+        for node in nodes:
+            self.assertEqual(rm.contextReads.get(node, set()), expected[node], node)
+            self.assertEqual(rm.contextModifies.get(node, set()), expected[node], node)
+
+        for src, op, dst in edges:
+            code, context = src
+            reads = rm.opReadDB[code][op][context] or set()
+            for slot in expected[dst]:
+                if slot.object not in edgeKilled[(src, op, dst)]:
+                    self.assertIn(slot, reads)
+
+    def testAcyclic(self):
+        rng = random.Random(0)
+        codes = [Code(i) for i in range(4)]
+        context = "ctx"
+        invokes = lifetimeanalysis.invokesSchema.instance()
+        ops = [ast.Local("op%d" % i) for i in range(3)]
+        for i, op in enumerate(ops):
+            invokes[codes[i]][op][context].add(codes[i + 1], context)
+
+        a = Slot("a", "x")
+        b = Slot("b", "x")
+        killed = collections.defaultdict(lambda: collections.defaultdict(set))
+        killed[(codes[1], ops[1], context)][(codes[2], context)] = set(["b"])
+
+        rm = lifetimeanalysis.ReadModifyAnalysis(
+            (), lifetimeanalysis.invertInvokes(invokes)
+        )
+        rm.contextReads[(codes[3], context)].update((a, b))
+        rm.process(killed)
+
+        self.assertEqual(rm.contextReads[(codes[2], context)], set([a, b]))
+        self.assertEqual(rm.contextReads[(codes[0], context)], set([a]))
+        self.assertEqual(rm.opReadDB[codes[0]][ops[0]][context], set([a]))
+        self.assertEqual(rm.opReadDB[codes[1]][ops[1]][context], set([a]))
+
+    def testRecursive(self):
+        for seed in range(20):
+            self.checkGraph(seed, 12, 30)
+
+    def testDenseRecursion(self):
+        for seed in range(5):
+            self.checkGraph(seed, 30, 200, 20)
+
+    def testLongCycle(self):
+        # A single recursive component, long enough that a worklist with
+        # quadratic pops would be noticeably slow.
+        numCodes = 5000
+        codes = [Code(i) for i in range(numCodes)]
+        context = "ctx"
+        nodes = [(code, context) for code in codes]
+        slots = [Slot("o%d" % i, "a") for i in range(5)]
+
+        invokes = lifetimeanalysis.invokesSchema.instance()
+        killed = collections.defaultdict(lambda: collections.defaultdict(set))
+        edges = []
+        edgeKilled = {}
+        for i, code in enumerate(codes):
+            op = ast.Local("op")
+            dst = codes[(i + 1) % numCodes]
+            invokes[code][op][context].add(dst, context)
+            kill = set(["o0"]) if i == 0 else set()
+            killed[(code, op, context)][(dst, context)] = kill
+            edges.append(((code, context), op, (dst, context)))
+            edgeKilled[edges[-1]] = kill
+
+        local = {}
+        for i in range(0, numCodes, 7):
+            local[nodes[i]] = set([slots[i % 5]])
+
+        rm = lifetimeanalysis.ReadModifyAnalysis(
+            (), lifetimeanalysis.invertInvokes(invokes)
+        )
+        for node, values in local.items():
+            rm.contextReads[node].update(values)
+        rm.process(killed)
+
+        # Callers come first in the ring, so walking it backwards settles
+        # the naive fixpoint in a couple of passes.
+        expected = naiveReads(nodes, list(reversed(edges)), local, edgeKilled)
+        for node in nodes:
+            self.assertEqual(rm.contextReads.get(node, set()), expected[node], node)
+
+
+if __name__ == "__main__":
+    unittest.main()
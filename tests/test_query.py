@@ -0,0 +1,134 @@
+import unittest
+
+from pyflow.analysis import query
+from pyflow.analysis.storegraph import canonicalobjects, storegraph
+from pyflow.application.context import CompilerContext
+from pyflow.frontend.programextractor import Extractor
+from pyflow.language.python import ast
+from pyflow.util.application.console import Console
+
+
+class Ref(object):
+    # Stands in for the object nodes CPA annotates locals with.
+    def __init__(self, xtype):
+        self.xtype = xtype
+
+
+def annotateLocal(lcl, *xtypes):
+    refs = tuple([Ref(xtype) for xtype in xtypes])
+    lcl.annotation = lcl.annotation.rewrite(references=(refs, (refs,)))
+
+
+def makeCode(name, calls=()):
+    """A code with one context, calling each (callee, context) in calls."""
+    a = ast.Local("a")
+    r = ast.Local("r")
+    blocks = []
+    ops = []
+    for callee, calleeContext in calls:
+        op = ast.Call(ast.Local(callee.name), [a], [], None, None)
+        invs = ((callee, calleeContext),)
+        op.annotation = op.annotation.rewrite(invokes=(invs, (invs,)))
+        blocks.append(ast.Assign(op, [r]))
+        ops.append(op)
+    blocks.append(ast.Return([r]))
+
+    params = ast.CodeParameters(None, [a], ["a"], [], None, None, [r])
+    code = ast.Code(name, params, ast.Suite(blocks))
+    code.annotation = code.annotation.rewrite(contexts=("ctx",))
+    return code, ops, a, r
+
+
+class TestProgramQuery(unittest.TestCase):
+    def setUp(self):
+        self.leaf, leafOps, self.leafParam, leafReturn = makeCode("leaf")
+        self.mid, self.midOps, midParam, midReturn = makeCode(
+            "mid", [(self.leaf, "ctx")]
+        )
+        self.main, self.mainOps, mainParam, mainReturn = makeCode(
+            "main", [(self.mid, "ctx"), (self.leaf, "ctx")]
+        )
+
+        annotateLocal(self.leafParam, "int", "float")
+        annotateLocal(mainParam, "int")
+
+        self.q = query.ProgramQuery([self.main, self.mid, self.leaf])
+
+    def testCallGraph(self):
+        self.assertEqual(self.q.callees(self.mainOps[0]), frozenset([self.mid]))
+        self.assertEqual(self.q.codeOf(self.mainOps[1]), self.main)
+        self.assertEqual(self.q.callers(self.leaf), frozenset([self.main, self.mid]))
+        self.assertEqual(
+            self.q.callSites(self.leaf),
+            frozenset([(self.main, self.mainOps[1]), (self.mid, self.midOps[0])]),
+        )
+        self.assertEqual(self.q.callers(self.main), frozenset())
+
+    def testContexts(self):
+        self.assertEqual(
+            self.q.invokes(self.main, "ctx"),
+            frozenset([(self.mid, "ctx"), (self.leaf, "ctx")]),
+        )
+        self.assertEqual(
+            self.q.invokedBy(self.leaf, "ctx"),
+            frozenset([(self.main, "ctx"), (self.mid, "ctx")]),
+        )
+        self.assertEqual(self.q.invokes(self.leaf, "ctx"), frozenset())
+
+    def testPointsTo(self):
+        self.assertEqual(self.q.pointsTo(self.leafParam), frozenset(["int", "float"]))
+        self.assertEqual(len(self.q.localsPointingTo("int")), 2)
+        self.assertEqual(
+            self.q.localsPointingTo("float"), frozenset([(self.leaf, self.leafParam)])
+        )
+        self.assertEqual(self.q.pointsTo(ast.Local("unknown")), frozenset())
+
+    def testStale(self):
+        self.assertFalse(self.q.stale())
+        self.mid.mutated()
+        self.assertTrue(self.q.stale())
+
+    def testHeapSlots(self):
+        compiler = CompilerContext(Console())
+        extractor = Extractor(compiler)
+        canonical = canonicalobjects.CanonicalObjects()
+        graph = storegraph.StoreGraph(extractor, canonical)
+
+        slotName = canonical.localName(self.main, ast.Local("x"), None)
+        slot = graph.root(slotName)
+        xtype = canonical.existingType(extractor.getObject(1))
+        slot.initializeType(xtype)
+        graph.freeze()
+
+        q = query.ProgramQuery([self.main], graph)
+        self.assertEqual(q.slotPointsTo(slot), (xtype,))
+        self.assertIn(slot, q.slotsPointingTo(xtype))
+
+        # The graph changes and is frozen again after the query was built.
+        other = canonical.existingType(extractor.getObject(2))
+        slot.initializeType(other)
+        self.assertRaises(AssertionError, q.slotPointsTo, slot)
+
+        graph.freeze()
+        self.assertEqual(set(q.slotPointsTo(slot)), set([xtype, other]))
+        self.assertIn(slot, q.slotsPointingTo(other))
+
+    def testOutput(self):
+        lines = []
+
+        class Capture(object):
+            def write(self, text):
+                lines.append(text)
+
+            def flush(self):
+                pass
+
+        self.q.output(Console(out=Capture()))
+        text = "".join(lines)
+        self.assertIn("Call sites:    3", text)
+        self.assertIn("Index Memory:", text)
+        self.assertGreater(self.q.memory(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
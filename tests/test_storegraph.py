@@ -94,5 +94,127 @@ class TestStoreGraph(unittest.TestCase):
         self.assertIsNotNone(store_graph.setManager)
 
 
+class TestFrozenStoreGraph(unittest.TestCase):
+    def setUp(self):
+        self.compiler = CompilerContext(Console())
+        self.extractor = Extractor(self.compiler)
+        self.compiler.extractor = self.extractor
+
+        self.canonical = canonicalobjects.CanonicalObjects()
+        self.graph = storegraph.StoreGraph(self.extractor, self.canonical)
+
+        from pyflow.language.python import ast
+
+        self.code = ast.Code(
+            "test", ast.CodeParameters(None, [], [], [], None, None, []), ast.Suite([])
+        )
+        self.ast = ast
+
+    def local(self, name):
+        slotName = self.canonical.localName(self.code, self.ast.Local(name), None)
+        return self.graph.root(slotName)
+
+    def xtype(self, value):
+        return self.canonical.existingType(self.extractor.getObject(value))
+
+    def testPointsTo(self):
+        a = self.local("a")
+        b = self.local("b")
+        a.initializeType(self.xtype(1))
+        a.initializeType(self.xtype(2))
+        b.initializeType(self.xtype(2))
+
+        frozen = self.graph.freeze()
+        self.assertIs(self.graph.frozen, frozen)
+
+        self.assertEqual(set(frozen.pointsTo(a)), set([self.xtype(1), self.xtype(2)]))
+        self.assertEqual(frozen.pointsTo(b), (self.xtype(2),))
+        self.assertEqual(list(frozen.pointsToObjects(a)), list(a))
+        self.assertFalse(frozen.mayBeNull(a))
+
+        # Fields of reachable objects are indexed as well.
+        obj = frozen.pointsToObjects(b)[0]
+        self.assertEqual(set(frozen.fields(obj)), set(obj.slots.values()))
+        for field in frozen.fields(obj):
+            self.assertIn(field, frozen)
+
+    def testCollapseForwards(self):
+        a = self.local("a")
+        slotName = self.canonical.localName(self.code, self.ast.Local("b"), None)
+        b = self.graph.root(slotName, storegraph.RegionNode(self.graph))
+        a.initializeType(self.xtype(1))
+        b.initializeType(self.xtype(3))
+        obj = b.initializeType(self.xtype(1))
+
+        fieldName = self.canonical.fieldName("Attribute", self.extractor.getObject("x"))
+        field = obj.field(fieldName, b.region)
+
+        # Merges the regions, and the two objects for 1 within them.
+        a.update(b)
+        self.assertIsNotNone(field.object.forward)
+
+        frozen = self.graph.freeze()
+
+        self.assertIn(field, frozen)
+        self.assertIsNone(field.object.forward)
+        self.assertIsNone(field.region.forward)
+        for slot in self.graph.slots.values():
+            self.assertIsNone(slot.region.forward)
+            for ref in frozen.pointsToObjects(slot):
+                self.assertIsNone(ref.forward)
+                self.assertIs(ref.region, slot.region)
+        self.assertEqual(set(frozen.pointsTo(a)), set([self.xtype(1), self.xtype(3)]))
+
+    def testGrowthDiscardsIndex(self):
+        self.local("a").initializeType(self.xtype(1))
+        self.graph.freeze()
+        self.local("b")
+        self.assertIsNone(self.graph.frozen)
+
+    def testUpdateDiscardsIndex(self):
+        a = self.local("a")
+        b = self.local("b")
+        a.initializeType(self.xtype(1))
+        b.initializeType(self.xtype(2))
+
+        self.graph.freeze()
+        a.initializeType(self.xtype(1))
+        self.assertIsNotNone(self.graph.frozen)
+
+        # A new type for an existing slot.
+        a.initializeType(self.xtype(2))
+        self.assertIsNone(self.graph.frozen)
+
+        frozen = self.graph.freeze()
+        self.assertEqual(set(frozen.pointsTo(a)), set([self.xtype(1), self.xtype(2)]))
+
+        b.initializeType(self.xtype(3))
+        a.update(b)
+        self.assertIsNone(self.graph.frozen)
+        self.assertEqual(
+            set(self.graph.freeze().pointsTo(a)),
+            set([self.xtype(1), self.xtype(2), self.xtype(3)]),
+        )
+
+    def testMergeDiscardsIndex(self):
+        a = self.local("a")
+        slotName = self.canonical.localName(self.code, self.ast.Local("b"), None)
+        b = self.graph.root(slotName, storegraph.RegionNode(self.graph))
+        a.initializeType(self.xtype(1))
+        b.initializeType(self.xtype(1))
+
+        self.graph.freeze()
+        a.region.merge(b.region)
+        self.assertIsNone(self.graph.frozen)
+
+    def testMemory(self):
+        self.local("a").initializeType(self.xtype(1))
+        before = self.graph.memory()
+        frozen = self.graph.freeze()
+        self.assertGreater(frozen.memory(), 0)
+        self.assertGreater(self.graph.memory(), frozen.memory())
+        self.assertGreater(before, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+import random
+import unittest
+
+from pyflow.analysis import astcollector
+from pyflow.analysis.ipa.ipanalysis import IPAnalysis
+from pyflow.analysis.programculler import Finder
+from pyflow.language.python import ast
+
+DEPTH = 100000
+
+
+def randomGraph(seed, numNodes, numEdges, acyclic=False):
+    rng = random.Random(seed)
+    G = dict([(i, []) for i in range(numNodes)])
+    for i in range(numEdges):
+        src = rng.randrange(numNodes)
+        dst = rng.randrange(numNodes)
+        if acyclic and src >= dst:
+            continue
+        G[src].append(dst)
+    return G
+
+
+class GraphFinder(Finder):
+    def __init__(self, G):
+        Finder.__init__(self)
+        self.G = G
+        self.order = []
+
+    def children(self, node):
+        self.order.append(node)
+        return self.G.get(node, ())
+
+
+def recursiveOrder(G, node, processed, order):
+    if node not in processed:
+        processed.add(node)
+        order.append(node)
+        for child in G.get(node, ()):
+            recursiveOrder(G, child, processed, order)
+
+
+class TestFinder(unittest.TestCase):
+    def testOrder(self):
+        for seed in range(20):
+            G = randomGraph(seed, 30, 60)
+            finder = GraphFinder(G)
+            expected = []
+            processed = set()
+            for root in (0, 5, 0):
+                finder.process(root)
+                recursiveOrder(G, root, processed, expected)
+            self.assertEqual(finder.order, expected)
+            self.assertEqual(finder.processed, processed)
+
+    def testDeepChain(self):
+        G = dict([(i, [i + 1]) for i in range(DEPTH)])
+        G[DEPTH] = [0]
+        finder = GraphFinder(G)
+        finder.process(0)
+        self.assertEqual(finder.order, list(range(DEPTH + 1)))
+
+
+class Invoke(object):
+    def __init__(self, log, src, dst):
+        self.log = log
+        self.src = src
+        self.dst = dst
+
+    def apply(self):
+        self.log.append(("apply", self.src.name, self.dst.name))
+
+
+class Context(object):
+    def __init__(self, name):
+        self.name = name
+        self.invokeOut = {}
+
+
+class BottomUp(IPAnalysis):
+    # Only the traversal is under test, so skip the constraint machinery.
+    def __init__(self):
+        self.processed = set()
+        self.path = set()
+        self.log = []
+
+    def exitContext(self, context):
+        self.log.append(("exit", context.name))
+        self.path.remove(context)
+
+
+def buildContexts(G, log):
+    contexts = dict([(node, Context(node)) for node in G])
+    for src, dsts in G.items():
+        for i, dst in enumerate(dsts):
+            invoke = Invoke(log, contexts[src], contexts[dst])
+            contexts[src].invokeOut[i] = invoke
+    return contexts
+
+
+def recursiveBottomUp(G, node, processed, log):
+    if node not in processed:
+        processed.add(node)
+        for dst in G[node]:
+            recursiveBottomUp(G, dst, processed, log)
+            log.append(("apply", node, dst))
+        log.append(("exit", node))
+
+
+class TestContextBottomUp(unittest.TestCase):
+    def testOrder(self):
+        for seed in range(20):
+            G = randomGraph(seed, 25, 60, acyclic=True)
+            analysis = BottomUp()
+            contexts = buildContexts(G, analysis.log)
+            analysis.contextBottomUp(contexts[0])
+            analysis.contextBottomUp(contexts[3])
+
+            expected = []
+            processed = set()
+            recursiveBottomUp(G, 0, processed, expected)
+            recursiveBottomUp(G, 3, processed, expected)
+            self.assertEqual(analysis.log, expected)
+            self.assertEqual(analysis.path, set())
+
+    def testCycle(self):
+        G = {0: [1], 1: [2], 2: [0]}
+        analysis = BottomUp()
+        contexts = buildContexts(G, analysis.log)
+        self.assertRaises(AssertionError, analysis.contextBottomUp, contexts[0])
+
+    def testDeepChain(self):
+        G = dict([(i, [i + 1]) for i in range(DEPTH)])
+        G[DEPTH] = []
+        analysis = BottomUp()
+        contexts = buildContexts(G, analysis.log)
+        analysis.contextBottomUp(contexts[0])
+
+        self.assertEqual(analysis.log[0], ("exit", DEPTH))
+        self.assertEqual(analysis.log[-1], ("exit", 0))
+        self.assertEqual(len(analysis.log), 2 * DEPTH + 1)
+
+
+class TestDeepAST(unittest.TestCase):
+    def testDeepExpression(self):
+        a = ast.Local("a")
+        r = ast.Local("r")
+        ops = []
+        expr = a
+        for i in range(DEPTH):
+            expr = ast.BinaryOp(expr, "+", a)
+            ops.append(expr)
+
+        params = ast.CodeParameters(None, [a], ["a"], [], None, None, [r])
+        body = ast.Suite([ast.Assign(expr, [r]), ast.Return([r])])
+        code = ast.Code("deep", params, body)
+
+        collected, lcls = astcollector.getOps(code)
+        self.assertEqual(collected, tuple(ops))
+        self.assertEqual(lcls, frozenset([a, r]))
+
+
+if __name__ == "__main__":
+    unittest.main()